@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+JSON-RPC Framing Benchmark
+Splits streams of large MCP messages (screenshot-sized tools/call results) fed in
+pipe-sized chunks, and reports throughput for three readers:
+
+  naive     bytes buffer += chunk, then search and split from the start (a common
+            hand-rolled reader; re-scans and copies what it already holds)
+  readline  BufferedReader line iteration (newline framing only)
+  codec     jsonrpc_framing.FrameDecoder
+
+--parse adds json.loads of every message, which is what consumers pay on top.
+"""
+
+import io
+import json
+import time
+import argparse
+
+from jsonrpc_framing import CONTENT_LENGTH, NEWLINE, FrameDecoder, write_message
+
+MB = 1024 ** 2
+
+
+class ChunkedRaw(io.RawIOBase):
+    """Raw stream handing out at most `chunk` bytes per read, like a pipe"""
+
+    def __init__(self, data, chunk):
+        self.view = memoryview(data)
+        self.pos = 0
+        self.chunk = chunk
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.chunk, len(self.view) - self.pos)
+        buffer[:count] = self.view[self.pos:self.pos + count]
+        self.pos += count
+        return count
+
+
+def make_stream(size, count, framing):
+    payload = 'A' * size
+    out = io.BytesIO()
+    for i in range(count):
+        write_message(out, {'jsonrpc': '2.0', 'id': i, 'result': {'content': [
+            {'type': 'image', 'mimeType': 'image/png', 'data': payload}]}}, framing)
+    return out.getvalue()
+
+
+def naive_newline(raw, parse):
+    buffer, count = b'', 0
+    while True:
+        chunk = raw.read(64 * 1024)
+        if not chunk:
+            return count
+        buffer += chunk
+        while b'\n' in buffer:
+            line, buffer = buffer.split(b'\n', 1)
+            count += 1
+            if parse:
+                json.loads(line)
+
+
+def naive_content_length(raw, parse):
+    buffer, count = b'', 0
+    while True:
+        chunk = raw.read(64 * 1024)
+        if not chunk:
+            return count
+        buffer += chunk
+        while True:
+            head, separator, rest = buffer.partition(b'\r\n\r\n')
+            if not separator:
+                break
+            length = int(head.split(b':', 1)[1])
+            if len(rest) < length:
+                break
+            body, buffer = rest[:length], rest[length:]
+            count += 1
+            if parse:
+                json.loads(body)
+
+
+def readline_newline(raw, parse):
+    count = 0
+    for line in io.BufferedReader(raw, 64 * 1024):
+        count += 1
+        if parse:
+            json.loads(line)
+    return count
+
+
+def codec(raw, parse, framing):
+    decoder = FrameDecoder(framing)
+    count = 0
+    while True:
+        more = decoder.read_from(raw)
+        if parse:
+            for _ in decoder.messages():
+                count += 1
+        else:
+            for _ in decoder.frames():
+                count += 1
+        if not more:
+            return count
+
+
+def run(name, reader, data, chunk, expected):
+    raw = ChunkedRaw(data, chunk)
+    start = time.perf_counter()
+    count = reader(raw)
+    elapsed = time.perf_counter() - start
+    assert count == expected, f"{name}: {count} messages, expected {expected}"
+    return len(data) / MB / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='0.01,1,8,32', help='message sizes in MiB')
+    parser.add_argument('--total', type=float, default=128, help='MiB of messages per size')
+    parser.add_argument('--chunk', type=int, default=64 * 1024, help='bytes per pipe read')
+    parser.add_argument('--parse', action='store_true', help='also json.loads every message')
+    args = parser.parse_args()
+
+    print(f"{'framing':<16}{'msg MiB':>9}{'msgs':>7}{'naive MB/s':>12}{'readline MB/s':>15}{'codec MB/s':>12}")
+    for framing in (NEWLINE, CONTENT_LENGTH):
+        for size_mb in [float(s) for s in args.sizes.split(',')]:
+            size = int(size_mb * MB)
+            count = max(1, int(args.total * MB / max(size, 1)))
+            data = make_stream(size, count, framing)
+            if framing == NEWLINE:
+                naive = run('naive', lambda raw: naive_newline(raw, args.parse), data, args.chunk, count)
+                readline = f"{run('readline', lambda raw: readline_newline(raw, args.parse), data, args.chunk, count):.0f}"
+            else:
+                naive = run('naive', lambda raw: naive_content_length(raw, args.parse), data, args.chunk, count)
+                readline = '-'
+            fast = run('codec', lambda raw: codec(raw, args.parse, framing), data, args.chunk, count)
+            print(f"{framing:<16}{size_mb:>9g}{count:>7}{naive:>12.0f}{readline:>15}{fast:>12.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+GitHub Transport Benchmark
+Replays a coordinator run against a local GitHub stand-in, once with PyGithub's
+per-client sessions and once with the shared transport, and reports connections
+opened and per-request latency.
+
+The replay follows the coordinator's access pattern: repos are scanned one
+after another on the primary client, and PM-delegated issues look up their
+parent issue through the cross-repo client. That is two clients, used from
+one thread.
+
+The stand-in speaks plain HTTP; every new connection it counts is one TLS
+handshake against api.github.com, and --handshake adds that handshake's cost
+to the first request on each connection.
+"""
+
+import argparse
+import json
+import re
+import socket
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from github import Github
+from github.Requester import Requester
+
+import github_transport
+
+
+class GithubStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.stats_lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        base = f"http://{self.headers['Host']}"
+        path = self.path.split('?')[0]
+
+        match = re.fullmatch(r'/repos/([^/]+)/([^/]+)', path)
+        if match:
+            body = self.repo(base, match.group(1), match.group(2))
+        elif re.fullmatch(r'/repos/([^/]+)/([^/]+)/issues/(\d+)/comments', path):
+            body = [self.comment(i) for i in range(self.server.comments_per_issue)]
+        elif re.fullmatch(r'/repos/([^/]+)/([^/]+)/issues/(\d+)', path):
+            owner, repo, number = re.fullmatch(r'/repos/([^/]+)/([^/]+)/issues/(\d+)', path).groups()
+            body = self.issue(base, owner, repo, int(number))
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        payload = json.dumps(body).encode('utf-8')
+        with self.server.stats_lock:
+            self.server.requests += 1
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('X-RateLimit-Remaining', '4999')
+        self.send_header('X-RateLimit-Limit', '5000')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    @staticmethod
+    def repo(base, owner, name):
+        return {
+            'id': abs(hash(name)) % 100000, 'name': name, 'full_name': f"{owner}/{name}",
+            'url': f"{base}/repos/{owner}/{name}",
+            'description': 'MCP operations repository ' * 8,
+        }
+
+    @staticmethod
+    def issue(base, owner, repo, number):
+        return {
+            'id': number, 'number': number, 'title': f"MCP question {number}",
+            'body': 'How do I configure the filesystem MCP server? ' * 20,
+            'url': f"{base}/repos/{owner}/{repo}/issues/{number}",
+            'comments_url': f"{base}/repos/{owner}/{repo}/issues/{number}/comments",
+            'labels': [], 'state': 'open',
+        }
+
+    @staticmethod
+    def comment(index):
+        return {'id': index, 'body': 'Still getting connection refused from mcp-odoo17. ' * 10}
+
+
+def start_stand_in(latency, handshake, comments_per_issue):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), GithubStandInHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.handshake = handshake
+    server.comments_per_issue = comments_per_issue
+    server.stats_lock = threading.Lock()
+    server.connections = server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def coordinator_run(clients, repos, issues_per_repo):
+    """Sequential repo scan on the primary client plus parent-issue lookups on the cross-repo client"""
+    primary, cross = clients
+    latencies = []
+
+    def timed(call):
+        start = time.perf_counter()
+        result = call()
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    start = time.perf_counter()
+    for repo_name in repos:
+        repo = timed(lambda: primary.get_repo(repo_name))
+        for number in range(1, issues_per_repo + 1):
+            issue = timed(lambda: repo.get_issue(number))
+            timed(lambda: list(issue.get_comments()))
+            # PM delegation: look up the parent issue through the other identity
+            parent = timed(lambda: cross.get_repo('jayo2005/paint-project-orchestration'))
+            timed(lambda: parent.get_issue(number))
+    return time.perf_counter() - start, latencies
+
+
+def run_mode(mode, server, args):
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    # Disable PyGithub's client-side request spacing so only the transport differs
+    options = {'base_url': base_url, 'seconds_between_requests': 0}
+    server.connections = server.requests = 0
+    repos = [f"jayo2005/repo-{i}" for i in range(args.repos)]
+
+    # The coordinator's two identities: GITHUB_TOKEN and CROSS_REPO_TOKEN
+    if mode == 'shared':
+        github_transport.install_shared_transport()
+        clients = [github_transport.github_client('primary-token', **options),
+                   github_transport.github_client('cross-token', **options)]
+    else:
+        Requester.resetConnectionClasses()
+        clients = [Github('primary-token', **options), Github('cross-token', **options)]
+
+    elapsed, latencies = coordinator_run(clients, repos, args.issues)
+
+    if mode == 'shared':
+        github_transport.shutdown_shared_transport()
+
+    latencies.sort()
+    return {
+        'mode': mode,
+        'requests': server.requests,
+        'connections': server.connections,
+        'elapsed': elapsed,
+        'mean_ms': statistics.mean(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repos', type=int, default=6)
+    parser.add_argument('--issues', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.002, help='stand-in latency per request (s)')
+    parser.add_argument('--handshake', type=float, default=0.05, help='emulated TLS handshake cost (s)')
+    parser.add_argument('--comments', type=int, default=5)
+    args = parser.parse_args()
+
+    server = start_stand_in(args.latency, args.handshake, args.comments)
+    try:
+        results = [run_mode('default', server, args), run_mode('shared', server, args)]
+    finally:
+        server.shutdown()
+
+    print(f"{'mode':<10}{'requests':>10}{'conns':>8}{'elapsed s':>11}{'mean ms':>10}{'p95 ms':>9}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['requests']:>10}{r['connections']:>8}"
+              f"{r['elapsed']:>11.2f}{r['mean_ms']:>10.2f}{r['p95_ms']:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
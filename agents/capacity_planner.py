@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+MCP Capacity Planner
+Turns per-server request rates, measured per-server latency and container memory
+telemetry into pool sizes, rate limits and memory reservations per server, using
+an M/M/c queueing model, and proposes the matching odoo_mcp/config.json change.
+
+Request rates are observed: the MCP gateway counts every tool call per service
+and minute in the coordinator state store, giving a mean and a peak per-minute
+rate over the window. Servers the gateway has not seen fall back to estimates
+from per-agent rates (fixtures/agent_load.json), split over the servers each
+agent uses.
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import difflib
+import logging
+import argparse
+from collections import defaultdict
+
+from container_telemetry import ContainerTelemetry
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ODOO_MCP_CONFIG = os.path.join(REPO_ROOT, 'odoo_mcp', 'config.json')
+
+DEFAULT_AGENT_LOAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'agent_load.json')
+
+# Keep servers below this utilisation at peak so bursts don't queue up
+MAX_UTILISATION = 0.7
+# Acceptable mean time a request waits for a free connection, relative to its latency
+MAX_WAIT_RATIO = 0.25
+# Rate limits leave room above the observed peak before throttling agents
+RATE_HEADROOM = 1.5
+
+
+def erlang_c(servers, offered_load):
+    """Probability an arrival has to wait in an M/M/c queue (offered_load = λ/μ)"""
+    if offered_load <= 0:
+        return 0.0
+    if offered_load >= servers:
+        return 1.0
+    # Erlang B by recurrence, then converted to Erlang C; stable for large c
+    blocking = 1.0
+    for k in range(1, servers + 1):
+        blocking = offered_load * blocking / (k + offered_load * blocking)
+    return servers * blocking / (servers - offered_load * (1 - blocking))
+
+
+def mmc_wait(servers, arrival_rate, service_time):
+    """Mean queueing delay (seconds) in an M/M/c queue, inf if unstable"""
+    offered_load = arrival_rate * service_time
+    if offered_load >= servers:
+        return math.inf
+    return erlang_c(servers, offered_load) * service_time / (servers - offered_load)
+
+
+def size_pool(arrival_rate, service_time, max_pool=64):
+    """Smallest pool meeting the utilisation and wait targets"""
+    for servers in range(1, max_pool + 1):
+        utilisation = arrival_rate * service_time / servers
+        if utilisation <= MAX_UTILISATION and mmc_wait(servers, arrival_rate, service_time) <= MAX_WAIT_RATIO * service_time:
+            return servers
+    return max_pool
+
+
+def server_rates(agent_load, agent_usage):
+    """Split each agent's request rate over the servers it uses -> {server: (mean_rpm, peak_rpm)}"""
+    rates = {}
+    for agent, load in agent_load.items():
+        servers = agent_usage.get(agent)
+        if not servers:
+            logger.warning(f"No MCP usage known for {agent}; its load is ignored")
+            continue
+        weights = load.get('weights') or {server: 1 for server in servers}
+        total = sum(weights.get(server, 0) for server in servers) or 1
+        for server in servers:
+            share = weights.get(server, 0) / total
+            mean, peak = rates.get(server, (0.0, 0.0))
+            rates[server] = (mean + load['mean_rpm'] * share, peak + load['peak_rpm'] * share)
+    return rates
+
+
+def observed_rates(store, window=7 * 86400, now=None):
+    """{service: (mean_rpm, peak_rpm)} from the gateway's per-minute call counts
+
+    The mean spreads calls over every minute since counting started within the
+    window, idle minutes included; the peak is the busiest single minute.
+    """
+    now = now or time.time()
+    rows = store.service_calls(now - window)
+    if not rows:
+        return {}
+    span = int(now // 60) - min(minute for _, minute, _ in rows) + 1
+    totals, peaks = defaultdict(int), defaultdict(int)
+    for service, _, calls in rows:
+        totals[service] += calls
+        peaks[service] = max(peaks[service], calls)
+    return {service: (totals[service] / span, float(peaks[service])) for service in totals}
+
+
+class CapacityPlanner:
+    def __init__(self, agent_usage, compose_service, agent_load, latency, telemetry=None, observed=None):
+        """agent_load: {agent: {mean_rpm, peak_rpm, weights?}}, the fallback estimate;
+        latency: {compose service: {mean_ms, p95_ms?}} as measured by a load run;
+        observed: {compose service: (mean_rpm, peak_rpm)} from observed_rates()"""
+        self.agent_usage = agent_usage
+        self.compose_service = compose_service
+        self.agent_load = agent_load
+        self.latency = latency
+        self.telemetry = telemetry
+        self.observed = observed or {}
+
+    def rates(self):
+        """{server: (mean_rpm, peak_rpm, source)}, observed where the gateway saw the server"""
+        rates = {server: (mean, peak, 'estimated')
+                 for server, (mean, peak) in server_rates(self.agent_load, self.agent_usage).items()}
+        for servers in self.agent_usage.values():
+            for server in servers:
+                observed = self.observed.get(self.compose_service(server))
+                if observed:
+                    rates[server] = (*observed, 'observed')
+        return rates
+
+    def memory(self, service, window=86400):
+        """(mean, peak) bytes over the window, or None without telemetry"""
+        if self.telemetry is None or service not in self.telemetry.series:
+            return None
+        points = self.telemetry.series[service]['mem_bytes'].window(window)
+        if not points:
+            return None
+        values = [value for _, value in points]
+        return sum(values) / len(values), max(values)
+
+    def plan(self):
+        """One recommendation dict per server with load"""
+        plans = []
+        for server, (mean_rpm, peak_rpm, source) in sorted(self.rates().items()):
+            service = self.compose_service(server)
+            row = {'server': server, 'service': service, 'mean_rpm': mean_rpm, 'peak_rpm': peak_rpm,
+                   'rate_source': source}
+
+            measured = self.latency.get(service) or self.latency.get(server)
+            if measured:
+                service_time = measured['mean_ms'] / 1000
+                arrival_rate = peak_rpm / 60
+                pool = size_pool(arrival_rate, service_time)
+                capacity_rpm = pool * 60 / service_time * MAX_UTILISATION
+                rate_limit = int(math.ceil(peak_rpm * RATE_HEADROOM / 10) * 10) or 10
+                row.update({
+                    'latency_ms': measured['mean_ms'],
+                    'pool_size': pool,
+                    'utilisation': arrival_rate * service_time / pool,
+                    'wait_ms': 1000 * mmc_wait(pool, arrival_rate, service_time),
+                    'capacity_rpm': capacity_rpm,
+                    # Never admit more than the pool can serve at the target utilisation
+                    'requests_per_minute': int(min(rate_limit, capacity_rpm)),
+                    'rate_capped': rate_limit > capacity_rpm,
+                })
+
+            memory = self.memory(service)
+            if memory:
+                mean, peak = memory
+                row.update({
+                    'mem_reservation': mean * 1.1,
+                    'mem_limit': peak * 1.5,
+                })
+            plans.append(row)
+        return plans
+
+
+def mib(value):
+    return f"{value / 1024 ** 2:.0f} MiB"
+
+
+def format_report(plans):
+    lines = [
+        "## MCP capacity plan",
+        f"Pools are sized for peak load at ≤{MAX_UTILISATION:.0%} utilisation with mean queueing "
+        f"≤{MAX_WAIT_RATIO:.0%} of latency (M/M/c); rate limits are peak × {RATE_HEADROOM}.",
+        "",
+        "| Server | Peak req/min | Rates | Latency | Pool | Utilisation | Queue wait | Rate limit/min | Mem reservation | Mem limit |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    notes = []
+    for row in plans:
+        if 'pool_size' in row:
+            cells = [f"{row['latency_ms']:.0f} ms", str(row['pool_size']), f"{row['utilisation']:.0%}",
+                     f"{row['wait_ms']:.1f} ms", str(row['requests_per_minute'])]
+            if row['rate_capped']:
+                notes.append(f"- `{row['service']}`: peak demand exceeds what {row['pool_size']} connections "
+                             f"serve at target utilisation; agents will be throttled")
+        else:
+            cells = ['not measured', '-', '-', '-', '-']
+            notes.append(f"- `{row['service']}`: no latency measurement; run the load generator against it")
+        memory = [mib(row['mem_reservation']), mib(row['mem_limit'])] if 'mem_limit' in row else ['-', '-']
+        lines.append(f"| `{row['service']}` | {row['peak_rpm']:.1f} | {row['rate_source']} | "
+                     + " | ".join(cells + memory) + " |")
+    if notes:
+        lines += ["", "### Notes"] + notes
+    return "\n".join(lines)
+
+
+def config_diff(plans, path=ODOO_MCP_CONFIG):
+    """(unified diff, new text) applying the odoo_mcp recommendation to its config"""
+    row = next((p for p in plans if p['server'] == 'odoo_mcp' and 'pool_size' in p), None)
+    with open(path) as f:
+        current = f.read()
+    if row is None:
+        return '', current
+    config = json.loads(current)
+    config['pool_size'] = row['pool_size']
+    config['requests_per_minute'] = row['requests_per_minute']
+    proposed = json.dumps(config, indent=2)
+    if current.endswith("\n"):
+        proposed += "\n"
+    diff = difflib.unified_diff(
+        current.splitlines(keepends=True), proposed.splitlines(keepends=True),
+        fromfile='a/odoo_mcp/config.json', tofile='b/odoo_mcp/config.json'
+    )
+    return ''.join(diff), proposed
+
+
+def load_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Recommend MCP pool sizes, rate limits and memory reservations')
+    parser.add_argument('--load', default=DEFAULT_AGENT_LOAD,
+                        help='per-agent request rates {agent: {mean_rpm, peak_rpm}}, used for servers '
+                             'the gateway has not counted calls for (default: fixtures/agent_load.json)')
+    parser.add_argument('--window-days', type=float, default=7, help='observed call rates over this many days')
+    parser.add_argument('--latency', required=True, help='JSON of measured latency {service: {mean_ms}}')
+    parser.add_argument('--no-telemetry', action='store_true', help='skip memory recommendations')
+    parser.add_argument('--write', action='store_true', help='apply the odoo_mcp/config.json change')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    from mcp_server_coordinator import MCPServerCoordinator
+    coordinator = MCPServerCoordinator(offline=True)
+    telemetry = None if args.no_telemetry else ContainerTelemetry()
+
+    store = StateStore()
+    try:
+        observed = observed_rates(store, args.window_days * 86400)
+    finally:
+        store.close()
+    if not observed:
+        logger.info("No gateway call counts yet - request rates are estimated from " + args.load)
+
+    planner = CapacityPlanner(coordinator.agent_mcp_usage, coordinator.compose_service,
+                              load_json(args.load), load_json(args.latency), telemetry, observed)
+    plans = planner.plan()
+    print(format_report(plans))
+
+    diff, proposed = config_diff(plans)
+    if not diff:
+        print("\nodoo_mcp/config.json: no change suggested")
+        return
+    print("\n### Suggested odoo_mcp/config.json change\n```diff\n" + diff + "```")
+    if args.write:
+        with open(ODOO_MCP_CONFIG, 'w') as f:
+            f.write(proposed)
+        print(f"Wrote {ODOO_MCP_CONFIG}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Offline Corpus Classifier
+Replays a coordinator's routing over an exported JSONL issue dump across a
+process pool, and reports per-route counts, a confusion matrix against an
+optional labelled column, and classifier throughput
+
+Each line is a JSON object with at least a title and/or body; export with e.g.
+    gh issue list --state all --limit 10000 --json number,title,body,labels
+piped through `jq -c '.[]'`.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from coordinator_backfill import NOT_MCP
+
+logger = logging.getLogger(__name__)
+
+_coordinator = None
+_kind = None
+
+
+def make_coordinator(kind):
+    """Offline coordinator of the given kind: 'enhanced' or 'basic'"""
+    if kind == 'basic':
+        from mcp_server_coordinator import MCPServerCoordinator
+        return MCPServerCoordinator(offline=True)
+    from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+    return MCPServerCoordinatorEnhanced(offline=True)
+
+
+def _init_worker(kind):
+    global _coordinator, _kind
+    # Coordinator modules configure INFO logging on import; keep workers quiet
+    logging.getLogger().setLevel(logging.WARNING)
+    _kind = kind
+    _coordinator = make_coordinator(kind)
+
+
+def classify_record(coordinator, kind, record, render=False):
+    """Route name the coordinator would answer a record with, NOT_MCP if it would skip it"""
+    title = record.get('title') or ''
+    body = record.get('body') or ''
+    text = f"{title} {body}"
+    if not coordinator.is_mcp_related(text):
+        return NOT_MCP
+    if kind == 'basic':
+        route = coordinator.classify_request(title, body)
+        if render:
+            coordinator.analyze_mcp_request(title, body)
+    else:
+        route = coordinator.classify_text(text)
+        if render:
+            coordinator.analyze_text_for_mcp(text)
+    return route
+
+
+def classify_chunk(chunk, label_field, render):
+    """Classify a chunk in a worker; returns aggregates so results stay small"""
+    start = time.perf_counter()
+    routes, confusion = Counter(), Counter()
+    for record in chunk:
+        route = classify_record(_coordinator, _kind, record, render)
+        routes[route] += 1
+        if label_field and record.get(label_field) is not None:
+            confusion[(str(record[label_field]), route)] += 1
+    return routes, confusion, len(chunk), time.perf_counter() - start
+
+
+def read_chunks(stream, chunk_size, stats):
+    """Yield lists of parsed records; malformed lines are counted and skipped"""
+    chunk = []
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            stats['malformed'] += 1
+            continue
+        if not isinstance(record, dict):
+            stats['malformed'] += 1
+            continue
+        chunk.append(record)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def classify_stream(stream, kind='enhanced', workers=None, chunk_size=256, label_field=None, render=False):
+    """Classify every record in a JSONL stream; returns a results dict"""
+    workers = workers or os.cpu_count() or 1
+    # Build the knowledge base index once up front instead of racing in every worker
+    knowledge_base = make_coordinator(kind).knowledge_base
+    if knowledge_base.available:
+        knowledge_base.load()
+
+    stats = Counter()
+    routes, confusion = Counter(), Counter()
+    cpu_seconds = 0.0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(kind,)) as pool:
+        pending = set()
+        for chunk in read_chunks(stream, chunk_size, stats):
+            # Bound the number of chunks in flight so memory doesn't grow with the dump
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cpu_seconds += _merge(future.result(), routes, confusion, stats)
+            pending.add(pool.submit(classify_chunk, chunk, label_field, render))
+        for future in pending:
+            cpu_seconds += _merge(future.result(), routes, confusion, stats)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'coordinator': kind,
+        'records': stats['records'],
+        'malformed': stats['malformed'],
+        'routes': dict(routes.most_common()),
+        'confusion': {f"{label}\t{route}": n for (label, route), n in sorted(confusion.items())},
+        'workers': workers,
+        'elapsed_s': elapsed,
+        'records_per_s': stats['records'] / elapsed if elapsed else 0.0,
+        'worker_ms_per_record': 1000 * cpu_seconds / stats['records'] if stats['records'] else 0.0,
+    }
+
+
+def _merge(result, routes, confusion, stats):
+    chunk_routes, chunk_confusion, count, seconds = result
+    routes.update(chunk_routes)
+    confusion.update(chunk_confusion)
+    stats['records'] += count
+    return seconds
+
+
+def format_report(results):
+    lines = [
+        f"Classified {results['records']} records with the {results['coordinator']} coordinator "
+        f"({results['malformed']} malformed lines skipped)",
+        "",
+        f"{'route':<32}{'count':>8}{'share':>8}",
+    ]
+    total = results['records'] or 1
+    for route, count in results['routes'].items():
+        lines.append(f"{route:<32}{count:>8}{100 * count / total:>7.1f}%")
+
+    if results['confusion']:
+        cells = {tuple(key.split('\t')): n for key, n in results['confusion'].items()}
+        labels = sorted({label for label, _ in cells})
+        predicted = sorted({route for _, route in cells})
+        # Route names are long; number the predicted columns and print a legend
+        lines += ["", "Confusion (rows: label, columns: predicted route)"]
+        lines += [f"  [{i}] {route}" for i, route in enumerate(predicted, 1)]
+        lines.append(f"{'':<32}" + ''.join(f"{f'[{i}]':>6}" for i in range(1, len(predicted) + 1)))
+        for label in labels:
+            lines.append(f"{label:<32}" + ''.join(f"{cells.get((label, p), 0):>6}" for p in predicted))
+        labelled = sum(cells.values())
+        agree = sum(n for (label, route), n in cells.items() if label == route)
+        lines.append(f"Agreement with labels: {agree}/{labelled} ({100 * agree / labelled:.1f}%)")
+
+    lines += [
+        "",
+        f"Throughput: {results['records_per_s']:.0f} records/s over {results['elapsed_s']:.2f}s "
+        f"with {results['workers']} workers ({results['worker_ms_per_record']:.3f} ms/record per worker)",
+    ]
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Classify a JSONL issue dump with the coordinator routing')
+    parser.add_argument('dump', help="JSONL file, or '-' for stdin")
+    parser.add_argument('--coordinator', choices=['enhanced', 'basic'], default='enhanced')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=256)
+    parser.add_argument('--label-field', help='field holding the expected route, for the confusion matrix')
+    parser.add_argument('--render', action='store_true', help='also render each reply, to time the full path')
+    parser.add_argument('--json', dest='json_path', help='also write the results as JSON to this path')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    stream = sys.stdin if args.dump == '-' else open(args.dump)
+    try:
+        results = classify_stream(stream, args.coordinator, args.workers, args.chunk_size,
+                                  args.label_field, args.render)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(format_report(results))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
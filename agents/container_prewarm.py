@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+MCP Container Prewarming
+When the coordinator sees new activity in an agent's repo, it runs one MCP
+initialize handshake for each server that agent uses, before the agent's first
+call.
+
+The agents' scripts start every session with `docker compose run --rm -i`, so no
+container can be handed over: the warm-up session's container is removed like
+any other. What carries over is everything outside the container:
+
+  - the image, built or pulled if it was missing
+  - the npx/pip downloads these servers make at startup, kept in the shared
+    mcp-package-cache volume (see docker-compose.yml)
+  - the host's page cache for the image layers
+
+The agent's first call still pays for container start and server boot, but not
+for downloads or builds. Handshakes run in the background with a bounded timeout
+(MCP_PREWARM_TIMEOUT, default 60s), so they never hold up the coordinator's scan.
+Every decision is recorded, and later checked against docker events to see
+whether the agent actually used the server in time (a hit). That check only
+runs on the MCP host; other hosts leave decisions for it to resolve.
+"""
+
+import os
+import time
+import logging
+import argparse
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+from container_telemetry import docker_runner
+from coordinator_state import StateStore
+from jsonrpc_framing import read_messages, write_message
+
+logger = logging.getLogger(__name__)
+
+COMPOSE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+INITIALIZE_REQUEST = {
+    'jsonrpc': '2.0',
+    'id': 1,
+    'method': 'initialize',
+    'params': {
+        'protocolVersion': '2024-11-05',
+        'capabilities': {},
+        'clientInfo': {'name': 'mcp-coordinator-prewarm', 'version': '1.0.0'},
+    },
+}
+INITIALIZED_NOTIFICATION = {'jsonrpc': '2.0', 'method': 'notifications/initialized'}
+
+
+def mcp_handshake(command, cwd=None, timeout=60):
+    """Start an MCP stdio server, complete initialize, then let it exit; returns seconds taken"""
+    start = time.monotonic()
+    proc = subprocess.Popen(command, cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL)
+    # Reading stdout blocks; the timer unblocks it by killing a hung server
+    timer = threading.Timer(timeout, proc.kill)
+    timer.start()
+    try:
+        write_message(proc.stdin, INITIALIZE_REQUEST)
+        proc.stdin.flush()
+        # Banners some servers print on stdout before speaking JSON-RPC are skipped
+        for message in read_messages(proc.stdout):
+            if isinstance(message, dict) and message.get('id') == INITIALIZE_REQUEST['id']:
+                if 'error' in message:
+                    raise RuntimeError(f"initialize failed: {message['error']}")
+                break
+        else:
+            raise RuntimeError(f"server exited before initialize (status {proc.poll()})")
+        write_message(proc.stdin, INITIALIZED_NOTIFICATION)
+        proc.stdin.flush()
+        return time.monotonic() - start
+    finally:
+        timer.cancel()
+        # Closing stdin ends the session; `run --rm` then removes the container
+        try:
+            proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+class Prewarmer:
+    def __init__(self, store=None, runner=docker_runner, handshake=None, compose_dir=None,
+                 enabled=None, cooldown=None, window=None, timeout=None, workers=None):
+        self.store = store or StateStore()
+        self.runner = runner
+        self.compose_dir = compose_dir or os.environ.get('MCP_COMPOSE_DIR', COMPOSE_DIR)
+        self.handshake = handshake or self.compose_handshake
+        # Only start containers where the coordinator runs on the MCP host;
+        # elsewhere decisions are still recorded so hit rates can be measured
+        if enabled is None:
+            enabled = os.environ.get('MCP_PREWARM', '').lower() in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self.cooldown = cooldown or int(os.environ.get('MCP_PREWARM_COOLDOWN', '900'))
+        # A prewarm counts as a hit if a client starts the server within this window
+        self.window = window or int(os.environ.get('MCP_PREWARM_WINDOW', '1800'))
+        self.timeout = timeout or float(os.environ.get('MCP_PREWARM_TIMEOUT', '60'))
+        self.pool = ThreadPoolExecutor(max_workers=workers or int(os.environ.get('MCP_PREWARM_WORKERS', '4')),
+                                       thread_name_prefix='mcp-prewarm')
+        self._store_lock = threading.Lock()
+        self._decided = set()
+
+    def compose_handshake(self, service):
+        # Same path the agents' scripts take: a one-off `docker compose run` session
+        return mcp_handshake(
+            ['docker', 'compose', '--project-directory', self.compose_dir, 'run', '--rm', '-i', service],
+            cwd=self.compose_dir, timeout=self.timeout
+        )
+
+    def prewarm(self, agent, services, now=None):
+        """Prewarm an agent's services unless they were warmed within the cooldown
+
+        Returns at once; enabled warm-ups run on the background pool.
+        """
+        now = now or time.time()
+        for service in services:
+            if service in self._decided:
+                continue
+            self._decided.add(service)
+
+            with self._store_lock:
+                last = self.store.last_prewarm(service)
+            if last and now - last < self.cooldown:
+                logger.info(f"Prewarm {agent}/{service}: skipped, warmed {now - last:.0f}s ago")
+                continue
+
+            if not self.enabled:
+                logger.info(f"Prewarm {agent}/{service}: decided (MCP_PREWARM off, not started)")
+                with self._store_lock:
+                    self.store.record_prewarm(agent, service, False, now, now)
+                continue
+
+            self.pool.submit(self.warm, agent, service, now)
+
+    def warm(self, agent, service, decided_at):
+        try:
+            seconds = self.handshake(service)
+        except Exception as e:
+            logger.warning(f"Prewarm {agent}/{service} failed: {e}")
+            return
+        logger.info(f"Prewarm {agent}/{service}: initialized in {seconds:.1f}s")
+        with self._store_lock:
+            self.store.record_prewarm(agent, service, True, decided_at, time.time())
+
+    def client_starts(self, service, since, until):
+        """Number of one-off (script-launched) containers of a service started in [since, until)"""
+        output = self.runner([
+            'events', '--since', str(int(since)), '--until', str(int(until)),
+            '--filter', 'type=container', '--filter', 'event=start',
+            '--filter', f'label=com.docker.compose.service={service}',
+            '--filter', 'label=com.docker.compose.oneoff=True',
+            '--format', '{{json .}}',
+        ])
+        return sum(1 for line in output.splitlines() if line.strip())
+
+    def on_mcp_host(self):
+        """True where the agents' MCP sessions run: prewarming is enabled, or this
+        docker has containers of the compose project"""
+        if self.enabled:
+            return True
+        try:
+            output = self.runner(['compose', '--project-directory', self.compose_dir, 'ps', '--all', '--quiet'])
+        except (OSError, subprocess.CalledProcessError):
+            return False
+        return bool(output.strip())
+
+    def evaluate(self, now=None):
+        """Resolve prewarms whose hit window has passed"""
+        now = now or time.time()
+        with self._store_lock:
+            unresolved = self.store.unresolved_prewarms(now - self.window)
+        if not unresolved:
+            return
+        if not self.on_mcp_host():
+            # A hosted Actions runner has docker too, but never sees the agents'
+            # sessions: every decision would be a miss. Leave them to the MCP host.
+            logger.info(f"Not on the MCP host - {len(unresolved)} prewarm decisions left unresolved")
+            return
+        for prewarm_id, service, ready_at in unresolved:
+            try:
+                starts = self.client_starts(service, ready_at, ready_at + self.window)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logger.warning(f"Cannot read docker events: {e}")
+                return
+            with self._store_lock:
+                self.store.resolve_prewarm(prewarm_id, starts > 0)
+
+    def log_hit_rates(self, days=7, now=None):
+        with self._store_lock:
+            rates = self.store.prewarm_hit_rates((now or time.time()) - days * 86400)
+        for agent, (hits, resolved) in rates.items():
+            logger.info(f"Prewarm hit rate for {agent} over {days}d: {hits}/{resolved} ({100 * hits / resolved:.0f}%)")
+
+    def close(self):
+        # Warm-ups already running finish (each bounded by the timeout); queued ones are dropped
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Prewarm MCP servers and report prewarm hit rates')
+    parser.add_argument('services', nargs='*', help='compose services to prewarm now, e.g. mcp-odoo17')
+    parser.add_argument('--agent', default='manual', help='agent the prewarm is recorded against')
+    parser.add_argument('--days', type=int, default=7, help='hit rate window in days')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    prewarmer = Prewarmer(enabled=True) if args.services else Prewarmer()
+    try:
+        if args.services:
+            prewarmer.prewarm(args.agent, args.services)
+        prewarmer.evaluate()
+        prewarmer.log_hit_rates(args.days)
+    finally:
+        prewarmer.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Idle MCP Container Reaper
+Tracks when each MCP server was last used and stops resident containers idle
+beyond their threshold, keeping a priority list of always-warm servers running.
+Stopped servers are started again on demand: by the MCP gateway when it starts
+a session for one, or by `manage.sh wake`
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+
+from container_prewarm import COMPOSE_DIR
+from container_telemetry import docker_runner
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Servers every agent uses, in the order they are started
+DEFAULT_ALWAYS_WARM = ['mcp-github', 'mcp-filesystem']
+
+# Chromium is the most expensive thing on the host; let it go sooner
+DEFAULT_IDLE_OVERRIDES = {'mcp-puppeteer': 1800}
+
+
+def parse_overrides(text):
+    """'mcp-puppeteer=1800,mcp-odoo16=7200' -> {service: seconds}"""
+    overrides = {}
+    for part in (text or '').split(','):
+        if '=' in part:
+            service, seconds = part.split('=', 1)
+            overrides[service.strip()] = int(seconds)
+    return overrides
+
+
+def parse_compose_ps(output):
+    """Running services from `docker compose ps --format json` (array or one object per line)"""
+    output = output.strip()
+    if not output:
+        return set()
+    if output.startswith('['):
+        rows = json.loads(output)
+    else:
+        rows = [json.loads(line) for line in output.splitlines() if line.strip()]
+    return {row['Service'] for row in rows if row.get('State') == 'running'}
+
+
+class DockerRuntime:
+    """Resident compose services on this host"""
+
+    def __init__(self, compose_dir=None, runner=docker_runner):
+        self.compose_dir = compose_dir or os.environ.get('MCP_COMPOSE_DIR', COMPOSE_DIR)
+        self.runner = runner
+
+    def compose(self, args):
+        return self.runner(['compose', '--project-directory', self.compose_dir] + args)
+
+    def running(self):
+        return parse_compose_ps(self.compose(['ps', '--format', 'json']))
+
+    def start(self, service):
+        self.compose(['up', '-d', '--no-recreate', service])
+
+    def stop(self, service):
+        self.compose(['stop', service])
+
+    def client_starts(self, since, until):
+        """(service, started_at) for script-launched one-off containers in [since, until)"""
+        output = self.runner([
+            'events', '--since', str(int(since)), '--until', str(int(until)),
+            '--filter', 'type=container', '--filter', 'event=start',
+            '--filter', 'label=com.docker.compose.oneoff=True',
+            '--format', '{{json .}}',
+        ])
+        starts = []
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            service = event.get('Actor', {}).get('Attributes', {}).get('com.docker.compose.service')
+            if service:
+                starts.append((service, event.get('time', until)))
+        return starts
+
+
+class FakeRuntime:
+    """In-memory runtime for exercising the reaper without docker"""
+
+    def __init__(self, running=(), starts=()):
+        self._running = set(running)
+        self.starts = list(starts)
+        self.actions = []
+
+    def running(self):
+        return set(self._running)
+
+    def start(self, service):
+        self._running.add(service)
+        self.actions.append(('start', service))
+
+    def stop(self, service):
+        self._running.discard(service)
+        self.actions.append(('stop', service))
+
+    def client_starts(self, since, until):
+        return [(service, at) for service, at in self.starts if since <= at < until]
+
+
+class IdleReaper:
+    def __init__(self, runtime=None, store=None, always_warm=None, idle=None, overrides=None):
+        self.runtime = runtime or DockerRuntime()
+        self.store = store or StateStore()
+        if always_warm is None:
+            env = os.environ.get('MCP_REAPER_ALWAYS_WARM')
+            always_warm = [s.strip() for s in env.split(',') if s.strip()] if env else DEFAULT_ALWAYS_WARM
+        self.always_warm = list(always_warm)
+        self.idle = idle or int(os.environ.get('MCP_REAPER_IDLE', str(6 * 3600)))
+        if overrides is None:
+            overrides = dict(DEFAULT_IDLE_OVERRIDES, **parse_overrides(os.environ.get('MCP_REAPER_IDLE_OVERRIDES')))
+        self.overrides = overrides
+
+    def threshold(self, service):
+        return self.overrides.get(service, self.idle)
+
+    def touch(self, service, now=None):
+        """Mark a service as used (by the coordinator, prewarming or a gateway)"""
+        self.store.touch_service(service, now or time.time())
+
+    def ensure_running(self, service, now=None):
+        """Start a service on demand if the reaper stopped it"""
+        self.touch(service, now)
+        if service not in self.runtime.running():
+            logger.info(f"Starting {service} on demand")
+            self.runtime.start(service)
+
+    def refresh_usage(self, now=None, dry_run=False):
+        """Fold client container starts since the last check into last-use times
+
+        Returns {service: latest start} seen; a dry run only reads them.
+        """
+        now = now or time.time()
+        since = float(self.store.get_meta('reaper:events_checked_at', now - self.idle))
+        seen = {}
+        for service, started_at in self.runtime.client_starts(since, now):
+            seen[service] = max(seen.get(service, started_at), started_at)
+        if not dry_run:
+            for service, started_at in seen.items():
+                self.store.touch_service(service, started_at)
+            self.store.set_meta('reaper:events_checked_at', now)
+        return seen
+
+    def reap(self, now=None, dry_run=False):
+        """Stop idle servers and start missing always-warm ones; returns (stopped, started)
+
+        A dry run changes neither containers nor the state store.
+        """
+        now = now or time.time()
+        recent = self.refresh_usage(now, dry_run)
+        running = self.runtime.running()
+
+        stopped = []
+        for service in sorted(running):
+            if service in self.always_warm:
+                continue
+            uses = [used for used in (self.store.last_used(service), recent.get(service)) if used is not None]
+            if not uses:
+                # First sighting: the idle clock starts now, not at some unknown past use
+                if not dry_run:
+                    self.touch(service, now)
+                continue
+            last = max(uses)
+            idle_for = now - last
+            if idle_for < self.threshold(service):
+                continue
+            logger.info(f"{'Would stop' if dry_run else 'Stopping'} {service}: idle {idle_for / 3600:.1f}h "
+                        f"(threshold {self.threshold(service) / 3600:.1f}h)")
+            if not dry_run:
+                self.runtime.stop(service)
+            stopped.append(service)
+
+        started = []
+        for service in self.always_warm:
+            if service not in running:
+                logger.info(f"{'Would start' if dry_run else 'Starting'} always-warm {service}")
+                if not dry_run:
+                    self.runtime.start(service)
+                started.append(service)
+
+        return stopped, started
+
+    def close(self):
+        self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stop idle MCP containers and keep always-warm ones running')
+    parser.add_argument('command', choices=['reap', 'wake', 'touch'])
+    parser.add_argument('services', nargs='*', help='services for wake/touch, e.g. mcp-puppeteer')
+    parser.add_argument('--dry-run', action='store_true', help='log what reap would do without doing it')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    reaper = IdleReaper()
+    try:
+        if args.command == 'reap':
+            stopped, started = reaper.reap(dry_run=args.dry_run)
+            print(f"Stopped: {', '.join(stopped) or 'none'}; started: {', '.join(started) or 'none'}")
+        elif args.command == 'wake':
+            for service in args.services:
+                reaper.ensure_running(service)
+        else:
+            for service in args.services:
+                reaper.touch(service)
+    finally:
+        reaper.close()
+
+
+if __name__ == '__main__':
+    main()
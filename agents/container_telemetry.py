@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Container Telemetry Collector
+Samples CPU, memory and restart counts for the MCP containers into fixed-size
+ring-buffer time series, so the coordinator can say which server is heavy
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import argparse
+import subprocess
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TELEMETRY_PATH = os.path.expanduser('~/.cache/mcp-coordinator/telemetry.json')
+
+METRICS = ('cpu_percent', 'mem_bytes', 'restarts')
+
+_SIZE_UNITS = {
+    'b': 1, 'kb': 1000, 'mb': 1000 ** 2, 'gb': 1000 ** 3, 'tb': 1000 ** 4,
+    'kib': 1024, 'mib': 1024 ** 2, 'gib': 1024 ** 3, 'tib': 1024 ** 4,
+}
+
+
+def parse_size(text):
+    """'12.3MiB' -> bytes"""
+    match = re.match(r'\s*([\d.]+)\s*([a-zA-Z]*)', text or '')
+    if not match:
+        return 0.0
+    value, unit = match.groups()
+    return float(value) * _SIZE_UNITS.get(unit.lower() or 'b', 1)
+
+
+def parse_percent(text):
+    try:
+        return float((text or '0').strip().rstrip('%') or 0)
+    except ValueError:
+        return 0.0
+
+
+def parse_docker_stats(output):
+    """Parse `docker stats --no-stream --format '{{json .}}'` output"""
+    stats = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        row = json.loads(line)
+        mem_used = (row.get('MemUsage') or '').split('/')[0]
+        stats[row['Name'].lstrip('/')] = {
+            'cpu_percent': parse_percent(row.get('CPUPerc')),
+            'mem_bytes': parse_size(mem_used),
+        }
+    return stats
+
+
+def parse_docker_inspect(output):
+    """Parse `docker inspect` JSON for restart counts and state"""
+    info = {}
+    for container in json.loads(output or '[]'):
+        state = container.get('State', {})
+        info[container['Name'].lstrip('/')] = {
+            'restarts': container.get('RestartCount', 0),
+            'status': state.get('Status', 'unknown'),
+        }
+    return info
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of (timestamp, value) pairs; oldest entries are overwritten"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._head = 0
+        self._size = 0
+
+    def append(self, item):
+        self._items[self._head] = item
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def items(self):
+        """Items oldest first"""
+        start = (self._head - self._size) % self.capacity
+        return [self._items[(start + i) % self.capacity] for i in range(self._size)]
+
+    def __len__(self):
+        return self._size
+
+
+class TimeSeries:
+    """Raw samples plus a coarser rollup ring fed with the mean of every N raw samples"""
+
+    def __init__(self, raw_capacity=360, rollup_capacity=288, rollup_every=12):
+        self.raw = RingBuffer(raw_capacity)
+        self.rollup = RingBuffer(rollup_capacity)
+        self.rollup_every = rollup_every
+        self._pending = []
+
+    def add(self, timestamp, value):
+        self.raw.append((timestamp, value))
+        self._pending.append((timestamp, value))
+        if len(self._pending) >= self.rollup_every:
+            self.rollup.append(self._downsample(self._pending))
+            self._pending = []
+
+    @staticmethod
+    def _downsample(points):
+        return (points[-1][0], sum(value for _, value in points) / len(points))
+
+    def window(self, seconds, now=None):
+        """Samples in the last `seconds`, from raw data when it reaches back far enough"""
+        cutoff = (now or time.time()) - seconds
+        raw = self.raw.items()
+        if raw and raw[0][0] <= cutoff:
+            return [p for p in raw if p[0] >= cutoff]
+        older = [p for p in self.rollup.items() if p[0] >= cutoff and (not raw or p[0] < raw[0][0])]
+        return older + raw
+
+    def downsample(self, buckets):
+        """Reduce the raw series to at most `buckets` averaged points"""
+        raw = self.raw.items()
+        if len(raw) <= buckets:
+            return raw
+        size = len(raw) / buckets
+        return [self._downsample(raw[int(i * size):int((i + 1) * size)]) for i in range(buckets)]
+
+    def to_dict(self):
+        return {'raw': self.raw.items(), 'rollup': self.rollup.items(), 'pending': self._pending}
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        series = cls(**kwargs)
+        for point in data.get('raw', []):
+            series.raw.append(tuple(point))
+        for point in data.get('rollup', []):
+            series.rollup.append(tuple(point))
+        series._pending = [tuple(point) for point in data.get('pending', [])]
+        return series
+
+
+def docker_runner(args):
+    result = subprocess.run(['docker'] + args, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+class ContainerTelemetry:
+    def __init__(self, path=None, runner=docker_runner):
+        self.path = path or os.environ.get('MCP_TELEMETRY_PATH', DEFAULT_TELEMETRY_PATH)
+        self.runner = runner
+        self.series = {}
+        self.status = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path) as f:
+            data = json.load(f)
+        self.status = data.get('status', {})
+        for container, metrics in data.get('series', {}).items():
+            self.series[container] = {
+                metric: TimeSeries.from_dict(points) for metric, points in metrics.items()
+            }
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        data = {
+            'status': self.status,
+            'series': {
+                container: {metric: series.to_dict() for metric, series in metrics.items()}
+                for container, metrics in self.series.items()
+            },
+        }
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def sample(self, timestamp=None):
+        """Take one sample of every running MCP container"""
+        timestamp = timestamp or time.time()
+        stats = parse_docker_stats(self.runner(['stats', '--no-stream', '--format', '{{json .}}']))
+        names = sorted(stats)
+        inspect = parse_docker_inspect(self.runner(['inspect'] + names)) if names else {}
+
+        for name in names:
+            if not name.startswith('mcp-'):
+                continue
+            values = dict(stats[name])
+            values['restarts'] = inspect.get(name, {}).get('restarts', 0)
+            self.status[name] = inspect.get(name, {}).get('status', 'running')
+
+            metrics = self.series.setdefault(name, {metric: TimeSeries() for metric in METRICS})
+            for metric in METRICS:
+                metrics[metric].add(timestamp, values[metric])
+
+        logger.info(f"Sampled {len(self.status)} MCP containers")
+
+    def ranking(self, metric='mem_bytes', window=3600, now=None):
+        """Containers ordered by mean metric value over the window, heaviest first"""
+        rows = []
+        for name, metrics in self.series.items():
+            points = metrics[metric].window(window, now)
+            if points:
+                rows.append((name, sum(v for _, v in points) / len(points)))
+        return sorted(rows, key=lambda row: row[1], reverse=True)
+
+    def restarts_in_window(self, name, window=86400, now=None):
+        points = self.series[name]['restarts'].window(window, now)
+        if len(points) < 2:
+            return 0
+        return int(points[-1][1] - points[0][1])
+
+    def heavy_servers_markdown(self, top=5, window=3600):
+        """Markdown table of the heaviest MCP containers, or '' with no data"""
+        by_mem = self.ranking('mem_bytes', window)[:top]
+        if not by_mem:
+            return ''
+        cpu = dict(self.ranking('cpu_percent', window))
+
+        lines = [
+            f"### Heaviest MCP servers (last {window // 60} min average)",
+            "| Container | Memory | CPU | Restarts (total / 24h) |",
+            "|---|---|---|---|",
+        ]
+        for name, mem in by_mem:
+            restarts = self.series[name]['restarts'].raw.items()[-1][1]
+            lines.append(
+                f"| `{name}` | {mem / 1024 ** 2:.0f} MiB | {cpu.get(name, 0):.1f}% "
+                f"| {int(restarts)} / {self.restarts_in_window(name)} |"
+            )
+        return "\n".join(lines)
+
+
+def fixture_runner(stats_file, inspect_file):
+    """Runner that replays captured docker output instead of calling docker"""
+    def run(args):
+        path = stats_file if args[0] == 'stats' else inspect_file
+        with open(path) as f:
+            return f.read()
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sample MCP container telemetry')
+    parser.add_argument('command', choices=['sample', 'report'])
+    parser.add_argument('--stats-file', help='replay docker stats output from a file')
+    parser.add_argument('--inspect-file', help='replay docker inspect output from a file')
+    parser.add_argument('--window', type=int, default=3600)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    runner = docker_runner
+    if args.stats_file:
+        runner = fixture_runner(args.stats_file, args.inspect_file)
+
+    telemetry = ContainerTelemetry(runner=runner)
+    if args.command == 'sample':
+        telemetry.sample()
+        telemetry.save()
+    print(telemetry.heavy_servers_markdown(window=args.window) or 'No telemetry collected yet')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Content Hashes
+Remembers a hash of every issue and comment text the coordinator has handled,
+together with the route it was classified to. The workflow also fires on
+`edited` events: text that is unchanged since it was last seen (later cron
+scans, edits to other fields) is skipped without classifying, and an edit that
+still classifies to the same route (typo fixes) is recorded without answering
+again.
+"""
+
+import hashlib
+import logging
+from collections import Counter
+
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()
+
+
+class ContentHashes:
+    def __init__(self, store=None):
+        self.store = store or StateStore()
+        self.stats = Counter()
+
+    def previous(self, item, text):
+        """(unchanged, route): unchanged is True when text matches the recorded hash;
+        route is the recorded route, or None for items never seen before"""
+        record = self.store.content_record(item)
+        if record is None:
+            return False, None
+        unchanged = record[0] == content_hash(text)
+        if unchanged:
+            self.stats['unchanged'] += 1
+        return unchanged, record[1]
+
+    def recorded(self, item, text):
+        """True if text is what was last recorded for item (not counted as unchanged)"""
+        record = self.store.content_record(item)
+        return record is not None and record[0] == content_hash(text)
+
+    def record(self, item, text, route, outcome):
+        """Remember the text and its route; outcome is counted for the run report"""
+        self.store.save_content_record(item, content_hash(text), route)
+        self.stats[outcome] += 1
+
+    def log_stats(self):
+        if self.stats:
+            logger.info("Content hashes: " + ", ".join(f"{outcome} {n}" for outcome, n in sorted(self.stats.items())))
+
+    def close(self):
+        self.store.close()
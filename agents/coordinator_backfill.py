@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Coordinator Backfill
+Runs the coordinator's classifier over every historical issue (open and closed)
+in the monitored repos, one page at a time, checkpointing after each page so an
+interrupted backfill resumes where it stopped.
+
+Issues that need no answer (not MCP-related, or already labelled
+mcp-responded) have their text hash seeded into the content hashes, so later
+coordinator runs skip them instead of classifying them again. Open unanswered
+MCP issues are left for the coordinator to answer. Dry runs keep checkpoints
+and results in memory and write nothing.
+"""
+
+import os
+import logging
+import socket
+
+from content_hashes import content_hash
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Route recorded for issues that aren't MCP-related at all
+NOT_MCP = 'not_mcp'
+# Route the coordinator falls back to when nothing specific matched
+FALLBACK_ROUTE = 'general_mcp_response'
+
+
+class Backfill:
+    def __init__(self, coordinator, store=None, dry_run=False, lease_ttl=None):
+        self.coordinator = coordinator
+        self.dry_run = dry_run
+        # A dry run only reports coverage; its checkpoints don't outlive the process
+        self.store = StateStore(':memory:') if dry_run else store or StateStore()
+        self.namespace = 'dry-run' if dry_run else 'backfill'
+        self.holder = os.environ.get('GITHUB_RUN_ID', f"{socket.gethostname()}-{os.getpid()}")
+        self.lease_ttl = lease_ttl or int(os.environ.get('MCP_BACKFILL_LEASE_TTL', '900'))
+        self.resource = f"backfill:{self.namespace}"
+
+    def run(self, repos=None, max_pages=None):
+        """Backfill the given repos (default: all monitored); False if another backfill is running"""
+        if not self.store.acquire_lease(self.resource, self.holder, self.lease_ttl):
+            logger.info(f"Another {self.namespace} run holds {self.resource} - exiting")
+            return False
+        try:
+            for repo_name in repos or self.coordinator.repos_to_monitor:
+                try:
+                    self.backfill_repo(repo_name, max_pages)
+                except Exception as e:
+                    # Checkpoints are per page, so the next run picks up from here
+                    logger.error(f"Backfill of {repo_name} stopped: {e}")
+        finally:
+            self.store.release_lease(self.resource, self.holder)
+        return True
+
+    def backfill_repo(self, repo_name, max_pages=None):
+        reader = self.coordinator.tokens.reader(repo_name)
+        repo = self.coordinator.cache.get_repo(reader, repo_name)
+        # Oldest first: new issues only ever append, so item offsets stay stable
+        listing = repo.get_issues(state='all', sort='created', direction='asc')
+        per_page = reader.per_page
+
+        done = self.store.backfill_checkpoint(self.namespace, repo_name)
+        page, skip = divmod(done, per_page)
+        if done:
+            logger.info(f"Resuming backfill of {repo_name} after {done} issues")
+
+        pages = 0
+        while max_pages is None or pages < max_pages:
+            # Only the current page is held in memory
+            issues = listing.get_page(page)[skip:]
+            if not issues:
+                break
+
+            routes, seeded = [], []
+            for issue in issues:
+                if issue.pull_request is not None:
+                    continue
+                thread = f"{repo_name}#{issue.number}"
+                item = f"issue:{thread}"
+                text = issue.title + ' ' + (issue.body or '')
+                route = self.classify(text)
+                routes.append((item, route))
+                responded = self.responded(issue)
+                if route == NOT_MCP or responded:
+                    seeded.append((item, content_hash(text), route))
+                if responded and not self.dry_run:
+                    # Seed the near-duplicate index with questions already answered
+                    self.coordinator.remember_answer(item, thread, text, issue.html_url)
+
+            done += len(issues)
+            self.store.save_backfill_page(self.namespace, repo_name, done, routes, seeded=seeded)
+            self.store.acquire_lease(self.resource, self.holder, self.lease_ttl)
+            logger.info(f"{repo_name}: page {page + 1} done, {done} issues listed")
+
+            pages += 1
+            if len(issues) + skip < per_page:
+                break
+            page, skip = page + 1, 0
+
+    def classify(self, text):
+        if not self.coordinator.is_mcp_related(text):
+            return NOT_MCP
+        return self.coordinator.classify_text(text)
+
+    @staticmethod
+    def responded(issue):
+        return any(label.name == 'mcp-responded' for label in issue.labels)
+
+    def reset(self):
+        self.store.reset_backfill(self.namespace)
+        logger.info(f"Reset {self.namespace} checkpoints")
+
+    def coverage_report(self):
+        """Markdown table of route coverage per repo"""
+        coverage = self.store.backfill_coverage(self.namespace)
+        if not coverage:
+            return 'No issues backfilled yet'
+
+        lines = [
+            f"## Backfill coverage ({self.namespace})",
+            "| Repository | Issues | MCP-related | Specific route | Coverage | Top routes |",
+            "|---|---|---|---|---|---|",
+        ]
+        for repo_name, routes in sorted(coverage.items()):
+            total = sum(routes.values())
+            mcp = total - routes.get(NOT_MCP, 0)
+            specific = mcp - routes.get(FALLBACK_ROUTE, 0)
+            share = f"{100 * specific / mcp:.0f}%" if mcp else '-'
+            top = sorted(
+                ((route, n) for route, n in routes.items() if route != NOT_MCP),
+                key=lambda row: row[1], reverse=True
+            )[:3]
+            top_text = ', '.join(f"{route} ({n})" for route, n in top) or '-'
+            lines.append(f"| `{repo_name}` | {total} | {mcp} | {specific} | {share} | {top_text} |")
+        return "\n".join(lines)
+
+    def close(self):
+        self.store.close()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Coordinator Run Lock
+Stops overlapping cron and event runs from scanning and answering the same items
+"""
+
+import os
+import logging
+import socket
+
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+# exit: losing runs stop immediately
+# claims: losing runs only process items nobody has claimed yet
+# off: no run coordination
+RUN_LOCK_MODES = ('exit', 'claims', 'off')
+
+
+def run_lock_mode():
+    mode = os.environ.get('MCP_RUN_LOCK_MODE', 'exit')
+    if mode not in RUN_LOCK_MODES:
+        raise ValueError(f"MCP_RUN_LOCK_MODE must be one of {', '.join(RUN_LOCK_MODES)}")
+    return mode
+
+
+class RunLock:
+    def __init__(self, run_id=None, store=None, mode=None, lock_ttl=None, claim_ttl=None):
+        self.run_id = run_id or os.environ.get(
+            'GITHUB_RUN_ID', f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.store = store or StateStore()
+        self.mode = mode or run_lock_mode()
+        self.lock_ttl = lock_ttl or int(os.environ.get('MCP_RUN_LOCK_TTL', '1800'))
+        # Claims are released once the reply is posted and its text hash recorded,
+        # which is what stops re-answers; the TTL only covers runs that die mid-reply
+        self.claim_ttl = claim_ttl or int(os.environ.get('MCP_CLAIM_TTL', str(self.lock_ttl)))
+        # Sharded workers run concurrently by design, so each takes its own lock
+        self.resource = f"run:{os.environ.get('MCP_WORKER_ID', 'coordinator')}"
+        self.held = False
+
+    def acquire(self):
+        """Returns True if this run should go ahead"""
+        self.held = self.store.acquire_lease(self.resource, self.run_id, self.lock_ttl)
+        if self.held:
+            logger.info(f"Acquired run lock {self.resource} for run {self.run_id}")
+            return True
+
+        if self.mode == 'claims':
+            logger.info("Run lock held by another run - processing unclaimed items only")
+            return True
+
+        logger.info("Run lock held by another run - exiting")
+        return False
+
+    def renew(self):
+        if self.held:
+            self.store.acquire_lease(self.resource, self.run_id, self.lock_ttl)
+
+    def claim(self, item_key):
+        """Claim an issue or comment for this run; False if another run has it"""
+        self.renew()
+        return self.store.acquire_lease(f"claim:{item_key}", self.run_id, self.claim_ttl)
+
+    def release_claim(self, item_key):
+        self.store.release_lease(f"claim:{item_key}", self.run_id)
+
+    def release(self):
+        if self.held:
+            self.store.release_lease(self.resource, self.run_id)
+            self.held = False
+        self.store.close()
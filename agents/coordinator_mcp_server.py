@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+MCP Coordinator Server
+The coordinator's guidance as a stdio MCP server, so agents can ask directly
+instead of opening an issue and waiting for the next workflow run.
+
+Every response is rendered once at startup from MCPServerCoordinatorEnhanced
+(offline, no GitHub access) and the knowledge base index is loaded up front,
+so a tool call only has to pick and return text.
+
+    claude mcp add coordinator /home/jason/MCP_SERVERS/scripts/mcp-coordinator.sh
+"""
+
+import sys
+import time
+import logging
+import argparse
+
+from jsonrpc_framing import read_messages, write_message
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+from mcp_stdio import PROTOCOL_VERSION, McpError
+
+logger = logging.getLogger(__name__)
+
+# Registry servers with a dedicated guide in the coordinator
+SERVER_GUIDES = {
+    'filesystem': 'explain_filesystem_server',
+    'github': 'explain_cross_repo_token',
+    'sage_mssql': 'provide_sage_guidance',
+    'odoo_mcp': 'provide_odoo_guidance',
+    'odoo16': 'provide_odoo_guidance',
+    'odoo17': 'provide_odoo_guidance',
+}
+
+TOOLS = [
+    {
+        'name': 'list_servers',
+        'description': 'List the MCP servers on this host, grouped by purpose, with the agents that use them',
+        'inputSchema': {'type': 'object', 'properties': {}},
+    },
+    {
+        'name': 'server_guidance',
+        'description': 'How to register, use and troubleshoot one MCP server '
+                       '(registry name, display name or compose service, e.g. sage_mssql or mcp-odoo17)',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {'server': {'type': 'string', 'description': 'Server to get guidance for'}},
+            'required': ['server'],
+        },
+    },
+    {
+        'name': 'troubleshoot',
+        'description': 'Answer an MCP question or problem the way the coordinator answers GitHub issues',
+        'inputSchema': {
+            'type': 'object',
+            'properties': {
+                'question': {'type': 'string', 'description': 'The problem, error message or question'},
+                'server': {'type': 'string', 'description': 'Server involved, if known'},
+            },
+            'required': ['question'],
+        },
+    },
+]
+
+
+class CoordinatorMcpServer:
+    def __init__(self, coordinator=None):
+        started = time.monotonic()
+        self.coordinator = coordinator or MCPServerCoordinatorEnhanced(offline=True)
+        # Sections with live data (log errors, telemetry) are rendered once here;
+        # the container has no docker access to refresh them anyway
+        self.rendered = {route: self.coordinator.render_route(route, '')
+                         for route in list(self.coordinator.kb_routes()) + ['general_mcp_response']}
+        knowledge_base = self.coordinator.knowledge_base
+        knowledge_base.routes = {route: (lambda text, body=self.rendered[route]: body)
+                                 for route in knowledge_base.routes}
+        if knowledge_base.available:
+            knowledge_base.load()
+        self.guidance = {server: self.render_guidance(server) for server in self.coordinator.mcp_servers}
+        logger.info(f"Coordinator MCP server ready in {time.monotonic() - started:.2f}s "
+                    f"({len(self.rendered)} responses, {len(self.guidance)} server guides)")
+
+    def render_guidance(self, server):
+        info = self.coordinator.mcp_servers[server]
+        agents = [agent for agent, servers in self.coordinator.agent_mcp_usage.items() if server in servers]
+        service = self.coordinator.compose_service(server)
+        lines = [
+            f"## 🧭 {info.get('name', server)} (`{server}`)",
+            "",
+            info['description'],
+            "",
+            "### Capabilities",
+        ]
+        lines += [f"- {capability}" for capability in info['capabilities']]
+        if info.get('connection'):
+            lines += ["", f"**Connection:** {info['connection']}"]
+        lines += [
+            "",
+            "### Registration",
+            "```bash",
+            f"claude mcp add {server} {info['script']}",
+            "```",
+            f"Runs as compose service `{service}`; logs: `docker compose logs {service}`",
+            "",
+            f"**Used by:** {', '.join(agents) if agents else 'no agent by default'}",
+        ]
+        guide = SERVER_GUIDES.get(server)
+        if guide:
+            lines += ["", self.rendered[guide]]
+        return "\n".join(lines)
+
+    # Tools
+
+    def list_servers(self, arguments):
+        return self.rendered['list_available_servers']
+
+    def server_guidance(self, arguments):
+        name = (arguments.get('server') or '').strip()
+        server = name if name in self.guidance else next(iter(self.coordinator.mentioned_servers(name)), None)
+        if server is None:
+            raise ValueError(f"Unknown server {name!r}; known servers: {', '.join(sorted(self.guidance))}")
+        return self.guidance[server]
+
+    def troubleshoot(self, arguments):
+        question = arguments.get('question') or ''
+        server = arguments.get('server')
+        text = f"{server} {question}" if server else question
+        answer = self.coordinator.knowledge_base.compose(text) if self.coordinator.knowledge_base.available else None
+        if not answer:
+            answer = self.rendered[self.coordinator.keyword_route(text)]
+        return answer
+
+    # Protocol
+
+    def handle(self, message):
+        method = message.get('method')
+        if method == 'initialize':
+            return {
+                'protocolVersion': (message.get('params') or {}).get('protocolVersion', PROTOCOL_VERSION),
+                'capabilities': {'tools': {}},
+                'serverInfo': {'name': 'mcp-coordinator', 'version': '1.0.0'},
+            }
+        if method == 'ping':
+            return {}
+        if method == 'tools/list':
+            return {'tools': TOOLS}
+        if method == 'tools/call':
+            params = message.get('params') or {}
+            handler = {tool['name']: getattr(self, tool['name']) for tool in TOOLS}.get(params.get('name'))
+            if handler is None:
+                raise McpError({'code': -32602, 'message': f"Unknown tool: {params.get('name')}"})
+            try:
+                text = handler(params.get('arguments') or {})
+            except ValueError as e:
+                return {'content': [{'type': 'text', 'text': str(e)}], 'isError': True}
+            return {'content': [{'type': 'text', 'text': text}]}
+        raise McpError({'code': -32601, 'message': f"Method not found: {method}"})
+
+    def serve(self, stream=None, output=None):
+        output = output or sys.stdout.buffer
+        for message in read_messages(stream or sys.stdin.buffer):
+            if not isinstance(message, dict) or 'id' not in message or 'method' not in message:
+                continue  # notifications need no answer
+            try:
+                reply = {'jsonrpc': '2.0', 'id': message['id'], 'result': self.handle(message)}
+            except McpError as e:
+                reply = {'jsonrpc': '2.0', 'id': message['id'], 'error': {'code': e.code, 'message': str(e)}}
+            except Exception as e:
+                # One bad request must not end the session for every later one
+                logger.exception(f"Coordinator server failed handling request {message['id']!r}")
+                reply = {'jsonrpc': '2.0', 'id': message['id'], 'error': {'code': -32603, 'message': str(e)}}
+            write_message(output, reply)
+            output.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the MCP coordinator as a stdio MCP server')
+    parser.add_argument('--build', action='store_true', help='render responses and build the knowledge base index, then exit')
+    args = parser.parse_args()
+
+    server = CoordinatorMcpServer()
+    if not args.build:
+        server.serve()
+
+
+if __name__ == '__main__':
+    main()
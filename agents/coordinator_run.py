@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Coordinator Run Helpers
+Run-level coordination shared by both coordinators: the run lock and item
+claims, worker sharding, near-duplicate links, prewarming and content hashes.
+The coordinator sets the collaborators it uses (None when disabled or offline)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from duplicate_index import duplicate_note
+from github_transport import shutdown_shared_transport
+
+
+class CoordinatorRunMixin:
+    """Expects run_lock, shards, duplicates, prewarmer, content, state, cache,
+    tokens, g, offline, repos_to_monitor, repo_agents, agent_mcp_usage,
+    prewarm_lookback and compose_service() on the coordinator"""
+
+    def start_run(self):
+        """Take the run lock; returns False if this run should exit"""
+        if self.run_lock is None:
+            return True
+        return self.run_lock.acquire()
+
+    def claim_item(self, item_key, text):
+        """Claim an issue or comment so overlapping runs don't answer it twice;
+        False if another run holds it or has already answered this text"""
+        if self.shards is not None:
+            self.shards.renew_leases()
+        if self.run_lock is None:
+            return True
+        if not self.run_lock.claim(item_key):
+            return False
+        if self.content is not None and self.content.recorded(item_key, text):
+            # Answered by a run that released its claim after this one queued the item
+            self.run_lock.release_claim(item_key)
+            return False
+        return True
+
+    def release_item(self, item_key):
+        """Release a claim once the reply is posted and its text recorded"""
+        if self.run_lock is not None:
+            self.run_lock.release_claim(item_key)
+
+    def finish_run(self):
+        """Release run-level coordination state"""
+        if self.run_lock is not None:
+            self.run_lock.release()
+        if self.shards is not None:
+            self.shards.shutdown()
+        if self.duplicates is not None:
+            self.duplicates.close()
+        if self.prewarmer is not None:
+            self.prewarmer.evaluate()
+            self.prewarmer.log_hit_rates()
+            self.prewarmer.close()
+        if self.content is not None:
+            self.content.log_stats()
+            self.content.close()
+        if self.state is not None:
+            self.state.close()
+        if not self.offline:
+            self.cache.log_stats()
+            self.tokens.log_report()
+            shutdown_shared_transport()
+
+    def link_earlier_answers(self, thread, text, response):
+        """Point a reply at similar questions that were already answered elsewhere"""
+        if self.duplicates is None:
+            return response
+        note = duplicate_note(self.duplicates.find(text, exclude_thread=thread))
+        if not note:
+            return response
+        header, _, rest = response.partition("\n\n")
+        return f"{header}\n\n{note}\n\n{rest}"
+
+    def remember_answer(self, item, thread, text, url):
+        """Index an answered question for later near-duplicate matching"""
+        if self.duplicates is not None:
+            self.duplicates.add(item, thread, text, url)
+
+    def prewarm_for_activity(self, repo_name, issue):
+        """Prewarm the repo agent's MCP servers if the issue saw recent activity"""
+        agent = self.repo_agents.get(repo_name)
+        if self.prewarmer is None or agent is None:
+            return
+        updated_at = issue.updated_at
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        if datetime.now(timezone.utc) - updated_at > timedelta(seconds=self.prewarm_lookback):
+            return
+        services = [self.compose_service(server) for server in self.agent_mcp_usage[agent]]
+        self.prewarmer.prewarm(agent, services)
+
+    def content_unchanged(self, item, text):
+        """(unchanged, previous_route) for an issue or comment text"""
+        if self.content is None:
+            return False, None
+        return self.content.previous(item, text)
+
+    def record_content(self, item, text, route, outcome):
+        if self.content is not None:
+            self.content.record(item, text, route, outcome)
+
+    def issue_for_write(self, repo_name, issue, reader):
+        """Re-resolve an issue through the primary client if another token read it"""
+        if reader is self.g:
+            return issue
+        return self.cache.get_issue(self.g, repo_name, issue.number)
+
+    def repos_for_this_run(self, repos=None):
+        """Repos this coordinator should scan, honouring worker sharding"""
+        repos = repos or self.repos_to_monitor
+        if self.shards is None:
+            return iter(repos)
+        return self.shards.claim_repos(repos)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Coordinator Sharding
+Partitions monitored repositories across coordinator workers using a consistent
+hash ring, with per-repo leases so a crashed worker's repos are picked up by others.
+
+Ring membership is the set of workers with a live heartbeat (MCP_WORKER_TTL) in
+the shared state store, so work is only split between workers whose runs
+overlap. One-shot cron workers that run one after another each see a ring of
+one and process every repo; run them concurrently, or as long-running workers,
+to shard.
+"""
+
+import os
+import bisect
+import hashlib
+import logging
+import socket
+
+from coordinator_state import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+def _hash(key):
+    return int(hashlib.md5(key.encode('utf-8')).hexdigest()[:16], 16)
+
+
+class HashRing:
+    """Consistent hash ring; adding a worker only moves ~1/N of the keys"""
+
+    def __init__(self, workers, vnodes=64):
+        self.vnodes = vnodes
+        self._points = []
+        self._owners = {}
+        for worker in workers:
+            self.add(worker)
+
+    def add(self, worker):
+        for i in range(self.vnodes):
+            point = _hash(f"{worker}#{i}")
+            if point in self._owners:
+                continue
+            bisect.insort(self._points, point)
+            self._owners[point] = worker
+
+    def remove(self, worker):
+        self._points = [p for p in self._points if self._owners[p] != worker]
+        self._owners = {p: w for p, w in self._owners.items() if w != worker}
+
+    def owner(self, key):
+        """Worker responsible for key, or None on an empty ring"""
+        if not self._points:
+            return None
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[index]]
+
+
+class ShardCoordinator:
+    """Decides which repos this worker should process in the current run"""
+
+    def __init__(self, worker_id=None, store=None, heartbeat_ttl=None, lease_ttl=None):
+        self.worker_id = worker_id or os.environ.get(
+            'MCP_WORKER_ID', f"{socket.gethostname()}-{os.getpid()}"
+        )
+        self.store = store or StateStore()
+        self.heartbeat_ttl = heartbeat_ttl or int(os.environ.get('MCP_WORKER_TTL', '120'))
+        self.lease_ttl = lease_ttl or int(os.environ.get('MCP_LEASE_TTL', '600'))
+        # Repos the last claim_repos() left to other workers
+        self.skipped = []
+        # Repos leased to this worker until the run's answers are posted
+        self.held = []
+        self.store.heartbeat(self.worker_id)
+
+    def ring(self):
+        workers = self.store.live_workers(self.heartbeat_ttl)
+        if self.worker_id not in workers:
+            workers.append(self.worker_id)
+        return HashRing(workers)
+
+    def claim_repos(self, repos):
+        """Yield repos owned by this worker and lease each one to it
+
+        Leases are held past the scan, while queued items are answered, until
+        release_repos() (or shutdown()); a repo the scan stops at before
+        scanning it is released straight away. Repos owned or leased by another
+        worker are listed in self.skipped.
+        """
+        self.skipped = []
+        for repo_name in repos:
+            # Rebuild per repo so workers joining or expiring mid-run are honoured
+            self.store.heartbeat(self.worker_id)
+            if self.ring().owner(repo_name) != self.worker_id:
+                self.skipped.append(repo_name)
+                continue
+
+            # The lease guards against a stale ring view while workers join or die
+            if not self.store.acquire_lease(f"repo:{repo_name}", self.worker_id, self.lease_ttl):
+                logger.info(f"Skipping {repo_name}: leased by another worker")
+                self.skipped.append(repo_name)
+                continue
+
+            self.held.append(repo_name)
+            try:
+                yield repo_name
+            except GeneratorExit:
+                # Closed before this repo was scanned: leave it to the next run
+                self.held.remove(repo_name)
+                self.store.release_lease(f"repo:{repo_name}", self.worker_id)
+                raise
+
+    def renew_leases(self):
+        """Extend the leases of held repos; called between answers of a long drain"""
+        self.store.heartbeat(self.worker_id)
+        for repo_name in list(self.held):
+            if not self.store.acquire_lease(f"repo:{repo_name}", self.worker_id, self.lease_ttl):
+                logger.warning(f"Lease on {repo_name} expired and was taken by another worker")
+                self.held.remove(repo_name)
+
+    def release_repos(self):
+        for repo_name in self.held:
+            self.store.release_lease(f"repo:{repo_name}", self.worker_id)
+        self.held = []
+
+    def shutdown(self):
+        self.release_repos()
+        self.store.remove_worker(self.worker_id)
+        self.store.close()
+
+
+def sharding_enabled():
+    """Sharding is opt-in; a single coordinator keeps processing every repo.
+    Workers need overlapping runs to split the repos (see the module docstring)"""
+    return bool(os.environ.get('MCP_WORKER_ID'))
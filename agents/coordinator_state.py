@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Coordinator State Store
+Shared SQLite store used by coordinator workers on the same host
+"""
+
+import os
+import sqlite3
+import time
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = os.path.expanduser('~/.cache/mcp-coordinator/state.db')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    heartbeat_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    resource TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    namespace TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    items INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, repo)
+);
+CREATE TABLE IF NOT EXISTS backfill_items (
+    namespace TEXT NOT NULL,
+    item TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    route TEXT NOT NULL,
+    PRIMARY KEY (namespace, item)
+);
+CREATE TABLE IF NOT EXISTS duplicate_signatures (
+    item TEXT PRIMARY KEY,
+    thread TEXT NOT NULL,
+    url TEXT,
+    signature BLOB NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS duplicate_buckets (
+    band INTEGER NOT NULL,
+    bucket TEXT NOT NULL,
+    item TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, item)
+);
+CREATE TABLE IF NOT EXISTS prewarms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent TEXT NOT NULL,
+    service TEXT NOT NULL,
+    warmed INTEGER NOT NULL,
+    decided_at REAL NOT NULL,
+    ready_at REAL NOT NULL,
+    hit INTEGER
+);
+CREATE INDEX IF NOT EXISTS prewarms_service ON prewarms (service, ready_at);
+CREATE TABLE IF NOT EXISTS service_usage (
+    service TEXT PRIMARY KEY,
+    last_used_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS service_calls (
+    service TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    calls INTEGER NOT NULL,
+    PRIMARY KEY (service, minute)
+);
+CREATE TABLE IF NOT EXISTS content_hashes (
+    item TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    route TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class StateStore:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get('MCP_STATE_DB', DEFAULT_STATE_PATH)
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        # Autocommit mode; multi-statement updates go through transaction().
+        # Threaded callers (the MCP gateway) serialize their own access.
+        self.conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Run a block under an exclusive write lock on the database"""
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.conn
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        else:
+            self.conn.execute('COMMIT')
+
+    def heartbeat(self, worker_id):
+        """Record that a worker is alive"""
+        self.conn.execute(
+            'INSERT INTO workers (worker_id, heartbeat_at) VALUES (?, ?) '
+            'ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at',
+            (worker_id, time.time())
+        )
+
+    def remove_worker(self, worker_id):
+        """Drop a worker from the live set on clean shutdown"""
+        self.conn.execute('DELETE FROM workers WHERE worker_id = ?', (worker_id,))
+
+    def live_workers(self, ttl):
+        """Workers whose heartbeat is younger than ttl seconds"""
+        cutoff = time.time() - ttl
+        rows = self.conn.execute(
+            'SELECT worker_id FROM workers WHERE heartbeat_at >= ? ORDER BY worker_id',
+            (cutoff,)
+        )
+        return [row[0] for row in rows]
+
+    def acquire_lease(self, resource, holder, ttl):
+        """Take or renew a lease; returns False while another holder's lease is live"""
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute(
+                'SELECT holder, expires_at FROM leases WHERE resource = ?', (resource,)
+            ).fetchone()
+            if row and row[0] != holder and row[1] > now:
+                return False
+            conn.execute(
+                'INSERT INTO leases (resource, holder, expires_at) VALUES (?, ?, ?) '
+                'ON CONFLICT(resource) DO UPDATE SET holder = excluded.holder, '
+                'expires_at = excluded.expires_at',
+                (resource, holder, now + ttl)
+            )
+        return True
+
+    def release_lease(self, resource, holder):
+        """Release a lease if we still hold it"""
+        self.conn.execute(
+            'DELETE FROM leases WHERE resource = ? AND holder = ?', (resource, holder)
+        )
+
+    def backfill_checkpoint(self, namespace, repo):
+        """Number of listed issues a backfill has already handled for a repo"""
+        row = self.conn.execute(
+            'SELECT items FROM backfill_checkpoints WHERE namespace = ? AND repo = ?',
+            (namespace, repo)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def save_backfill_page(self, namespace, repo, items, routes, seeded=()):
+        """Record one page of backfill results and advance the checkpoint atomically
+
+        routes is [(item, route)]; seeded is [(item, content_hash, route)] for
+        the content hashes live runs skip unchanged items by.
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO backfill_items (namespace, item, repo, route) VALUES (?, ?, ?, ?)',
+                [(namespace, item, repo, route) for item, route in routes]
+            )
+            conn.executemany(
+                'INSERT INTO content_hashes (item, content_hash, route, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(item) DO UPDATE SET content_hash = excluded.content_hash, '
+                'route = excluded.route, updated_at = excluded.updated_at',
+                [(item, content_hash, route, now) for item, content_hash, route in seeded]
+            )
+            conn.execute(
+                'INSERT INTO backfill_checkpoints (namespace, repo, items, updated_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(namespace, repo) DO UPDATE SET items = excluded.items, '
+                'updated_at = excluded.updated_at',
+                (namespace, repo, items, now)
+            )
+
+    def backfill_coverage(self, namespace):
+        """{repo: {route: count}} for everything a backfill has classified"""
+        coverage = {}
+        rows = self.conn.execute(
+            'SELECT repo, route, COUNT(*) FROM backfill_items WHERE namespace = ? '
+            'GROUP BY repo, route ORDER BY repo, route',
+            (namespace,)
+        )
+        for repo, route, count in rows:
+            coverage.setdefault(repo, {})[route] = count
+        return coverage
+
+    def reset_backfill(self, namespace):
+        """Forget a backfill's checkpoints and results (seeded content hashes stay)"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM backfill_checkpoints WHERE namespace = ?', (namespace,))
+            conn.execute('DELETE FROM backfill_items WHERE namespace = ?', (namespace,))
+
+    def save_signature(self, item, thread, url, signature, buckets):
+        """Store an item's MinHash signature and its LSH buckets, replacing older ones"""
+        with self.transaction() as conn:
+            conn.execute('DELETE FROM duplicate_buckets WHERE item = ?', (item,))
+            conn.execute(
+                'INSERT OR REPLACE INTO duplicate_signatures (item, thread, url, signature, added_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (item, thread, url, signature, time.time())
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO duplicate_buckets (band, bucket, item) VALUES (?, ?, ?)',
+                [(band, bucket, item) for band, bucket in buckets]
+            )
+
+    def bucket_candidates(self, buckets):
+        """Items sharing at least one LSH bucket, with their thread, url and signature"""
+        candidates = {}
+        for band, bucket in buckets:
+            rows = self.conn.execute(
+                'SELECT s.item, s.thread, s.url, s.signature FROM duplicate_buckets b '
+                'JOIN duplicate_signatures s ON s.item = b.item WHERE b.band = ? AND b.bucket = ?',
+                (band, bucket)
+            )
+            for item, thread, url, signature in rows:
+                candidates[item] = (thread, url, signature)
+        return candidates
+
+    def record_prewarm(self, agent, service, warmed, decided_at, ready_at):
+        """Log a prewarm decision; warmed is False when it was only decided, not executed"""
+        self.conn.execute(
+            'INSERT INTO prewarms (agent, service, warmed, decided_at, ready_at) VALUES (?, ?, ?, ?, ?)',
+            (agent, service, int(warmed), decided_at, ready_at)
+        )
+
+    def last_prewarm(self, service):
+        """When the service was last prewarmed (or decided to be), or None"""
+        row = self.conn.execute('SELECT MAX(ready_at) FROM prewarms WHERE service = ?', (service,)).fetchone()
+        return row[0]
+
+    def unresolved_prewarms(self, ready_before):
+        """(id, service, ready_at) of prewarms whose hit window has passed"""
+        return self.conn.execute(
+            'SELECT id, service, ready_at FROM prewarms WHERE hit IS NULL AND ready_at < ? ORDER BY ready_at',
+            (ready_before,)
+        ).fetchall()
+
+    def resolve_prewarm(self, prewarm_id, hit):
+        self.conn.execute('UPDATE prewarms SET hit = ? WHERE id = ?', (int(hit), prewarm_id))
+
+    def prewarm_hit_rates(self, since):
+        """{agent: (hits, resolved)} for prewarms decided since the given time"""
+        rows = self.conn.execute(
+            'SELECT agent, SUM(hit), COUNT(*) FROM prewarms WHERE hit IS NOT NULL AND decided_at >= ? '
+            'GROUP BY agent ORDER BY agent',
+            (since,)
+        )
+        return {agent: (hits, resolved) for agent, hits, resolved in rows}
+
+    def touch_service(self, service, used_at):
+        """Record a use of a service; never moves last use backwards"""
+        self.conn.execute(
+            'INSERT INTO service_usage (service, last_used_at) VALUES (?, ?) '
+            'ON CONFLICT(service) DO UPDATE SET last_used_at = MAX(last_used_at, excluded.last_used_at)',
+            (service, used_at)
+        )
+
+    def count_service_call(self, service, called_at):
+        """Count one tool call in the service's per-minute bucket"""
+        self.conn.execute(
+            'INSERT INTO service_calls (service, minute, calls) VALUES (?, ?, 1) '
+            'ON CONFLICT(service, minute) DO UPDATE SET calls = calls + 1',
+            (service, int(called_at // 60))
+        )
+
+    def service_calls(self, since):
+        """[(service, minute, calls)] for minutes starting at or after since"""
+        return self.conn.execute(
+            'SELECT service, minute, calls FROM service_calls WHERE minute >= ? ORDER BY service, minute',
+            (int(since // 60),)
+        ).fetchall()
+
+    def prune_service_calls(self, before):
+        self.conn.execute('DELETE FROM service_calls WHERE minute < ?', (int(before // 60),))
+
+    def last_used(self, service):
+        row = self.conn.execute(
+            'SELECT last_used_at FROM service_usage WHERE service = ?', (service,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def content_record(self, item):
+        """(content_hash, route) last recorded for an issue or comment, or None"""
+        return self.conn.execute(
+            'SELECT content_hash, route FROM content_hashes WHERE item = ?', (item,)
+        ).fetchone()
+
+    def save_content_record(self, item, content_hash, route):
+        self.conn.execute(
+            'INSERT INTO content_hashes (item, content_hash, route, updated_at) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(item) DO UPDATE SET content_hash = excluded.content_hash, '
+            'route = excluded.route, updated_at = excluded.updated_at',
+            (item, content_hash, route, time.time())
+        )
+
+    def get_meta(self, key, default=None):
+        row = self.conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        self.conn.execute(
+            'INSERT INTO meta (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (key, str(value))
+        )
+
+    def close(self):
+        self.conn.close()
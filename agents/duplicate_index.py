@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Issue Index
+MinHash signatures with LSH banding over answered issue and comment texts, kept
+in the coordinator state store so a new question is matched against every past
+answer by bucket lookup instead of by comparing it with each one
+"""
+
+import os
+import zlib
+import random
+import hashlib
+import logging
+from array import array
+
+from coordinator_state import StateStore
+from knowledge_base import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime modulus for the (a * h + b) mod p permutations
+_PRIME = (1 << 31) - 1
+
+
+def shingles(text, size=1):
+    """Hashed word n-grams of the normalised text
+
+    Single terms by default: questions are short and usually paraphrased rather
+    than copied, which longer shingles would miss.
+    """
+    tokens = tokenize(text)
+    if len(tokens) < size:
+        return {zlib.crc32(' '.join(tokens).encode())} if tokens else set()
+    return {zlib.crc32(' '.join(tokens[i:i + size]).encode()) for i in range(len(tokens) - size + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=128, seed=20250817):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.perms = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text):
+        """num_perm minimum hash values, or None when the text has no terms"""
+        hashes = [h % _PRIME for h in shingles(text)]
+        if not hashes:
+            return None
+        return [min((a * h + b) % _PRIME for h in hashes) for a, b in self.perms]
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the underlying shingle sets"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+class DuplicateIndex:
+    def __init__(self, store=None, num_perm=128, bands=32, threshold=None):
+        """32 bands of 4 rows: pairs above ~0.45 similarity almost always share a bucket"""
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.store = store or StateStore()
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold or float(os.environ.get('MCP_DUPLICATE_THRESHOLD', '0.5'))
+
+    def buckets(self, signature):
+        buckets = []
+        for band in range(self.bands):
+            rows = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(array('I', rows).tobytes(), digest_size=8).hexdigest()
+            buckets.append((band, digest))
+        return buckets
+
+    def add(self, item, thread, text, url=None):
+        """Index an answered item; thread is 'owner/repo#number' of its issue"""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return
+        self.store.save_signature(item, thread, url, array('I', signature).tobytes(), self.buckets(signature))
+
+    def find(self, text, exclude_thread=None, limit=3):
+        """Earlier answered items similar to text, best first: [(item, url, similarity)]"""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return []
+        matches = []
+        for item, (thread, url, blob) in self.store.bucket_candidates(self.buckets(signature)).items():
+            if thread == exclude_thread:
+                continue
+            score = similarity(signature, array('I', blob))
+            if score >= self.threshold:
+                matches.append((item, url, score))
+        matches.sort(key=lambda match: match[2], reverse=True)
+        return matches[:limit]
+
+    def close(self):
+        self.store.close()
+
+
+def duplicate_note(matches):
+    """Markdown section linking earlier answers, or ''"""
+    if not matches:
+        return ''
+    lines = ["### 🔁 Asked before",
+             "This looks like a question that was already answered - the earlier thread may have more context:"]
+    for item, url, score in matches:
+        label = item.split(':', 1)[1]
+        link = f"[{label}]({url})" if url else f"`{label}`"
+        lines.append(f"- {link} ({score:.0%} similar)")
+    return "\n".join(lines)
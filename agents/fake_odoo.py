@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Fake Odoo Server
+Local stand-in for an Odoo instance speaking the external XML-RPC
+(/xmlrpc/2/common, /xmlrpc/2/object) and JSON-RPC (/jsonrpc) APIs, with
+configurable latency and a limited number of Odoo workers, so MCP settings can
+be load tested without touching production
+
+GET /stats returns call counts, time spent queueing for a worker and peak
+concurrency.
+"""
+
+import json
+import time
+import random
+import socket
+import argparse
+import threading
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SERVER_VERSION = {
+    'server_version': '17.0',
+    'server_version_info': [17, 0, 0, 'final', 0, ''],
+    'server_serie': '17.0',
+    'protocol_version': 1,
+}
+
+
+class OdooError(Exception):
+    pass
+
+
+def seed_records(count, rng):
+    """Deterministic demo data for the models agents usually query"""
+    partners = [{'id': i, 'name': f"Customer {i}", 'email': f"customer{i}@example.com",
+                 'is_company': i % 3 == 0, 'country_id': [104, 'Ireland']} for i in range(1, count + 1)]
+    products = [{'id': i, 'name': f"Paint {i} {rng.choice(['Matt', 'Satin', 'Gloss'])}",
+                 'default_code': f"PAINT{i:05d}", 'list_price': round(rng.uniform(5, 120), 2),
+                 'qty_available': rng.randint(0, 500)} for i in range(1, count + 1)]
+    orders = [{'id': i, 'name': f"S{i:05d}", 'partner_id': [1 + i % count, f"Customer {1 + i % count}"],
+               'amount_total': round(rng.uniform(20, 5000), 2), 'state': rng.choice(['draft', 'sale', 'done'])}
+              for i in range(1, count + 1)]
+    return {'res.partner': partners, 'product.template': products, 'sale.order': orders}
+
+
+def matches(record, domain):
+    """Subset of Odoo domain semantics: implicit AND of (field, op, value) leaves"""
+    for leaf in domain:
+        if not isinstance(leaf, (list, tuple)) or len(leaf) != 3:
+            continue  # '&' / '|' operators are accepted and treated as AND
+        field, op, value = leaf
+        current = record.get(field)
+        if isinstance(current, list) and current:
+            current = current[0]
+        if op == '=' and current != value:
+            return False
+        if op == '!=' and current == value:
+            return False
+        if op in ('ilike', 'like') and str(value).lower() not in str(current or '').lower():
+            return False
+        if op == 'in' and current not in value:
+            return False
+        if op in ('>', '>=', '<', '<=') and not _compare(current, op, value):
+            return False
+    return True
+
+
+def _compare(current, op, value):
+    try:
+        return {'>': current > value, '>=': current >= value, '<': current < value, '<=': current <= value}[op]
+    except TypeError:
+        return False
+
+
+class FakeOdoo:
+    def __init__(self, latency=0.05, jitter=0.02, workers=4, records=500, database='fake', seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.database = database
+        self.rng = random.Random(seed)
+        self.models = seed_records(records, self.rng)
+        self.next_id = records + 1
+        # Odoo serves a request per worker; the rest queue in front of it
+        self.workers = threading.Semaphore(workers)
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.stats_lock:
+            self.stats = {'calls': 0, 'errors': 0, 'queue_seconds': 0.0, 'service_seconds': 0.0,
+                          'in_flight': 0, 'peak_in_flight': 0, 'methods': {}}
+
+    def snapshot(self):
+        with self.stats_lock:
+            return json.loads(json.dumps(self.stats))
+
+    def call(self, service, method, args):
+        """Dispatch one RPC like Odoo's service layer, holding a worker for its duration"""
+        arrived = time.perf_counter()
+        with self.stats_lock:
+            self.stats['in_flight'] += 1
+            self.stats['peak_in_flight'] = max(self.stats['peak_in_flight'], self.stats['in_flight'])
+        try:
+            with self.workers:
+                started = time.perf_counter()
+                delay = max(0.0, self.rng.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+                time.sleep(delay)
+                try:
+                    return self.dispatch(service, method, args)
+                except OdooError:
+                    with self.stats_lock:
+                        self.stats['errors'] += 1
+                    raise
+                finally:
+                    with self.stats_lock:
+                        self.stats['calls'] += 1
+                        self.stats['queue_seconds'] += started - arrived
+                        self.stats['service_seconds'] += time.perf_counter() - started
+                        key = f"{service}.{method}"
+                        self.stats['methods'][key] = self.stats['methods'].get(key, 0) + 1
+        finally:
+            with self.stats_lock:
+                self.stats['in_flight'] -= 1
+
+    def dispatch(self, service, method, args):
+        if service == 'common':
+            if method == 'version':
+                return SERVER_VERSION
+            if method in ('login', 'authenticate'):
+                db, login, password = args[:3]
+                if db != self.database or not password:
+                    return False
+                return 2
+        elif service == 'db':
+            if method == 'list':
+                return [self.database]
+            if method == 'server_version':
+                return SERVER_VERSION['server_version']
+        elif service == 'object' and method in ('execute_kw', 'execute'):
+            db, uid, password, model, model_method = args[:5]
+            positional = args[5] if len(args) > 5 else []
+            kwargs = args[6] if len(args) > 6 else {}
+            if method == 'execute':
+                positional, kwargs = args[5:], {}
+            return self.execute(model, model_method, positional, kwargs or {})
+        raise OdooError(f"Unknown method {service}.{method}")
+
+    def execute(self, model, method, args, kwargs):
+        if model not in self.models:
+            raise OdooError(f"Object {model} doesn't exist")
+        records = self.models[model]
+
+        def domain():
+            return args[0] if args else kwargs.get('domain', [])
+
+        def window(rows):
+            offset = kwargs.get('offset', 0)
+            limit = kwargs.get('limit')
+            return rows[offset:offset + limit if limit else None]
+
+        def project(rows, fields):
+            if not fields:
+                return [dict(row) for row in rows]
+            return [{'id': row['id'], **{f: row.get(f, False) for f in fields}} for row in rows]
+
+        if method == 'search':
+            return [r['id'] for r in window([r for r in records if matches(r, domain())])]
+        if method == 'search_count':
+            return sum(1 for r in records if matches(r, domain()))
+        if method == 'search_read':
+            fields = args[1] if len(args) > 1 else kwargs.get('fields')
+            return project(window([r for r in records if matches(r, domain())]), fields)
+        if method == 'read':
+            ids = set(args[0]) if args else set()
+            fields = args[1] if len(args) > 1 else kwargs.get('fields')
+            return project([r for r in records if r['id'] in ids], fields)
+        if method == 'fields_get':
+            return {field: {'type': type(value).__name__, 'string': field.replace('_', ' ').title()}
+                    for field, value in records[0].items()} if records else {}
+        if method == 'name_get':
+            ids = set(args[0]) if args else set()
+            return [[r['id'], r.get('name', '')] for r in records if r['id'] in ids]
+        if method == 'create':
+            with self.stats_lock:
+                record_id = self.next_id
+                self.next_id += 1
+            records.append(dict(args[0], id=record_id))
+            return record_id
+        if method == 'write':
+            ids, values = set(args[0]), args[1]
+            for r in records:
+                if r['id'] in ids:
+                    r.update(values)
+            return True
+        if method == 'unlink':
+            ids = set(args[0])
+            self.models[model] = [r for r in records if r['id'] not in ids]
+            return True
+        raise OdooError(f"Method {method} not supported on {model}")
+
+
+class FakeOdooHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self.reply(200, 'application/json', json.dumps(self.server.odoo.snapshot()).encode())
+        elif self.path.rstrip('/') == '/web/webclient/version_info':
+            self.reply(200, 'application/json', json.dumps({'result': SERVER_VERSION}).encode())
+        else:
+            self.reply(404, 'text/plain', b'not found')
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        path = self.path.rstrip('/')
+        if path.startswith('/xmlrpc/2/') or path.startswith('/xmlrpc/'):
+            self.xmlrpc(path.rsplit('/', 1)[-1], body)
+        elif path in ('/jsonrpc', '/web/version_info'):
+            self.jsonrpc(body)
+        elif path == '/stats/reset':
+            self.server.odoo.reset_stats()
+            self.reply(200, 'application/json', b'{}')
+        else:
+            self.reply(404, 'text/plain', b'not found')
+
+    def xmlrpc(self, service, body):
+        try:
+            params, method = xmlrpc.client.loads(body)
+            result = self.server.odoo.call(service, method, list(params))
+            payload = xmlrpc.client.dumps((result,), methodresponse=True, allow_none=True)
+        except Exception as e:
+            payload = xmlrpc.client.dumps(xmlrpc.client.Fault(1, str(e)), methodresponse=True)
+        self.reply(200, 'text/xml', payload.encode())
+
+    def jsonrpc(self, body):
+        request_id = None
+        try:
+            request = json.loads(body)
+            request_id = request.get('id')
+            params = request.get('params', {})
+            result = self.server.odoo.call(params.get('service'), params.get('method'), params.get('args', []))
+            response = {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+        except Exception as e:
+            response = {'jsonrpc': '2.0', 'id': request_id,
+                        'error': {'code': 200, 'message': 'Odoo Server Error', 'data': {'message': str(e)}}}
+        self.reply(200, 'application/json', json.dumps(response).encode())
+
+    def reply(self, status, content_type, payload):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def start_fake_odoo(host='127.0.0.1', port=0, **kwargs):
+    """Start the stand-in on a background thread; returns the server (url in .url)"""
+    server = ThreadingHTTPServer((host, port), FakeOdooHandler)
+    server.daemon_threads = True
+    server.odoo = FakeOdoo(**kwargs)
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a local fake Odoo XML-RPC/JSON-RPC server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8069)
+    parser.add_argument('--latency', type=float, default=0.05, help='mean service time per call (s)')
+    parser.add_argument('--jitter', type=float, default=0.02, help='standard deviation of the service time (s)')
+    parser.add_argument('--workers', type=int, default=4, help='calls served concurrently, like Odoo workers')
+    parser.add_argument('--records', type=int, default=500, help='records per demo model')
+    parser.add_argument('--database', default='fake')
+    args = parser.parse_args()
+
+    server = start_fake_odoo(args.host, args.port, latency=args.latency, jitter=args.jitter,
+                             workers=args.workers, records=args.records, database=args.database)
+    print(f"Fake Odoo listening on {server.url} (database {args.database!r}); Ctrl-C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+GitHub Object Cache
+TTL + LRU cache for PyGithub objects shared by the primary and cross-repo clients
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after ttl seconds
+
+    With maxbytes, entries are also weighed by sizeof(value) and the least
+    recently used are evicted until the total fits; a value heavier than
+    maxbytes on its own is not cached at all.
+    """
+
+    def __init__(self, maxsize=256, ttl=300, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value, ttl=None):
+        with self._lock:
+            size = self.sizeof(value) if self.maxbytes else 0
+            self._drop(key)
+            if self.maxbytes and size > self.maxbytes:
+                return
+            self._data[key] = (value, time.monotonic() + (ttl or self.ttl))
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (self.maxbytes and self.nbytes > self.maxbytes):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        entry = self._data.pop(key, None)
+        if entry is not None and self.maxbytes:
+            self.nbytes -= self.sizeof(entry[0])
+
+    def get_or_load(self, key, loader, ttl=None):
+        """Return the cached value or call loader() and cache its result"""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = loader()
+            self.put(key, value, ttl)
+        return value
+
+    def invalidate(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class GithubObjectCache:
+    """Caches repos, issues, the authenticated user and label lists per client"""
+
+    def __init__(self, maxsize=None, ttl=None):
+        self.cache = TTLCache(
+            maxsize=maxsize or int(os.environ.get('MCP_GITHUB_CACHE_SIZE', '512')),
+            ttl=ttl or int(os.environ.get('MCP_GITHUB_CACHE_TTL', '300'))
+        )
+
+    @staticmethod
+    def _client_key(client):
+        # Objects carry the requester that fetched them, so never share across tokens
+        return id(client)
+
+    def get_repo(self, client, full_name):
+        # lazy=True avoids a GET /repos call; fields load on first attribute access
+        return self.cache.get_or_load(
+            (self._client_key(client), 'repo', full_name),
+            lambda: client.get_repo(full_name, lazy=True)
+        )
+
+    def get_issue(self, client, full_name, number):
+        return self.cache.get_or_load(
+            (self._client_key(client), 'issue', full_name, number),
+            lambda: self.get_repo(client, full_name).get_issue(number)
+        )
+
+    def get_user(self, client):
+        return self.cache.get_or_load(
+            (self._client_key(client), 'user'),
+            lambda: client.get_user()
+        )
+
+    def get_labels(self, client, full_name):
+        return self.cache.get_or_load(
+            (self._client_key(client), 'labels', full_name),
+            lambda: list(self.get_repo(client, full_name).get_labels())
+        )
+
+    def invalidate_issue(self, client, full_name, number):
+        self.cache.invalidate((self._client_key(client), 'issue', full_name, number))
+
+    def log_stats(self):
+        logger.info(
+            f"GitHub object cache: {self.cache.hits} hits, {self.cache.misses} misses, "
+            f"{self.cache.evictions} evictions, {len(self.cache)} entries"
+        )
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+GitHub Token Pool
+Routes read calls to whichever eligible token has the most rate-limit budget left,
+while writes stay pinned to the identity that must author them
+"""
+
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def token_scope(env_var):
+    """Comma-separated repo names a token may read, from env; None means any repo"""
+    value = os.environ.get(env_var, '')
+    repos = [repo.strip() for repo in value.split(',') if repo.strip()]
+    return set(repos) or None
+
+
+class TokenPool:
+    def __init__(self):
+        self.clients = {}
+        self.scopes = {}
+        self.reads_routed = {}
+        self.start_remaining = {}
+
+    def add(self, name, client, scope=None):
+        """Register a client; scope is a set of repo names it may read, or None for any"""
+        self.clients[name] = client
+        self.scopes[name] = set(scope) if scope else None
+        self.reads_routed[name] = 0
+
+    def remaining(self, name):
+        """Remaining core budget from the last response headers (one rate_limit call if unknown)"""
+        try:
+            remaining, _ = self.clients[name].rate_limiting
+        except Exception as e:
+            logger.warning(f"Could not read rate limit for token '{name}': {e}")
+            return 0
+        self.start_remaining.setdefault(name, remaining)
+        return remaining
+
+    def eligible(self, repo_name=None):
+        return [
+            name for name, scope in self.scopes.items()
+            if scope is None or repo_name is None or repo_name in scope
+        ]
+
+    def reader(self, repo_name=None):
+        """Client with the most remaining budget among tokens that can read repo_name"""
+        names = self.eligible(repo_name)
+        if not names:
+            raise ValueError(f"No GitHub token can read {repo_name}")
+
+        # No need to spend a rate_limit lookup when there is nothing to choose
+        name = names[0] if len(names) == 1 else max(names, key=self.remaining)
+        self.reads_routed[name] += 1
+        return self.clients[name]
+
+    def writer(self, name):
+        """Writes are never pooled: comments and labels must come from a fixed identity"""
+        return self.clients[name]
+
+    def report(self):
+        """Per-token reads routed and core budget consumed during this run"""
+        lines = []
+        for name in self.clients:
+            start = self.start_remaining.get(name)
+            if start is None:
+                lines.append(f"{name}: {self.reads_routed[name]} reads routed, budget not observed")
+                continue
+            now = self.remaining(name)
+            # Clamped: a rate-limit window reset mid-run refills the budget
+            used = max(start - now, 0)
+            lines.append(
+                f"{name}: {self.reads_routed[name]} reads routed, "
+                f"{used} core requests used, {now} remaining"
+            )
+        return lines
+
+    def log_report(self):
+        for line in self.report():
+            logger.info(f"Token pool - {line}")
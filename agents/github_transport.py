@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Shared GitHub HTTP Transport
+One pooled keep-alive requests session shared by every PyGithub client the
+coordinators create, instead of one session per Github instance
+"""
+
+import os
+import logging
+import threading
+
+import requests
+from github import Github
+from github.GithubRetry import GithubRetry
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+
+logger = logging.getLogger(__name__)
+
+_transport = None
+_install_lock = threading.Lock()
+
+
+class SharedTransport:
+    def __init__(self, pool_size=None, max_hosts=None, connect_timeout=None, read_timeout=None):
+        # pool_size is the per-host connection limit; match it to the number of
+        # threads issuing GitHub calls so none of them wait on a connection
+        self.pool_size = pool_size or int(os.environ.get('MCP_GITHUB_POOL_SIZE', '10'))
+        self.max_hosts = max_hosts or int(os.environ.get('MCP_GITHUB_MAX_HOSTS', '4'))
+        self.timeout = (
+            connect_timeout or float(os.environ.get('MCP_GITHUB_CONNECT_TIMEOUT', '5')),
+            read_timeout or float(os.environ.get('MCP_GITHUB_READ_TIMEOUT', '30')),
+        )
+
+        self.session = requests.Session()
+        # Same as PyGithub: a non-None auth disables the .netrc fallback
+        self.session.auth = Requester.noopAuth
+
+        self.adapter = requests.adapters.HTTPAdapter(
+            max_retries=GithubRetry(),
+            pool_connections=self.max_hosts,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+    def stats(self):
+        """Connections opened and requests sent across all host pools"""
+        pools = self.adapter.poolmanager.pools
+        opened = requests_sent = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += pool.num_connections
+                requests_sent += pool.num_requests
+        return {'connections_opened': opened, 'requests': requests_sent}
+
+    def close(self):
+        self.session.close()
+
+
+class SharedHTTPSConnection(HTTPSRequestsConnectionClass):
+    """PyGithub connection object that borrows the shared session"""
+
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else 443
+        self.protocol = 'https'
+        self.timeout = _transport.timeout
+        self.verify = kwargs.get('verify', True)
+        self.session = _transport.session
+
+    def close(self):
+        # The session outlives individual requests; shutdown_shared_transport closes it
+        pass
+
+
+class SharedHTTPConnection(HTTPRequestsConnectionClass):
+    def __init__(self, host, port=None, strict=False, timeout=None, retry=None, pool_size=None, **kwargs):
+        self.host = host
+        self.port = port if port else 80
+        self.protocol = 'http'
+        self.timeout = _transport.timeout
+        self.verify = kwargs.get('verify', True)
+        self.session = _transport.session
+
+    def close(self):
+        pass
+
+
+def install_shared_transport(**kwargs):
+    """Route every PyGithub client through one pooled session (idempotent)"""
+    global _transport
+    with _install_lock:
+        if _transport is None:
+            _transport = SharedTransport(**kwargs)
+            # Injected classes are created per request, which also makes a single
+            # Github client safe to use from several threads
+            Requester.injectConnectionClasses(SharedHTTPConnection, SharedHTTPSConnection)
+            logger.info(
+                f"Shared GitHub transport: pool {_transport.pool_size}/host, "
+                f"timeouts {_transport.timeout}"
+            )
+    return _transport
+
+
+def shutdown_shared_transport():
+    global _transport
+    with _install_lock:
+        if _transport is not None:
+            logger.info(f"Shared GitHub transport stats: {_transport.stats()}")
+            _transport.close()
+            _transport = None
+            Requester.resetConnectionClasses()
+
+
+def github_client(token, **kwargs):
+    """Create a Github client on the shared transport"""
+    transport = install_shared_transport()
+    kwargs.setdefault('pool_size', transport.pool_size)
+    return Github(token, **kwargs)
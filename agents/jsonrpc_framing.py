@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+JSON-RPC Stdio Framing
+Incremental codec for MCP stdio streams. It handles newline-delimited JSON and
+LSP-style Content-Length frames.
+
+Reads land directly in one growing bytearray via readinto. Newline searches
+resume where the previous search stopped, and Content-Length bodies are never
+scanned at all. Frames are handed out as memoryview slices of the buffer, so a
+multi-megabyte tools/call result is decoded straight from the bytes that were
+read, without intermediate copies.
+"""
+
+import json
+
+NEWLINE = 'newline'
+CONTENT_LENGTH = 'content-length'
+AUTO = 'auto'
+
+READ_SIZE = 64 * 1024
+MAX_MESSAGE = 256 * 1024 ** 2
+
+
+class FramingError(ValueError):
+    pass
+
+
+class FrameDecoder:
+    """Splits a byte stream into frames without re-scanning consumed data
+
+    Frames from frames() are memoryviews into the decoder's buffer and are only
+    valid until the generator is resumed; decode or copy them before that.
+    """
+
+    def __init__(self, framing=AUTO, max_message=MAX_MESSAGE):
+        self.framing = framing
+        self.max_message = max_message
+        self._buffer = bytearray(READ_SIZE)
+        self._start = 0          # first byte not yet handed out
+        self._end = 0            # end of valid data
+        self._scan = 0           # newline / header search resumes here
+        self._body_length = None  # pending Content-Length body size
+        self._body_start = 0
+        self.eof = False
+
+    # Filling the buffer
+
+    def _reserve(self, size):
+        """Make room for size more bytes, compacting before growing"""
+        if len(self._buffer) - self._end >= size:
+            return
+        pending = self._end - self._start
+        if self._start and pending + size <= len(self._buffer):
+            # One move of the unconsumed tail; everything before it is dead
+            self._buffer[:pending] = self._buffer[self._start:self._end]
+        else:
+            grown = bytearray(max(len(self._buffer) * 2, pending + size))
+            grown[:pending] = self._buffer[self._start:self._end]
+            self._buffer = grown
+        self._scan -= self._start
+        self._body_start -= self._start
+        self._start, self._end = 0, pending
+
+    def feed(self, data):
+        """Append bytes received from elsewhere (sockets, tests)"""
+        self._reserve(len(data))
+        self._buffer[self._end:self._end + len(data)] = data
+        self._end += len(data)
+
+    def read_from(self, stream, size=READ_SIZE):
+        """Read once from a binary stream straight into the buffer; False at EOF"""
+        # Room for a whole pending Content-Length body avoids repeated growth
+        if self._body_length is not None:
+            size = max(size, self._body_start + self._body_length - self._end)
+        self._reserve(size)
+        readinto = getattr(stream, 'readinto1', None) or stream.readinto
+        with memoryview(self._buffer) as whole:
+            count = readinto(whole[self._end:self._end + size])
+        if not count:
+            self.eof = True
+            return False
+        self._end += count
+        return True
+
+    # Splitting frames
+
+    def _detect(self):
+        while self._start < self._end and self._buffer[self._start] in b' \t\r\n':
+            self._start += 1
+        self._scan = max(self._scan, self._start)
+        if self._start == self._end:
+            return False
+        if self._buffer[self._start] not in b'Cc':
+            self.framing = NEWLINE
+            return True
+        if self._end - self._start < 14:
+            return False
+        head = bytes(self._buffer[self._start:self._start + 14]).lower()
+        self.framing = CONTENT_LENGTH if head.startswith((b'content-length', b'content-type')) else NEWLINE
+        return True
+
+    def _next_span(self):
+        if self.framing == AUTO and not self._detect():
+            if self.eof and self._start < self._end:
+                self.framing = NEWLINE
+            else:
+                return None
+        if self.framing == NEWLINE:
+            return self._next_line()
+        return self._next_content_length()
+
+    def _next_line(self):
+        while True:
+            newline = self._buffer.find(b'\n', self._scan, self._end)
+            if newline < 0:
+                self._scan = self._end
+                if self._end - self._start > self.max_message:
+                    raise FramingError(f"message exceeds {self.max_message} bytes without a newline")
+                if self.eof and self._start < self._end:
+                    # Last message without a trailing newline
+                    start, end = self._start, self._end
+                    self._start = self._scan = self._end
+                    return start, end
+                return None
+            start, end = self._start, newline
+            self._start = self._scan = newline + 1
+            if end > start and self._buffer[end - 1] == 0x0d:
+                end -= 1
+            if end > start:
+                return start, end
+
+    def _next_content_length(self):
+        if self._body_length is None:
+            separator = self._buffer.find(b'\r\n\r\n', max(self._start, self._scan - 3), self._end)
+            if separator < 0:
+                self._scan = self._end
+                if self._end - self._start > 8192:
+                    raise FramingError('header block too long')
+                return None
+            length = None
+            for line in bytes(self._buffer[self._start:separator]).split(b'\r\n'):
+                name, _, value = line.partition(b':')
+                if name.strip().lower() == b'content-length':
+                    length = int(value.strip())
+            if length is None:
+                raise FramingError('frame without Content-Length')
+            if length > self.max_message:
+                raise FramingError(f"message of {length} bytes exceeds {self.max_message}")
+            self._body_length = length
+            self._body_start = separator + 4
+        if self._end - self._body_start < self._body_length:
+            return None
+        start, end = self._body_start, self._body_start + self._body_length
+        self._start = self._scan = end
+        self._body_length = None
+        return start, end
+
+    def frames(self):
+        """Complete frames currently buffered, as memoryviews"""
+        while True:
+            span = self._next_span()
+            if span is None:
+                return
+            with memoryview(self._buffer) as whole:
+                frame = whole[span[0]:span[1]]
+                try:
+                    yield frame
+                finally:
+                    frame.release()
+
+    def messages(self, skip_invalid=True):
+        """Complete messages currently buffered, parsed"""
+        for frame in self.frames():
+            try:
+                message = json.loads(str(frame, 'utf-8'))
+            except ValueError:
+                # Banners and stray prints on stdout are not protocol messages
+                if not skip_invalid:
+                    raise
+                continue
+            if isinstance(message, (dict, list)) or not skip_invalid:
+                yield message
+
+    @property
+    def buffered(self):
+        return self._end - self._start
+
+
+def read_messages(stream, framing=AUTO, skip_invalid=True):
+    """Parsed messages from a binary stream until EOF"""
+    decoder = FrameDecoder(framing)
+    while decoder.read_from(stream):
+        yield from decoder.messages(skip_invalid)
+    yield from decoder.messages(skip_invalid)
+
+
+def encode_body(message):
+    return json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def write_message(stream, message, framing=NEWLINE, body=None):
+    """Write one message (or an already encoded body) without concatenating copies of it"""
+    body = body if body is not None else encode_body(message)
+    if framing == CONTENT_LENGTH:
+        stream.write(b'Content-Length: %d\r\n\r\n' % len(body))
+        stream.write(body)
+    else:
+        stream.write(body)
+        stream.write(b'\n')
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Coordinator Knowledge Base
+Indexes response sections as a TF-IDF matrix so an issue is scored against every
+section in one sparse product, and composes a reply from the best sections.
+
+The index is built once per content fingerprint and stored as .npy arrays that
+are memory-mapped on load, so startup cost does not grow with the KB.
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import logging
+import tempfile
+from collections import Counter
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+except ImportError:  # keyword routing is used instead
+    np = sp = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_ROOT = os.path.expanduser('~/.cache/mcp-coordinator/kb')
+DEFAULT_ENTRIES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'knowledge_base.jsonl')
+
+INDEX_FORMAT = '1'
+
+STOPWORDS = set("""
+a an and are as at be but by can do does for from has have how i if in into is it its
+me my no not of on or our so than that the their then there these this to use used using
+was we what when where which who why will with you your
+""".split())
+
+TOKEN_RE = re.compile(r'[a-z0-9_]+(?:[-.][a-z0-9_]+)*')
+
+
+def stem(term):
+    """Crude suffix stripping so 'servers'/'server' and 'heaviest'/'heavy' meet"""
+    if len(term) > 5 and term.endswith('iest'):
+        return term[:-4] + 'y'
+    if len(term) > 4 and term.endswith('ies'):
+        return term[:-3] + 'y'
+    if len(term) > 5 and term.endswith('ing'):
+        return term[:-3]
+    if len(term) > 4 and term.endswith('ed'):
+        return term[:-2]
+    if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+        return term[:-1]
+    return term
+
+
+def tokenize(text):
+    tokens = []
+    for term in TOKEN_RE.findall((text or '').lower()):
+        if term in STOPWORDS or len(term) < 2:
+            continue
+        tokens.append(stem(term))
+        # 'agent-specific' should still match 'agent'; keep 'xml-rpc' as well
+        if '-' in term:
+            tokens.extend(stem(part) for part in term.split('-') if part not in STOPWORDS and len(part) > 1)
+    return tokens
+
+
+def split_sections(markdown):
+    """Split a rendered response into (header, [(heading, section)], footer)"""
+    lines = markdown.splitlines()
+    footer_at = len(lines)
+    for i in range(len(lines) - 1, -1, -1):
+        if lines[i].strip() == '---':
+            footer_at = i
+            break
+
+    header, sections, current = [], [], None
+    for line in lines[:footer_at]:
+        if line.startswith('### '):
+            current = [line]
+            sections.append(current)
+        elif current is None:
+            header.append(line)
+        else:
+            current.append(line)
+
+    return (
+        "\n".join(header).strip(),
+        [(s[0][4:].strip(), "\n".join(s).strip()) for s in sections],
+        "\n".join(lines[footer_at:]).strip(),
+    )
+
+
+def load_entries(path):
+    """Extra KB entries, one JSON object per line with heading and text, and
+    optionally the route whose topic the entry extends"""
+    if not path or not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class KnowledgeBase:
+    def __init__(self, routes, name, source_files=(), entries_path=None,
+                 index_root=None, min_score=0.15, max_sections=4, atomic_routes=(),
+                 route_score=0.35, margin=0.15):
+        """routes maps a route name to a callable rendering its response for a text;
+        atomic routes (e.g. full server listings) are indexed and returned whole.
+
+        The knowledge base only answers when its best section scores at least
+        route_score and leads the best section of any other topic by margin;
+        weaker matches are left to keyword routing.
+        """
+        self.routes = routes
+        self.atomic_routes = set(atomic_routes)
+        self.entries_path = entries_path or os.environ.get('MCP_KB_ENTRIES', DEFAULT_ENTRIES_PATH)
+        self.index_dir = os.path.join(index_root or os.environ.get('MCP_KB_INDEX', DEFAULT_INDEX_ROOT), name)
+        self.source_files = list(source_files) + [self.entries_path]
+        self.min_score = min_score
+        self.route_score = route_score
+        self.margin = margin
+        self.max_sections = max_sections
+        self.available = np is not None
+        self._loaded = False
+
+        if not self.available:
+            logger.info("numpy/scipy not installed - knowledge base disabled, using keyword routing")
+
+    def fingerprint(self):
+        digest = hashlib.sha256(INDEX_FORMAT.encode())
+        for path in self.source_files:
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+        digest.update(','.join(sorted(self.routes)).encode())
+        return digest.hexdigest()
+
+    def collect_sections(self):
+        sections = []
+        for route, render in self.routes.items():
+            header, route_sections, _ = split_sections(render(''))
+            title = header.splitlines()[0].lstrip('# ') if header else route
+            if route in self.atomic_routes:
+                # Index the outline only; the full listing would drown the topic
+                text = "\n".join(heading for heading, _ in route_sections)
+                sections.append({'route': route, 'heading': title, 'text': text, 'title': title})
+                continue
+            for heading, text in route_sections:
+                sections.append({'route': route, 'heading': heading, 'text': text, 'title': title})
+        for entry in load_entries(self.entries_path):
+            text = f"### {entry['heading']}\n{entry['text']}"
+            # A route this knowledge base doesn't serve leaves the entry a topic of its own
+            route = entry.get('route') if entry.get('route') in self.routes else None
+            sections.append({'route': route, 'heading': entry['heading'], 'text': text, 'title': ''})
+        return sections
+
+    def build(self, fingerprint):
+        """Build the TF-IDF matrix and write it to the index directory"""
+        sections = self.collect_sections()
+        # The response title adds the context of the reply the section came from
+        docs = [tokenize(s['title']) + tokenize(s['text']) for s in sections]
+
+        vocab = {}
+        for doc in docs:
+            for term in doc:
+                vocab.setdefault(term, len(vocab))
+
+        df = np.zeros(len(vocab), dtype=np.float32)
+        rows, cols, vals = [], [], []
+        for i, doc in enumerate(docs):
+            for term, count in Counter(doc).items():
+                rows.append(i)
+                cols.append(vocab[term])
+                vals.append(1.0 + math.log(count))
+                df[vocab[term]] += 1
+
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1.0).astype(np.float32)
+        matrix = sp.csr_matrix((vals, (rows, cols)), shape=(len(docs), len(vocab)), dtype=np.float32)
+        matrix = matrix.multiply(idf).tocsr()
+        norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+        norms[norms == 0] = 1.0
+        matrix = sp.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        arrays = {'data': matrix.data, 'indices': matrix.indices, 'indptr': matrix.indptr, 'idf': idf}
+        for name, array in arrays.items():
+            self._write(f"{name}.npy", lambda f, a=array: np.save(f, a))
+        self._write('vocab.json', lambda f: f.write(json.dumps(vocab).encode()))
+        self._write('sections.json', lambda f: f.write(json.dumps(sections).encode()))
+        # Written last: a complete fingerprint marks a complete index
+        self._write('fingerprint', lambda f: f.write(fingerprint.encode()))
+        logger.info(f"Built knowledge base index: {len(sections)} sections, {len(vocab)} terms")
+
+    def _write(self, filename, writer):
+        # A unique temp name per writer: coordinators in other processes may build concurrently
+        path = os.path.join(self.index_dir, filename)
+        fd, tmp = tempfile.mkstemp(prefix=f".{filename}.", dir=self.index_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def load(self):
+        if self._loaded:
+            return
+        fingerprint = self.fingerprint()
+        fingerprint_path = os.path.join(self.index_dir, 'fingerprint')
+        current = None
+        if os.path.exists(fingerprint_path):
+            with open(fingerprint_path) as f:
+                current = f.read()
+        if current != fingerprint:
+            self.build(fingerprint)
+
+        def mapped(name):
+            return np.load(os.path.join(self.index_dir, f"{name}.npy"), mmap_mode='r')
+
+        with open(os.path.join(self.index_dir, 'vocab.json')) as f:
+            self.vocab = json.load(f)
+        with open(os.path.join(self.index_dir, 'sections.json')) as f:
+            self.sections = json.load(f)
+        self.idf = mapped('idf')
+        self.matrix = sp.csr_matrix(
+            (mapped('data'), mapped('indices'), mapped('indptr')),
+            shape=(len(self.sections), len(self.vocab))
+        )
+        self._loaded = True
+
+    def vectorize(self, texts):
+        """Sparse, L2-normalised TF-IDF rows for a batch of texts"""
+        rows, cols, vals = [], [], []
+        for i, text in enumerate(texts):
+            counts = Counter(t for t in tokenize(text) if t in self.vocab)
+            weights = {self.vocab[t]: (1.0 + math.log(c)) * float(self.idf[self.vocab[t]]) for t, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for col, weight in weights.items():
+                rows.append(i)
+                cols.append(col)
+                vals.append(weight / norm)
+        return sp.csr_matrix((vals, (rows, cols)), shape=(len(texts), len(self.vocab)), dtype=np.float32)
+
+    def score(self, texts):
+        """Cosine similarity of each text against every section: (len(texts), n_sections)"""
+        self.load()
+        return (self.vectorize(texts) @ self.matrix.T).toarray()
+
+    def topic(self, section):
+        # Extra entries without a route are each a topic of their own
+        return section['route'] or f"entry:{section['heading']}"
+
+    def best_sections(self, text):
+        """Sections worth including, best first; empty unless the best match is confident"""
+        if not self.available:
+            return []
+        scores = self.score([text])[0]
+        order = np.argsort(-scores)
+        top = scores[order[0]] if len(order) else 0.0
+        if top < max(self.min_score, self.route_score):
+            return []
+        # A near tie between topics means the text isn't clearly about either
+        topic = self.topic(self.sections[order[0]])
+        runner_up = next((scores[i] for i in order[1:] if self.topic(self.sections[i]) != topic), 0.0)
+        if top - runner_up < self.margin:
+            return []
+        # Secondary sections must be reasonably close to the best match
+        keep = [i for i in order[:self.max_sections] if scores[i] >= max(self.min_score, 0.6 * top)]
+        return [(self.sections[i], float(scores[i])) for i in keep]
+
+    def best_route(self, text):
+        """Route of the best matching section, or None"""
+        ranked = self.best_sections(text)
+        if not ranked:
+            return None
+        return ranked[0][0]['route'] or 'knowledge_base'
+
+    def compose(self, text):
+        """Reply built from the best sections, or None to fall back to keyword routing"""
+        ranked = self.best_sections(text)
+        if not ranked:
+            return None
+
+        rendered = {}
+
+        def route_parts(route):
+            if route not in rendered:
+                rendered[route] = split_sections(self.routes[route](text))
+            return rendered[route]
+
+        primary = ranked[0][0]['route']
+        if primary in self.atomic_routes:
+            return self.routes[primary](text)
+        # Atomic routes only make sense as a whole reply
+        ranked = [(s, score) for s, score in ranked if s['route'] not in self.atomic_routes]
+
+        if primary:
+            header, _, footer = route_parts(primary)
+        else:
+            header = "## 🛠️ MCP Server Coordinator Response"
+            footer = "---\n*MCP Server Coordinator - Your MCP infrastructure support*"
+
+        parts = [header]
+        for section, _ in ranked:
+            body = section['text']
+            if section['route']:
+                # Re-render so sections with live data (errors, telemetry) are current
+                live = dict(route_parts(section['route'])[1])
+                body = live.get(section['heading'], body)
+            parts.append(body)
+        parts.append(footer)
+        return "\n\n".join(parts)
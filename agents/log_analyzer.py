@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+MCP Log Analyzer
+Incrementally scans per-service container logs, remembering file offsets between
+runs, and keeps per-service counters of errors, timeouts and auth failures
+"""
+
+import os
+import re
+import json
+import mmap
+import time
+import logging
+import argparse
+import subprocess
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LOG_STATE_PATH = os.path.expanduser('~/.cache/mcp-coordinator/log_analytics.json')
+
+# Order matters: a line is counted under the first category that matches
+CATEGORIES = [
+    ('auth', re.compile(
+        r'auth\w* fail|unauthori[sz]ed|login failed|access denied|invalid (credentials|token|password)'
+        r'|\b40[13]\b', re.IGNORECASE)),
+    ('timeout', re.compile(r'timed? ?out|timeout|ETIMEDOUT|deadline exceeded', re.IGNORECASE)),
+    ('error', re.compile(r'\berror\b|exception|traceback|ECONNREFUSED|ECONNRESET|fatal|panic', re.IGNORECASE)),
+]
+
+# Keep at most this many distinct error signatures per service
+MAX_SIGNATURES = 50
+
+# Docker json-file `time`: date and time, optional fraction (up to nanoseconds), zone
+RFC3339 = re.compile(r'(\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2})(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$')
+
+
+def signature(message):
+    """Collapse ids, numbers and quoted values so repeats of one error group together"""
+    message = re.sub(r'"[^"]*"|\'[^\']*\'', '"…"', message)
+    message = re.sub(r'\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b', '<id>', message, flags=re.IGNORECASE)
+    message = re.sub(r'\d+', 'N', message)
+    return message.strip()[:200]
+
+
+def parse_time(value):
+    """Epoch seconds of a docker RFC3339 timestamp (nanosecond precision), or None"""
+    match = RFC3339.match(value or '')
+    if not match:
+        return None
+    date, fraction, zone = match.groups()
+    zone = '+00:00' if zone in ('Z', 'z') else zone
+    try:
+        return datetime.fromisoformat(f"{date}{(fraction or '')[:7]}{zone}").timestamp()
+    except ValueError:
+        return None
+
+
+def decode_line(raw):
+    """(message, logged_at) of a docker json-file line, or (text, None) for a plain log line"""
+    text = raw.decode('utf-8', errors='replace').strip()
+    if text.startswith('{'):
+        try:
+            entry = json.loads(text)
+        except ValueError:
+            pass
+        else:
+            return entry.get('log', '').strip(), parse_time(entry.get('time'))
+    return text, None
+
+
+def iter_mmap_lines(path, offset):
+    """Yield (line, end_offset) for complete lines after offset, via mmap"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= offset:
+            return
+        # mmap offsets must be aligned; map from the aligned start and skip ahead
+        aligned = offset - (offset % mmap.ALLOCATIONGRANULARITY)
+        with mmap.mmap(f.fileno(), size - aligned, access=mmap.ACCESS_READ, offset=aligned) as mm:
+            position = offset - aligned
+            while True:
+                end = mm.find(b'\n', position)
+                if end == -1:
+                    # Partial trailing line: pick it up next run once it is complete
+                    return
+                yield mm[position:end], aligned + end + 1
+                position = end + 1
+
+
+class ServiceStats:
+    def __init__(self, data=None):
+        data = data or {}
+        self.counts = data.get('counts', {name: 0 for name, _ in CATEGORIES})
+        self.signatures = data.get('signatures', {})
+
+    def record(self, message, now, logged_at=None):
+        """Count message if it matches a category; logged_at is when the line was
+        written (now for plain logs without a timestamp)"""
+        for category, pattern in CATEGORIES:
+            if pattern.search(message):
+                break
+        else:
+            return
+
+        self.counts[category] = self.counts.get(category, 0) + 1
+        key = f"{category}:{signature(message)}"
+        entry = self.signatures.setdefault(key, {'category': category, 'count': 0})
+        entry['count'] += 1
+        entry['example'] = message[:300]
+        # Rotated files are finished after newer lines, so never move last_seen back
+        entry['last_seen'] = max(entry.get('last_seen', 0), logged_at or now)
+
+        if len(self.signatures) > MAX_SIGNATURES:
+            # Drop the stalest signature to bound memory
+            stalest = min(self.signatures, key=lambda k: self.signatures[k]['last_seen'])
+            del self.signatures[stalest]
+
+    def top_recent(self, limit=5, window=86400, now=None):
+        cutoff = (now or time.time()) - window
+        recent = [e for e in self.signatures.values() if e['last_seen'] >= cutoff]
+        return sorted(recent, key=lambda e: (e['count'], e['last_seen']), reverse=True)[:limit]
+
+    def to_dict(self):
+        return {'counts': self.counts, 'signatures': self.signatures}
+
+
+def docker_log_path(service):
+    """Host path of the container's json-file log, or None if docker can't tell us"""
+    try:
+        result = subprocess.run(
+            ['docker', 'inspect', '--format', '{{.LogPath}}', service],
+            capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class LogAnalyzer:
+    def __init__(self, state_path=None):
+        self.state_path = state_path or os.environ.get('MCP_LOG_STATE_PATH', DEFAULT_LOG_STATE_PATH)
+        self.offsets = {}
+        self.services = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.state_path):
+            return
+        with open(self.state_path) as f:
+            data = json.load(f)
+        self.offsets = data.get('offsets', {})
+        self.services = {name: ServiceStats(s) for name, s in data.get('services', {}).items()}
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        data = {
+            'offsets': self.offsets,
+            'services': {name: stats.to_dict() for name, stats in self.services.items()},
+        }
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
+
+    def stats(self, service):
+        return self.services.setdefault(service, ServiceStats())
+
+    def scan_file(self, service, path, now=None):
+        """Process new lines in path (and its rotated predecessor) since the last run"""
+        now = now or time.time()
+        try:
+            st = os.stat(path)
+        except OSError:
+            logger.warning(f"Log file for {service} not readable: {path}")
+            return 0
+
+        saved = self.offsets.get(path, {})
+        offset = saved.get('offset', 0)
+        processed = 0
+
+        if saved and (saved.get('inode') != st.st_ino or st.st_size < offset):
+            # Rotated: finish the old file (now path.1) from where we stopped
+            rotated = path + '.1'
+            if os.path.exists(rotated) and os.stat(rotated).st_ino == saved.get('inode'):
+                processed += self._scan(service, rotated, offset, now)
+            offset = 0
+
+        lines_before = processed
+        end = offset
+        stats = self.stats(service)
+        for raw, end in iter_mmap_lines(path, offset):
+            message, logged_at = decode_line(raw)
+            stats.record(message, now, logged_at)
+            processed += 1
+
+        self.offsets[path] = {'inode': st.st_ino, 'offset': end}
+        logger.info(f"{service}: {processed - lines_before} new lines in {path}")
+        return processed
+
+    def _scan(self, service, path, offset, now):
+        stats = self.stats(service)
+        count = 0
+        for raw, _ in iter_mmap_lines(path, offset):
+            message, logged_at = decode_line(raw)
+            stats.record(message, now, logged_at)
+            count += 1
+        return count
+
+    def scan_service(self, service):
+        path = docker_log_path(service)
+        if path:
+            return self.scan_file(service, path)
+        logger.warning(f"No log path for {service}; is the container running?")
+        return 0
+
+    def top_errors_markdown(self, service, limit=5, window=86400):
+        """Markdown list of the most frequent recent errors for a service, or ''"""
+        stats = self.services.get(service)
+        if stats is None:
+            return ''
+        top = stats.top_recent(limit, window)
+        if not top:
+            return ''
+
+        counts = ', '.join(f"{n} {category}" for category, n in stats.counts.items() if n)
+        lines = [f"### Recent errors in `{service}` ({counts} total)"]
+        for entry in top:
+            seen = time.strftime('%Y-%m-%d %H:%M', time.gmtime(entry['last_seen']))
+            lines.append(f"- **{entry['category']}** ×{entry['count']} (last {seen} UTC): `{entry['example']}`")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally analyze MCP container logs')
+    parser.add_argument('services', nargs='+', help='compose service names, e.g. mcp-odoo17')
+    parser.add_argument('--log-file', help='scan this file instead of the container log (single service)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    analyzer = LogAnalyzer()
+    for service in args.services:
+        if args.log_file:
+            analyzer.scan_file(service, args.log_file)
+        else:
+            analyzer.scan_service(service)
+    analyzer.save()
+
+    for service in args.services:
+        print(analyzer.top_errors_markdown(service) or f"No recent errors recorded for {service}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+MCP Gateway
+One stdio MCP endpoint in front of every registered server. Tools are exposed
+as <server>__<tool>. Calls are routed to per-server backend sessions, which
+start on first use and keep many requests in flight at once. Each backend
+numbers its own JSON-RPC ids, and server-initiated requests are renumbered on
+their way to the client.
+
+Tool catalogs are remembered in the coordinator state store, so listing tools
+does not start backends that have been seen before:
+
+    claude mcp add gateway /home/jason/MCP_SERVERS/scripts/mcp-gateway.sh
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from container_prewarm import COMPOSE_DIR
+from container_reaper import IdleReaper
+from coordinator_state import StateStore
+from jsonrpc_framing import encode_body, read_messages
+from mcp_stdio import PROTOCOL_VERSION, McpError, StdioSession
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = '__'
+CATALOG_KEY = 'gateway:tools:{}'
+# Per-minute call counts older than this are dropped when the gateway exits
+CALL_HISTORY = 30 * 86400
+
+
+class Backend:
+    """A registered server and, once used, its running session"""
+
+    def __init__(self, name, command, cwd=None, service=None):
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.service = service or name
+        self.session = None
+        self.last_used = 0.0
+        self.in_flight = 0
+        self.stats = {'starts': 0, 'calls': 0, 'errors': 0}
+        self.lock = threading.Lock()
+
+    def ensure_session(self, timeout, on_message, on_start=None):
+        """(session, started) - the running session, starting one if needed;
+        on_start(backend) runs first whenever a session is about to start"""
+        with self.lock:
+            self.last_used = time.monotonic()
+            if self.session is not None and self.session.alive:
+                return self.session, False
+            if self.session is not None:
+                self.session.close()
+            if on_start is not None:
+                on_start(self)
+            session = StdioSession(self.command, cwd=self.cwd, name=self.name,
+                                   on_message=lambda message: on_message(self, message))
+            session.start()
+            try:
+                session.initialize(client_name='mcp-gateway', timeout=timeout)
+            except Exception:
+                session.close()
+                raise
+            self.session = session
+            self.stats['starts'] += 1
+            return session, True
+
+    def begin_call(self):
+        # in_flight is guarded by the session lock so the idle sweep can't close
+        # a session between a call counting itself in and using it
+        with self.lock:
+            self.in_flight += 1
+
+    def end_call(self):
+        with self.lock:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    def close_if_idle(self, cutoff):
+        """Close the session if no call is in flight and it was last used before cutoff"""
+        with self.lock:
+            if self.session is None or self.in_flight or self.last_used >= cutoff:
+                return False
+            self.session.close()
+            self.session = None
+            return True
+
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+
+def registry_backends(servers=None, compose_dir=None):
+    """Backends for the coordinator's registry, launched the way their scripts do"""
+    from mcp_server_coordinator import MCPServerCoordinator
+    coordinator = MCPServerCoordinator(offline=True)
+    compose_dir = compose_dir or os.environ.get('MCP_COMPOSE_DIR', COMPOSE_DIR)
+    backends = []
+    for name in coordinator.mcp_servers:
+        if servers and name not in servers:
+            continue
+        service = coordinator.compose_service(name)
+        command = ['docker', 'compose', '--project-directory', compose_dir, 'run', '--rm', '-i', service]
+        backends.append(Backend(name, command, cwd=compose_dir, service=service))
+    return backends
+
+
+def config_backends(path):
+    """Backends from a JSON file {name: {command: [...], cwd?, service?}}"""
+    with open(path) as f:
+        config = json.load(f)
+    return [Backend(name, entry['command'], entry.get('cwd'), entry.get('service')) for name, entry in config.items()]
+
+
+class McpGateway:
+    def __init__(self, backends, store=None, output=None, timeout=None, workers=64, idle=None, reaper=None):
+        """reaper: IdleReaper sharing this store, to start the compose services it
+        stopped when their server is used again"""
+        self.backends = {backend.name: backend for backend in backends}
+        self.store = store or StateStore()
+        self.reaper = reaper
+        self.output = output or sys.stdout.buffer
+        self.timeout = timeout or float(os.environ.get('MCP_GATEWAY_TIMEOUT', '300'))
+        # Backends unused for this long are stopped; the next call starts them again
+        self.idle = idle if idle is not None else int(os.environ.get('MCP_GATEWAY_IDLE', '1800'))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mcp-gateway')
+        self.catalogs = {}
+        self.unavailable = set()
+        self._ids = itertools.count(1)
+        self._server_requests = {}
+        self._lock = threading.Lock()
+        self._store_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stopped = threading.Event()
+        for name in self.backends:
+            cached = self.store.get_meta(CATALOG_KEY.format(name))
+            if cached:
+                self.catalogs[name] = json.loads(cached)
+
+    # Client side
+
+    def serve(self, stream=None):
+        """Read client messages until stdin closes"""
+        sweeper = threading.Thread(target=self.sweep_idle, name='mcp-gateway-idle', daemon=True)
+        sweeper.start()
+        for message in read_messages(stream or sys.stdin.buffer):
+            if isinstance(message, dict):
+                self.dispatch(message)
+        self.pool.shutdown(wait=True)
+        self._stopped.set()
+
+    def dispatch(self, message):
+        method, request_id = message.get('method'), message.get('id')
+        if method is None:
+            self.route_client_reply(message)
+        elif 'id' not in message:
+            # initialized needs no answer; cancellations name client ids that
+            # no backend has seen, so they cannot be forwarded
+            return
+        elif method == 'initialize':
+            self.write_result(request_id, {
+                'protocolVersion': (message.get('params') or {}).get('protocolVersion', PROTOCOL_VERSION),
+                'capabilities': {'tools': {'listChanged': True}},
+                'serverInfo': {'name': 'mcp-gateway', 'version': '1.0.0'},
+            })
+        elif method == 'ping':
+            self.write_result(request_id, {})
+        elif method == 'tools/list':
+            self.pool.submit(self.guarded, self.list_tools, request_id)
+        elif method == 'tools/call':
+            self.pool.submit(self.guarded, self.call_tool, request_id, message.get('params') or {})
+        elif method in ('resources/list', 'resources/templates/list', 'prompts/list'):
+            key = {'resources/list': 'resources', 'resources/templates/list': 'resourceTemplates',
+                   'prompts/list': 'prompts'}[method]
+            self.write_result(request_id, {key: []})
+        else:
+            self.write_error(request_id, -32601, f"Method not found: {method}")
+
+    def guarded(self, handler, request_id, *args):
+        try:
+            handler(request_id, *args)
+        except Exception as e:
+            logger.exception(f"Gateway failed handling request {request_id!r}")
+            self.write_error(request_id, -32603, str(e))
+
+    def list_tools(self, request_id):
+        unknown = [backend for name, backend in self.backends.items()
+                   if name not in self.catalogs and name not in self.unavailable]
+        if unknown:
+            # First sight of these servers: their tools are only known by asking them
+            with ThreadPoolExecutor(max_workers=len(unknown)) as discovery:
+                list(discovery.map(self.discover, unknown))
+        tools = []
+        for name in sorted(self.catalogs):
+            for tool in self.catalogs[name]:
+                tools.append(dict(tool, name=f"{name}{SEPARATOR}{tool['name']}",
+                                  description=f"[{name}] {tool.get('description', '')}".strip()))
+        self.write_result(request_id, {'tools': tools})
+
+    def call_tool(self, request_id, params):
+        server, separator, tool = (params.get('name') or '').partition(SEPARATOR)
+        backend = self.backends.get(server)
+        if not separator or backend is None:
+            self.write_error(request_id, -32602, f"Unknown tool: {params.get('name')}")
+            return
+
+        backend.begin_call()
+        with self._lock:
+            backend.stats['calls'] += 1
+        try:
+            session = self.session(backend)
+            result = session.request('tools/call', dict(params, name=tool), timeout=self.timeout)
+        except McpError as e:
+            self.count_error(backend)
+            self.write_message({'jsonrpc': '2.0', 'id': request_id,
+                                'error': {'code': e.code, 'message': str(e), **({'data': e.data} if e.data is not None else {})}})
+            return
+        except (TimeoutError, ConnectionError, OSError) as e:
+            self.count_error(backend)
+            # Reported as a tool error so the agent sees which server failed and why
+            self.write_result(request_id, {'content': [{'type': 'text', 'text': f"{server} unavailable: {e}"}],
+                                           'isError': True})
+            return
+        finally:
+            backend.end_call()
+        self.write_result(request_id, result)
+        self.touch(backend)
+
+    def count_error(self, backend):
+        with self._lock:
+            backend.stats['errors'] += 1
+
+    # Backends
+
+    def session(self, backend):
+        session, started = backend.ensure_session(self.timeout, self.on_backend_message, self.wake)
+        if started:
+            logger.info(f"Started backend {backend.name}")
+            self.refresh_catalog(backend, session)
+        return session
+
+    def discover(self, backend):
+        try:
+            self.session(backend)
+        except Exception as e:
+            # Not retried on every tools/list; a tools/call to it still tries again
+            self.unavailable.add(backend.name)
+            logger.warning(f"Cannot list tools of {backend.name}: {e}")
+
+    def refresh_catalog(self, backend, session):
+        tools, cursor = [], None
+        while True:
+            page = session.request('tools/list', {'cursor': cursor} if cursor else None, timeout=self.timeout)
+            tools.extend(page.get('tools', []))
+            cursor = page.get('nextCursor')
+            if not cursor:
+                break
+        changed = self.catalogs.get(backend.name) not in (None, tools)
+        self.catalogs[backend.name] = tools
+        with self._store_lock:
+            self.store.set_meta(CATALOG_KEY.format(backend.name), json.dumps(tools))
+        if changed:
+            self.write_message({'jsonrpc': '2.0', 'method': 'notifications/tools/list_changed'})
+
+    def wake(self, backend):
+        # The reaper stops idle resident containers; bring this one back before its
+        # server is used. The session is a separate one-off container, so it starts
+        # regardless of whether this succeeds.
+        if self.reaper is None:
+            return
+        try:
+            with self._store_lock:
+                self.reaper.ensure_running(backend.service)
+        except Exception as e:
+            logger.warning(f"Cannot start {backend.service} on demand: {e}")
+
+    def touch(self, backend):
+        # Tell the idle reaper the container behind this server is in use, and
+        # count the call for capacity_planner.py
+        now = time.time()
+        with self._store_lock:
+            self.store.touch_service(backend.service, now)
+            self.store.count_service_call(backend.service, now)
+
+    def on_backend_message(self, backend, message):
+        if 'id' in message and 'method' in message:
+            # A server-initiated request (roots, sampling): renumber it so replies
+            # from the client can be routed back to the right backend
+            gateway_id = f"gw-{next(self._ids)}"
+            with self._lock:
+                self._server_requests[gateway_id] = (backend, message['id'])
+            self.write_message(dict(message, id=gateway_id))
+        elif message.get('method') == 'notifications/tools/list_changed':
+            self.pool.submit(self.refresh_catalog, backend, backend.session)
+        else:
+            self.write_message(message)
+
+    def route_client_reply(self, message):
+        with self._lock:
+            target = self._server_requests.pop(message.get('id'), None)
+        if target is None:
+            logger.debug(f"Reply to unknown request {message.get('id')!r} dropped")
+            return
+        backend, backend_id = target
+        if backend.session is not None:
+            backend.session.send(dict(message, id=backend_id))
+
+    def sweep_idle(self):
+        if not self.idle:
+            return
+        while not self._stopped.wait(min(60, self.idle)):
+            cutoff = time.monotonic() - self.idle
+            for backend in self.backends.values():
+                if backend.close_if_idle(cutoff):
+                    logger.info(f"Stopped idle backend {backend.name}")
+
+    # Output
+
+    def write_message(self, message):
+        body = encode_body(message)
+        with self._write_lock:
+            self.output.write(body)
+            self.output.write(b'\n')
+            self.output.flush()
+
+    def write_result(self, request_id, result):
+        self.write_message({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+
+    def write_error(self, request_id, code, message):
+        self.write_message({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}})
+
+    def close(self):
+        self._stopped.set()
+        for backend in self.backends.values():
+            backend.close()
+            if backend.stats['starts']:
+                logger.info(f"Backend {backend.name}: {backend.stats['calls']} calls, "
+                            f"{backend.stats['errors']} errors, {backend.stats['starts']} starts")
+        with self._store_lock:
+            self.store.prune_service_calls(time.time() - CALL_HISTORY)
+        self.store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve every registered MCP server through one stdio endpoint')
+    parser.add_argument('--servers', help='comma-separated registry servers to expose (default: all)')
+    parser.add_argument('--backends', help='JSON file of backends {name: {command, cwd?, service?}} instead of the registry')
+    parser.add_argument('--discover', action='store_true', help='start each backend once to record its tools, then exit')
+    args = parser.parse_args()
+
+    # stdout carries the protocol; logs go to stderr
+    logging.basicConfig(level=os.environ.get('MCP_GATEWAY_LOG_LEVEL', 'INFO'), stream=sys.stderr,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    servers = set(args.servers.split(',')) if args.servers else None
+    store = StateStore()
+    if args.backends:
+        backends, reaper = config_backends(args.backends), None
+    else:
+        # Registry servers are compose services the idle reaper may have stopped
+        backends, reaper = registry_backends(servers), IdleReaper(store=store)
+    gateway = McpGateway(backends, store=store, reaper=reaper)
+    try:
+        if args.discover:
+            for backend in backends:
+                gateway.discover(backend)
+                print(f"{backend.name}: {len(gateway.catalogs.get(backend.name, []))} tools", file=sys.stderr)
+        else:
+            gateway.serve()
+    finally:
+        gateway.close()
+
+
+if __name__ == '__main__':
+    main()
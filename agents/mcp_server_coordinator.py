@@ -7,11 +7,26 @@ Manages all MCP (Model Context Protocol) servers and provides support to other a
 import os
 import json
 import logging
-from datetime import datetime
-from github import Github
+import argparse
 import base64
 import re
 
+from coordinator_backfill import NOT_MCP
+from coordinator_lock import RunLock, run_lock_mode
+from coordinator_run import CoordinatorRunMixin
+from coordinator_shards import ShardCoordinator, sharding_enabled
+from coordinator_state import StateStore
+from duplicate_index import DuplicateIndex
+from github_cache import GithubObjectCache
+from github_token_pool import TokenPool, token_scope
+from container_prewarm import Prewarmer
+from content_hashes import ContentHashes
+from container_telemetry import ContainerTelemetry
+from github_transport import github_client
+from knowledge_base import KnowledgeBase
+from log_analyzer import LogAnalyzer
+from work_queue import ISSUE, PM, WorkQueue, run_deadline, timestamp
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,16 +34,71 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MCPServerCoordinator:
-    def __init__(self):
+
+def mention_pattern(name):
+    """Regex for name as a word of its own, not part of a longer word, path or domain"""
+    return rf"(?<![\w./@]){re.escape(name)}(?!\w|\.\w|/)"
+
+
+class MCPServerCoordinator(CoordinatorRunMixin):
+    def __init__(self, offline=False):
+        """offline: no GitHub clients or run coordination - only classify and answer text"""
+        self.offline = offline
         self.github_token = os.environ.get('GITHUB_TOKEN')
         self.cross_repo_token = os.environ.get('CROSS_REPO_TOKEN', self.github_token)
         
-        if not self.github_token:
+        if not self.github_token and not offline:
             raise ValueError("GITHUB_TOKEN environment variable not set")
         
-        self.g = Github(self.github_token)
-        self.cross_g = Github(self.cross_repo_token)
+        self.g = self.cross_g = self.tokens = self.cache = None
+        if not offline:
+            self.g = github_client(self.github_token)
+            self.cross_g = github_client(self.cross_repo_token)
+            
+            # Reads go to whichever token has the most budget; writes stay pinned
+            # (issue replies as self.g, parent notifications as self.cross_g)
+            self.tokens = TokenPool()
+            self.tokens.add('primary', self.g, token_scope('GITHUB_TOKEN_SCOPE'))
+            if self.cross_repo_token != self.github_token:
+                self.tokens.add('cross-repo', self.cross_g, token_scope('CROSS_REPO_TOKEN_SCOPE'))
+            
+            # Repo/issue/user objects shared by both clients across the run
+            self.cache = GithubObjectCache()
+        
+        # Repositories monitored for MCP issues
+        self.repos_to_monitor = [
+            'jayo2005/paint-sage-operations',
+            'jayo2005/paint-odoo-operations',
+            'jayo2005/paint-tikkurila-operations',
+            'jayo2005/paint-woocommerce-operations',
+            'jayo2005/paint-project-orchestration',
+            'jayo2005/docker-mcp-servers'
+        ]
+        
+        # Keywords that make an issue worth answering
+        self.mcp_keywords = ['mcp', 'server', 'permission', 'docker', 'connection',
+                             'xml-rpc', 'api', 'access denied', 'puppeteer', 'mssql',
+                             'filesystem']
+        
+        # Multi-worker sharding (set MCP_WORKER_ID on each worker to enable)
+        self.shards = ShardCoordinator() if sharding_enabled() and not offline else None
+        
+        # Run-level lock against overlapping cron/event runs (MCP_RUN_LOCK_MODE)
+        self.run_lock = RunLock() if run_lock_mode() != 'off' and not offline else None
+        
+        # Answered questions, so a repeat can link to the earlier answer
+        self.duplicates = DuplicateIndex() if not offline else None
+        
+        # Prewarm an agent's servers when its repo shows activity (MCP_PREWARM)
+        self.prewarmer = Prewarmer() if not offline else None
+        self.prewarm_lookback = int(os.environ.get('MCP_PREWARM_LOOKBACK', '3600'))
+        
+        # Text hash and route of everything handled, so edits only re-answer on a new route
+        self.content = ContentHashes() if not offline else None
+        
+        # Run checkpoint, and the time budget runs stop taking new work after
+        self.state = StateStore() if not offline else None
+        self.run_budget = run_deadline()
         
         # MCP Server inventory
         self.mcp_servers = {
@@ -114,6 +184,21 @@ class MCPServerCoordinator:
             'woocommerce-agent': ['wordpress', 'elementor', 'github'],
             'project-manager': ['github', 'filesystem']
         }
+        
+        # Agent working in each monitored repo, for prewarming its MCP servers
+        self.repo_agents = {
+            'jayo2005/paint-sage-operations': 'sage-agent',
+            'jayo2005/paint-odoo-operations': 'odoo-agent',
+            'jayo2005/paint-tikkurila-operations': 'tikkurila-agent',
+            'jayo2005/paint-woocommerce-operations': 'woocommerce-agent',
+            'jayo2005/paint-project-orchestration': 'project-manager'
+        }
+        
+        # TF-IDF index over response sections, built once and memory-mapped
+        self.knowledge_base = KnowledgeBase(
+            self.kb_routes(), 'coordinator', source_files=[__file__],
+            atomic_routes=['list_available_servers', 'provide_performance_report']
+        )
     
     def extract_parent_issue(self, body):
         """Extract parent issue URL from body"""
@@ -137,34 +222,73 @@ class MCPServerCoordinator:
         
         return None
     
+    def kb_routes(self):
+        """Responses whose sections make up the knowledge base"""
+        return {
+            'provide_filesystem_guidance': lambda text: self.provide_filesystem_guidance(),
+            'handle_permission_issue': lambda text: self.handle_permission_issue("", text),
+            'list_available_servers': lambda text: self.list_available_servers(),
+            'handle_setup_request': lambda text: self.handle_setup_request("", text),
+            'provide_sage_guidance': lambda text: self.provide_sage_guidance(),
+            'provide_odoo_guidance': lambda text: self.provide_odoo_guidance(),
+            'provide_performance_report': lambda text: self.provide_performance_report(),
+        }
+    
+    def is_mcp_related(self, text):
+        """Whether the text mentions anything MCP-related"""
+        text_lower = (text or '').lower()
+        return any(keyword in text_lower for keyword in self.mcp_keywords)
+    
     def analyze_mcp_request(self, issue_title, issue_body):
         """Analyze the issue to provide MCP guidance"""
+        text = f"{issue_title} {issue_body or ''}"
+        response = self.knowledge_base.compose(text)
+        if response:
+            return response
+        
+        route = self.keyword_route(issue_title, issue_body)
+        if route == 'general_mcp_response':
+            return self.general_mcp_response(issue_title)
+        if route == 'handle_permission_issue':
+            return self.handle_permission_issue(issue_title, issue_body)
+        return self.kb_routes()[route](text)
+    
+    def classify_request(self, issue_title, issue_body):
+        """Name of the route analyze_mcp_request answers the issue with"""
+        text = f"{issue_title} {issue_body or ''}"
+        return self.knowledge_base.best_route(text) or self.keyword_route(issue_title, issue_body)
+    
+    def keyword_route(self, issue_title, issue_body):
+        """First-match keyword routing, used when the knowledge base has no good match"""
         title_lower = issue_title.lower()
         body_lower = issue_body.lower() if issue_body else ""
         full_text = title_lower + " " + body_lower
         
         # Specific handling for filesystem MCP questions
         if 'filesystem' in full_text:
-            return self.provide_filesystem_guidance()
+            return 'provide_filesystem_guidance'
         
         # Check for specific MCP server mentions
         elif any(word in full_text for word in ['permission', 'access denied', 'connection', 'error']):
-            return self.handle_permission_issue(issue_title, issue_body)
+            return 'handle_permission_issue'
+        
+        elif any(word in full_text for word in ['heavy', 'memory', 'cpu', 'resource usage', 'performance', 'slow']):
+            return 'provide_performance_report'
         
         elif any(word in full_text for word in ['available', 'list', 'what mcp', 'which servers']):
-            return self.list_available_servers()
+            return 'list_available_servers'
         
         elif any(word in full_text for word in ['setup', 'configure', 'install']):
-            return self.handle_setup_request(issue_title, issue_body)
+            return 'handle_setup_request'
         
         elif any(word in full_text for word in ['sage', 'mssql', 'sql server']):
-            return self.provide_sage_guidance()
+            return 'provide_sage_guidance'
         
         elif any(word in full_text for word in ['odoo', 'xml-rpc', 'api']):
-            return self.provide_odoo_guidance()
+            return 'provide_odoo_guidance'
         
         else:
-            return self.general_mcp_response(issue_title)
+            return 'general_mcp_response'
     
     def provide_filesystem_guidance(self):
         """Provide detailed filesystem MCP guidance"""
@@ -245,8 +369,37 @@ The filesystem MCP makes Claude more **autonomous for research** but maintains *
 ---
 *MCP Server Coordinator - Ensuring safe and efficient file access*"""
     
+    def compose_service(self, server):
+        """Compose service behind a registry entry (scripts are named after their service)"""
+        return os.path.basename(self.mcp_servers[server]['script'])[:-len('.sh')]
+    
+    def mentioned_servers(self, text):
+        """Registry servers named in the text by key, display name or compose service,
+        as whole words ("excel" is not in "excellent", "github" not in github.com URLs)"""
+        text_lower = (text or '').lower()
+        found = []
+        for server, info in self.mcp_servers.items():
+            names = {server, info.get('name', server).lower(), self.compose_service(server)}
+            if any(re.search(mention_pattern(name), text_lower) for name in names):
+                found.append(server)
+        return found
+    
+    def recent_errors_section(self, text, limit=2):
+        """Top recent log errors for the servers mentioned in the text, or ''"""
+        analyzer = LogAnalyzer()
+        sections = []
+        for server in self.mentioned_servers(text)[:limit]:
+            section = analyzer.top_errors_markdown(self.compose_service(server))
+            if section:
+                sections.append(section)
+        if not sections:
+            return ''
+        return "\n\n".join(sections) + "\n\n"
+    
     def handle_permission_issue(self, title, body):
         """Handle MCP permission and connection issues"""
+        recent_errors = self.recent_errors_section(f"{title} {body or ''}")
+        
         return f"""## 🛠️ MCP Server Coordinator Response - Troubleshooting
 
 ### Common MCP Server Issues:
@@ -278,7 +431,7 @@ docker compose ps
 docker compose logs -f mcp-<server>
 ```
 
-### Need More Help?
+{recent_errors}### Need More Help?
 Please provide:
 1. Which MCP server is failing
 2. Exact error message
@@ -413,8 +566,32 @@ ODOO17_PASSWORD=Sc00tZujeva
 ---
 *Choose the right Odoo MCP for your needs*"""
     
+    def provide_performance_report(self):
+        """Report which MCP servers are heaviest from collected container telemetry"""
+        table = ContainerTelemetry().heavy_servers_markdown()
+        if not table:
+            table = """### Heaviest MCP servers
+No container telemetry has been collected yet.
+Run `./manage.sh telemetry` on the MCP host (e.g. from cron every 5 minutes) to start sampling."""
+        
+        return f"""## 📊 MCP Server Resource Usage
+
+{table}
+
+### Reducing load:
+- **mcp-puppeteer** runs Chromium; stop it when no agent needs browser automation
+- Restart counts that keep growing usually mean a crash loop: `docker compose logs mcp-<server>`
+- Compare with `docker stats` for a live view
+
+---
+*MCP Server Coordinator - Numbers from `docker stats` / `docker inspect` samples*"""
+    
     def general_mcp_response(self, title):
         """General MCP guidance"""
+        heavy_servers = ContainerTelemetry().heavy_servers_markdown(top=3)
+        if heavy_servers:
+            heavy_servers = f"\n{heavy_servers}\n"
+        
         return f"""## 🛠️ MCP Server Coordinator Response
 
 ### How can I help with: "{title}"?
@@ -443,7 +620,7 @@ docker compose ps
 2. **Fix connection issues**: Provide error details
 3. **Configure for agents**: Tell me which agent needs help
 4. **Performance optimization**: Which server is slow?
-
+{heavy_servers}
 Please provide more details about your MCP-related need!
 
 ---
@@ -507,8 +684,11 @@ echo '{"jsonrpc": "2.0", "method": "tools/list", "id": 1}' | ./scripts/mcp-files
         """Notify the parent issue about completion"""
         try:
             # Get parent repository and issue
-            parent_repo = self.cross_g.get_repo(f"{parent_info['owner']}/{parent_info['repo']}")
-            parent_issue = parent_repo.get_issue(parent_info['issue_number'])
+            parent_issue = self.cache.get_issue(
+                self.cross_g,
+                f"{parent_info['owner']}/{parent_info['repo']}",
+                parent_info['issue_number']
+            )
             
             # Create completion summary
             summary = f"""## 🛠️ MCP Server Coordinator - Task Complete
@@ -537,65 +717,108 @@ The filesystem MCP is **read-only** - Claude can read files autonomously but can
     
     def process_mcp_issues(self):
         """Monitor all repositories for MCP-related issues"""
-        repos_to_monitor = [
-            'jayo2005/paint-sage-operations',
-            'jayo2005/paint-odoo-operations',
-            'jayo2005/paint-tikkurila-operations',
-            'jayo2005/paint-woocommerce-operations',
-            'jayo2005/paint-project-orchestration',
-            'jayo2005/docker-mcp-servers'
-        ]
+        # Scan everything first, then answer in priority order (PM delegations first)
+        queue = WorkQueue(self.repos_to_monitor, self.run_budget, store=self.state, name='coordinator')
+        queue.scan(self.repos_for_this_run(queue.scan_order()), self.queue_repo_work)
+        if self.shards is not None:
+            queue.exclude(self.shards.skipped)
+        
+        # Stops between items: each reply, label and content hash is written before the next
+        queue.drain()
+        queue.save_checkpoint()
+        queue.log_summary()
+        return queue
+    
+    def queue_repo_work(self, queue, repo_name):
+        """Queue the issues of one repo that need an answer"""
+        reader = self.tokens.reader(repo_name)
+        repo = self.cache.get_repo(reader, repo_name)
         
-        for repo_name in repos_to_monitor:
+        for issue in repo.get_issues(state='open'):
+            labels = [l.name for l in issue.labels]
+            self.prewarm_for_activity(repo_name, issue)
+            
+            # Skip if the text is unchanged since it was last handled
+            thread = f"{repo_name}#{issue.number}"
+            item = f"issue:{thread}"
+            text = issue.title + " " + (issue.body or "")
+            unchanged, previous = self.content_unchanged(item, text)
+            if unchanged:
+                continue
+            
+            # Check if MCP-related
+            if not self.is_mcp_related(text):
+                self.record_content(item, text, NOT_MCP, 'not_mcp')
+                continue
+            
+            # Skip if already processed and an edit didn't change the answer
+            route = self.classify_request(issue.title, issue.body)
+            responded = 'mcp-responded' in labels
+            if previous == route or (responded and previous is None):
+                self.record_content(item, text, route, 'same_route' if previous else 'baseline')
+                continue
+            
+            waiting_since = issue.created_at if previous in (None, NOT_MCP) else issue.updated_at
+            queue.push(item, PM if 'from-pm' in labels else ISSUE, repo_name, timestamp(waiting_since),
+                       lambda issue=issue, labels=labels, item=item, text=text, route=route, responded=responded:
+                           self.answer_issue(repo_name, reader, issue, labels, item, text, route, responded))
+    
+    def answer_issue(self, repo_name, reader, issue, labels, item, text, route, responded):
+        """Reply to one queued issue; False if another run has it"""
+        logger.info(f"Found MCP issue in {repo_name} #{issue.number}")
+        
+        # Another overlapping run may already be answering it
+        if not self.claim_item(item, text):
+            return False
+        
+        # Analyze and respond
+        thread = f"{repo_name}#{issue.number}"
+        response = self.analyze_mcp_request(issue.title, issue.body)
+        response = self.link_earlier_answers(thread, text, response)
+        target = self.issue_for_write(repo_name, issue, reader)
+        target.create_comment(response)
+        self.remember_answer(item, thread, text, issue.html_url)
+        self.record_content(item, text, route, 'answered')
+        self.release_item(item)
+        
+        # Check if this is from Project Manager
+        if 'from-pm' in labels:
+            parent_info = self.extract_parent_issue(issue.body)
+            if parent_info:
+                logger.info(f"This is a PM delegation - notifying parent issue")
+                self.notify_parent_issue(issue, response, parent_info)
+        
+        # Mark as responded
+        if not responded:
             try:
-                repo = self.g.get_repo(repo_name)
-                
-                for issue in repo.get_issues(state='open'):
-                    labels = [l.name for l in issue.labels]
-                    
-                    # Skip if already processed
-                    if 'mcp-responded' in labels:
-                        continue
-                    
-                    # Check if MCP-related
-                    title_lower = issue.title.lower()
-                    body_lower = issue.body.lower() if issue.body else ""
-                    
-                    mcp_keywords = ['mcp', 'server', 'permission', 'docker', 'connection', 
-                                   'xml-rpc', 'api', 'access denied', 'puppeteer', 'mssql',
-                                   'filesystem']
-                    
-                    if any(keyword in title_lower + ' ' + body_lower for keyword in mcp_keywords):
-                        logger.info(f"Found MCP issue in {repo_name} #{issue.number}")
-                        
-                        # Analyze and respond
-                        response = self.analyze_mcp_request(issue.title, issue.body)
-                        issue.create_comment(response)
-                        
-                        # Check if this is from Project Manager
-                        if 'from-pm' in labels:
-                            parent_info = self.extract_parent_issue(issue.body)
-                            if parent_info:
-                                logger.info(f"This is a PM delegation - notifying parent issue")
-                                self.notify_parent_issue(issue, response, parent_info)
-                        
-                        # Mark as responded
-                        try:
-                            issue.add_to_labels('mcp-responded')
-                        except:
-                            pass
-                        
-            except Exception as e:
-                logger.error(f"Error checking {repo_name}: {e}")
+                target.add_to_labels('mcp-responded')
+            except:
+                pass
+        return True
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='MCP Server Coordinator')
+    parser.add_argument('--budget', type=float,
+                        help='seconds after which the run stops taking new work and checkpoints (default: MCP_RUN_DEADLINE)')
+    args = parser.parse_args()
+    
     try:
         coordinator = MCPServerCoordinator()
+        if args.budget is not None:
+            coordinator.run_budget = args.budget
         logger.info("MCP Server Coordinator starting...")
         
+        # Another run holds the lock - nothing to do
+        if not coordinator.start_run():
+            coordinator.finish_run()
+            return
+        
         # Process MCP-related issues
-        coordinator.process_mcp_issues()
+        try:
+            coordinator.process_mcp_issues()
+        finally:
+            coordinator.finish_run()
         
         logger.info("MCP Server Coordinator completed")
         
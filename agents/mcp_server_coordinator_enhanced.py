@@ -7,9 +7,26 @@ Manages all MCP servers and responds to both issues and comments
 import os
 import json
 import logging
-from datetime import datetime, timedelta
-from github import Github
+import argparse
+from datetime import datetime, timedelta, timezone
 import base64
+import re
+
+from coordinator_backfill import NOT_MCP, Backfill
+from coordinator_lock import RunLock, run_lock_mode
+from coordinator_run import CoordinatorRunMixin
+from coordinator_shards import ShardCoordinator, sharding_enabled
+from coordinator_state import StateStore
+from duplicate_index import DuplicateIndex
+from github_cache import GithubObjectCache
+from github_token_pool import TokenPool, token_scope
+from container_prewarm import Prewarmer
+from content_hashes import ContentHashes
+from container_telemetry import ContainerTelemetry
+from github_transport import github_client
+from knowledge_base import KnowledgeBase
+from log_analyzer import LogAnalyzer
+from work_queue import COMMENT, ISSUE, PM, WorkQueue, run_deadline, timestamp
 
 # Setup logging
 logging.basicConfig(
@@ -18,13 +35,68 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class MCPServerCoordinatorEnhanced:
-    def __init__(self):
+
+def mention_pattern(name):
+    """Regex for name as a word of its own, not part of a longer word, path or domain"""
+    return rf"(?<![\w./@]){re.escape(name)}(?!\w|\.\w|/)"
+
+
+class MCPServerCoordinatorEnhanced(CoordinatorRunMixin):
+    def __init__(self, offline=False):
+        """offline: no GitHub clients or run coordination - only classify and answer text"""
+        self.offline = offline
         self.github_token = os.environ.get('GITHUB_TOKEN')
-        if not self.github_token:
+        if not self.github_token and not offline:
             raise ValueError("GITHUB_TOKEN environment variable not set")
         
-        self.g = Github(self.github_token)
+        self.g = self.tokens = self.cache = None
+        if not offline:
+            self.g = github_client(self.github_token)
+            
+            # Reads go to whichever token has the most budget; replies stay on self.g
+            self.tokens = TokenPool()
+            self.tokens.add('primary', self.g, token_scope('GITHUB_TOKEN_SCOPE'))
+            cross_repo_token = os.environ.get('CROSS_REPO_TOKEN')
+            if cross_repo_token and cross_repo_token != self.github_token:
+                self.tokens.add('cross-repo', github_client(cross_repo_token), token_scope('CROSS_REPO_TOKEN_SCOPE'))
+            
+            # Repo/issue/user objects reused across the run
+            self.cache = GithubObjectCache()
+        
+        # Repositories monitored for MCP issues
+        self.repos_to_monitor = [
+            'jayo2005/paint-sage-operations',
+            'jayo2005/paint-odoo-operations',
+            'jayo2005/paint-tikkurila-operations',
+            'jayo2005/paint-woocommerce-operations',
+            'jayo2005/paint-project-orchestration',
+            'jayo2005/docker-mcp-servers'
+        ]
+        
+        # Keywords that make an issue or comment worth answering
+        self.mcp_keywords = ['mcp', 'server', 'filesystem', 'permission', 'docker',
+                             'connection', 'xml-rpc', 'api', 'access denied', 'puppeteer',
+                             'mssql', 'cross_repo_token', 'cross-repo']
+        
+        # Multi-worker sharding (set MCP_WORKER_ID on each worker to enable)
+        self.shards = ShardCoordinator() if sharding_enabled() and not offline else None
+        
+        # Run-level lock against overlapping cron/event runs (MCP_RUN_LOCK_MODE)
+        self.run_lock = RunLock() if run_lock_mode() != 'off' and not offline else None
+        
+        # Answered questions, so a repeat can link to the earlier answer
+        self.duplicates = DuplicateIndex() if not offline else None
+        
+        # Prewarm an agent's servers when its repo shows activity (MCP_PREWARM)
+        self.prewarmer = Prewarmer() if not offline else None
+        self.prewarm_lookback = int(os.environ.get('MCP_PREWARM_LOOKBACK', '3600'))
+        
+        # Text hash and route of everything handled, so edits only re-answer on a new route
+        self.content = ContentHashes() if not offline else None
+        
+        # Run checkpoint, and the time budget runs stop taking new work after
+        self.state = StateStore() if not offline else None
+        self.run_budget = run_deadline()
         
         # MCP Server inventory (same as before)
         self.mcp_servers = {
@@ -101,35 +173,96 @@ class MCPServerCoordinatorEnhanced:
                 'script': '/home/jason/MCP_SERVERS/scripts/mcp-elementor.sh'
             }
         }
+        
+        # Agent-specific MCP usage (same as the basic coordinator)
+        self.agent_mcp_usage = {
+            'sage-agent': ['sage_mssql', 'filesystem', 'github'],
+            'odoo-agent': ['odoo_mcp', 'odoo16', 'odoo17', 'postgres', 'puppeteer', 'github'],
+            'tikkurila-agent': ['postgres', 'filesystem', 'github'],
+            'woocommerce-agent': ['wordpress', 'elementor', 'github'],
+            'project-manager': ['github', 'filesystem']
+        }
+        
+        # Agent working in each monitored repo, for prewarming its MCP servers
+        self.repo_agents = {
+            'jayo2005/paint-sage-operations': 'sage-agent',
+            'jayo2005/paint-odoo-operations': 'odoo-agent',
+            'jayo2005/paint-tikkurila-operations': 'tikkurila-agent',
+            'jayo2005/paint-woocommerce-operations': 'woocommerce-agent',
+            'jayo2005/paint-project-orchestration': 'project-manager'
+        }
+        
+        # TF-IDF index over response sections, built once and memory-mapped
+        self.knowledge_base = KnowledgeBase(
+            self.kb_routes(), 'enhanced', source_files=[__file__],
+            atomic_routes=['list_available_servers', 'provide_performance_report']
+        )
+    
+    def kb_routes(self):
+        """Responses whose sections make up the knowledge base"""
+        return {
+            'explain_filesystem_server': lambda text: self.explain_filesystem_server(),
+            'explain_cross_repo_token': lambda text: self.explain_cross_repo_token(),
+            'handle_permission_issue': lambda text: self.handle_permission_issue("", text),
+            'list_available_servers': lambda text: self.list_available_servers(),
+            'handle_setup_request': lambda text: self.handle_setup_request("", text),
+            'provide_sage_guidance': lambda text: self.provide_sage_guidance(),
+            'provide_odoo_guidance': lambda text: self.provide_odoo_guidance(),
+            'provide_performance_report': lambda text: self.provide_performance_report(),
+        }
+    
+    def is_mcp_related(self, text):
+        """Whether the text mentions anything MCP-related"""
+        text_lower = (text or '').lower()
+        return any(keyword in text_lower for keyword in self.mcp_keywords)
     
     def analyze_text_for_mcp(self, text):
         """Analyze any text for MCP-related questions"""
+        response = self.knowledge_base.compose(text)
+        if response:
+            return response
+        return self.render_route(self.keyword_route(text), text)
+    
+    def classify_text(self, text):
+        """Name of the route analyze_text_for_mcp answers the text with"""
+        return self.knowledge_base.best_route(text) or self.keyword_route(text)
+    
+    def render_route(self, route, text):
+        if route == 'general_mcp_response':
+            return self.general_mcp_response(text)
+        return self.kb_routes()[route](text)
+    
+    def keyword_route(self, text):
+        """First-match keyword routing, used when the knowledge base has no good match"""
         text_lower = text.lower()
         
         # Check for specific questions about servers
         if 'filesystem' in text_lower and any(word in text_lower for word in ['what', 'does', 'safe', 'can']):
-            return self.explain_filesystem_server()
+            return 'explain_filesystem_server'
         
         elif 'cross_repo_token' in text_lower or 'cross-repo' in text_lower:
-            return self.explain_cross_repo_token()
+            return 'explain_cross_repo_token'
         
         elif any(word in text_lower for word in ['permission', 'access denied', 'connection', 'error']):
-            return self.handle_permission_issue("", text)
+            return 'handle_permission_issue'
+        
+        elif any(word in text_lower for word in ['heavy', 'memory', 'cpu', 'resource usage', 'performance', 'slow']):
+            return 'provide_performance_report'
         
         elif any(word in text_lower for word in ['available', 'list', 'what mcp', 'which servers']):
-            return self.list_available_servers()
+            return 'list_available_servers'
         
         elif any(word in text_lower for word in ['setup', 'configure', 'install']):
-            return self.handle_setup_request("", text)
+            return 'handle_setup_request'
         
         elif any(word in text_lower for word in ['sage', 'mssql', 'sql server']):
-            return self.provide_sage_guidance()
+            return 'provide_sage_guidance'
         
         elif any(word in text_lower for word in ['odoo', 'xml-rpc', 'api']):
-            return self.provide_odoo_guidance()
+            return 'provide_odoo_guidance'
         
         else:
-            return self.general_mcp_response(text)
+            return 'general_mcp_response'
     
     def explain_filesystem_server(self):
         """Explain the filesystem MCP server"""
@@ -229,8 +362,37 @@ If you see CROSS_REPO_TOKEN in any documentation or code:
 ---
 *Updated based on latest GitHub MCP capabilities*"""
     
+    def compose_service(self, server):
+        """Compose service behind a registry entry (scripts are named after their service)"""
+        return os.path.basename(self.mcp_servers[server]['script'])[:-len('.sh')]
+    
+    def mentioned_servers(self, text):
+        """Registry servers named in the text by key, display name or compose service,
+        as whole words ("excel" is not in "excellent", "github" not in github.com URLs)"""
+        text_lower = (text or '').lower()
+        found = []
+        for server, info in self.mcp_servers.items():
+            names = {server, info.get('name', server).lower(), self.compose_service(server)}
+            if any(re.search(mention_pattern(name), text_lower) for name in names):
+                found.append(server)
+        return found
+    
+    def recent_errors_section(self, text, limit=2):
+        """Top recent log errors for the servers mentioned in the text, or ''"""
+        analyzer = LogAnalyzer()
+        sections = []
+        for server in self.mentioned_servers(text)[:limit]:
+            section = analyzer.top_errors_markdown(self.compose_service(server))
+            if section:
+                sections.append(section)
+        if not sections:
+            return ''
+        return "\n\n".join(sections) + "\n\n"
+    
     def handle_permission_issue(self, title, body):
         """Handle MCP permission and connection issues"""
+        recent_errors = self.recent_errors_section(f"{title} {body or ''}")
+        
         return f"""## 🛠️ MCP Server Coordinator Response - Troubleshooting
 
 ### Common MCP Server Issues:
@@ -253,7 +415,7 @@ If you see CROSS_REPO_TOKEN in any documentation or code:
 ### Quick Diagnostics:
 ```bash
 # Test MCP server
-echo '{"jsonrpc": "2.0", "method": "tools/list", "id": 1}' | ./scripts/mcp-<server>.sh
+echo '{{"jsonrpc": "2.0", "method": "tools/list", "id": 1}}' | ./scripts/mcp-<server>.sh
 
 # Check Docker status
 docker compose ps
@@ -262,7 +424,7 @@ docker compose ps
 docker compose logs -f mcp-<server>
 ```
 
-### Need More Help?
+{recent_errors}### Need More Help?
 Please provide:
 1. Which MCP server is failing
 2. Exact error message
@@ -402,8 +564,32 @@ ODOO17_PASSWORD=Sc00tZujeva
 ---
 *Choose the right Odoo MCP for your needs*"""
     
+    def provide_performance_report(self):
+        """Report which MCP servers are heaviest from collected container telemetry"""
+        table = ContainerTelemetry().heavy_servers_markdown()
+        if not table:
+            table = """### Heaviest MCP servers
+No container telemetry has been collected yet.
+Run `./manage.sh telemetry` on the MCP host (e.g. from cron every 5 minutes) to start sampling."""
+        
+        return f"""## 📊 MCP Server Resource Usage
+
+{table}
+
+### Reducing load:
+- **mcp-puppeteer** runs Chromium; stop it when no agent needs browser automation
+- Restart counts that keep growing usually mean a crash loop: `docker compose logs mcp-<server>`
+- Compare with `docker stats` for a live view
+
+---
+*MCP Server Coordinator - Numbers from `docker stats` / `docker inspect` samples*"""
+    
     def general_mcp_response(self, text):
         """General MCP guidance"""
+        heavy_servers = ContainerTelemetry().heavy_servers_markdown(top=3)
+        if heavy_servers:
+            heavy_servers = f"\n{heavy_servers}\n"
+        
         return f"""## 🛠️ MCP Server Coordinator Response
 
 ### Analyzing your request...
@@ -432,7 +618,7 @@ docker compose ps
 2. **Fix connection issues**: Provide error details
 3. **Configure for agents**: Tell me which agent needs help
 4. **Performance optimization**: Which server is slow?
-
+{heavy_servers}
 Please provide more details about your MCP-related need!
 
 ---
@@ -440,82 +626,139 @@ Please provide more details about your MCP-related need!
     
     def process_mcp_issues_and_comments(self):
         """Monitor all repositories for MCP-related issues AND comments"""
-        repos_to_monitor = [
-            'jayo2005/paint-sage-operations',
-            'jayo2005/paint-odoo-operations',
-            'jayo2005/paint-tikkurila-operations',
-            'jayo2005/paint-woocommerce-operations',
-            'jayo2005/paint-project-orchestration',
-            'jayo2005/docker-mcp-servers'
-        ]
+        # Scan everything first, then answer in priority order
+        queue = WorkQueue(self.repos_to_monitor, self.run_budget, store=self.state, name='enhanced')
+        queue.scan(self.repos_for_this_run(queue.scan_order()), self.queue_repo_work)
+        if self.shards is not None:
+            queue.exclude(self.shards.skipped)
         
-        # Track what we've already responded to
-        responded_comments = set()
+        # Stops between items: each reply, label and content hash is written before the next
+        queue.drain()
+        queue.save_checkpoint()
+        queue.log_summary()
+        return queue
+    
+    def queue_repo_work(self, queue, repo_name):
+        """Queue the issues and comments of one repo that need an answer"""
+        reader = self.tokens.reader(repo_name)
+        repo = self.cache.get_repo(reader, repo_name)
         
-        for repo_name in repos_to_monitor:
-            try:
-                repo = self.g.get_repo(repo_name)
+        # Process open issues
+        for issue in repo.get_issues(state='open'):
+            labels = [l.name for l in issue.labels]
+            self.prewarm_for_activity(repo_name, issue)
+            priority = PM if 'from-pm' in labels else None
+            thread = f"{repo_name}#{issue.number}"
+            
+            # Check for new comments since last check
+            # Look for comments in the last hour
+            one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
+            
+            for comment in issue.get_comments():
+                # Skip if too old (edits count as activity)
+                if comment.updated_at < one_hour_ago:
+                    continue
+                
+                # Skip our own comments
+                if 'MCP Server Coordinator' in comment.body:
+                    continue
                 
-                # Process open issues
-                for issue in repo.get_issues(state='open'):
-                    labels = [l.name for l in issue.labels]
-                    
-                    # Check for new comments since last check
-                    # Look for comments in the last hour
-                    one_hour_ago = datetime.utcnow() - timedelta(hours=1)
-                    
-                    for comment in issue.get_comments():
-                        # Skip if too old
-                        if comment.created_at < one_hour_ago:
-                            continue
-                        
-                        # Skip if we've already responded
-                        comment_id = f"{repo_name}#{issue.number}#{comment.id}"
-                        if comment_id in responded_comments:
-                            continue
-                        
-                        # Skip our own comments
-                        if 'MCP Server Coordinator' in comment.body:
-                            continue
-                        
-                        # Check if comment is MCP-related
-                        comment_lower = comment.body.lower()
-                        issue_title_lower = issue.title.lower()
-                        
-                        mcp_keywords = ['mcp', 'server', 'filesystem', 'permission', 'docker', 
-                                       'connection', 'xml-rpc', 'api', 'access denied', 'puppeteer', 
-                                       'mssql', 'cross_repo_token', 'cross-repo']
-                        
-                        if any(keyword in comment_lower for keyword in mcp_keywords):
-                            logger.info(f"Found MCP-related comment in {repo_name} #{issue.number}")
-                            
-                            # Analyze and respond
-                            response = self.analyze_text_for_mcp(comment.body)
-                            issue.create_comment(response)
-                            responded_comments.add(comment_id)
-                            
-                            logger.info(f"Responded to comment in {repo_name} #{issue.number}")
-                    
-                    # Also check if the issue itself needs a response
-                    if 'mcp-responded' not in labels:
-                        title_lower = issue.title.lower()
-                        body_lower = issue.body.lower() if issue.body else ""
-                        
-                        if any(keyword in title_lower + ' ' + body_lower for keyword in mcp_keywords):
-                            logger.info(f"Found MCP issue in {repo_name} #{issue.number}")
-                            
-                            # Analyze and respond
-                            response = self.analyze_text_for_mcp(issue.title + " " + (issue.body or ""))
-                            issue.create_comment(response)
-                            
-                            # Mark as responded
-                            try:
-                                issue.add_to_labels('mcp-responded')
-                            except:
-                                pass
-                        
-            except Exception as e:
-                logger.error(f"Error checking {repo_name}: {e}")
+                # Skip text we have already handled
+                item = f"comment:{thread}#{comment.id}"
+                unchanged, previous = self.content_unchanged(item, comment.body)
+                if unchanged:
+                    continue
+                
+                # Check if comment is MCP-related
+                if not self.is_mcp_related(comment.body):
+                    self.record_content(item, comment.body, NOT_MCP, 'not_mcp')
+                    continue
+                
+                route = self.classify_text(comment.body)
+                if previous == route:
+                    logger.info(f"Edited comment in {thread} keeps route {route} - not re-answering")
+                    self.record_content(item, comment.body, route, 'same_route')
+                    continue
+                if previous is None and comment.created_at < one_hour_ago:
+                    # An old comment edited before its text was ever recorded
+                    self.record_content(item, comment.body, route, 'baseline')
+                    continue
+                
+                waiting_since = comment.created_at if previous in (None, NOT_MCP) else comment.updated_at
+                queue.push(item, priority or COMMENT, repo_name, timestamp(waiting_since),
+                           lambda issue=issue, comment=comment, item=item, route=route:
+                               self.answer_comment(repo_name, reader, issue, comment, item, route))
+            
+            # Also check if the issue itself needs a response
+            item = f"issue:{thread}"
+            text = issue.title + " " + (issue.body or "")
+            unchanged, previous = self.content_unchanged(item, text)
+            if unchanged:
+                continue
+            
+            if not self.is_mcp_related(text):
+                self.record_content(item, text, NOT_MCP, 'not_mcp')
+                continue
+            
+            route = self.classify_text(text)
+            responded = 'mcp-responded' in labels
+            if previous == route or (responded and previous is None):
+                # Same answer as before (or answered before hashes were kept)
+                self.record_content(item, text, route, 'same_route' if previous else 'baseline')
+                continue
+            
+            if responded:
+                logger.info(f"Edited MCP issue in {thread} moved from {previous} to {route}")
+            
+            waiting_since = issue.created_at if previous in (None, NOT_MCP) else issue.updated_at
+            queue.push(item, priority or ISSUE, repo_name, timestamp(waiting_since),
+                       lambda issue=issue, item=item, text=text, route=route, responded=responded:
+                           self.answer_issue(repo_name, reader, issue, item, text, route, responded))
+    
+    def answer_comment(self, repo_name, reader, issue, comment, item, route):
+        """Reply to one queued comment; False if another run has it"""
+        logger.info(f"Found MCP-related comment in {repo_name} #{issue.number}")
+        
+        # Another overlapping run may already be answering it
+        if not self.claim_item(item, comment.body):
+            return False
+        
+        # Analyze and respond
+        thread = f"{repo_name}#{issue.number}"
+        response = self.analyze_text_for_mcp(comment.body)
+        response = self.link_earlier_answers(thread, comment.body, response)
+        self.issue_for_write(repo_name, issue, reader).create_comment(response)
+        self.remember_answer(item, thread, comment.body, comment.html_url)
+        self.record_content(item, comment.body, route, 'answered')
+        self.release_item(item)
+        
+        logger.info(f"Responded to comment in {repo_name} #{issue.number}")
+        return True
+    
+    def answer_issue(self, repo_name, reader, issue, item, text, route, responded):
+        """Reply to one queued issue; False if another run has it"""
+        logger.info(f"Found MCP issue in {repo_name} #{issue.number}")
+        
+        if not self.claim_item(item, text):
+            return False
+        
+        # Analyze and respond
+        thread = f"{repo_name}#{issue.number}"
+        response = self.analyze_text_for_mcp(text)
+        response = self.link_earlier_answers(thread, text, response)
+        target = self.issue_for_write(repo_name, issue, reader)
+        target.create_comment(response)
+        self.remember_answer(item, thread, text, issue.html_url)
+        self.record_content(item, text, route, 'answered')
+        self.release_item(item)
+        
+        # Mark as responded
+        if not responded:
+            try:
+                target.add_to_labels('mcp-responded')
+            except:
+                pass
+        return True
     
     def handle_setup_request(self, title, body):
         """Handle MCP setup requests"""
@@ -557,14 +800,52 @@ Please provide more details about your MCP-related need!
 ---
 *Need help with a specific server? Just ask!*"""
 
+def run_backfill(coordinator, args):
+    """Classify historical issues without answering any of them"""
+    backfill = Backfill(coordinator, dry_run=args.dry_run)
+    try:
+        if args.reset:
+            backfill.reset()
+        backfill.run(args.repo or None, args.max_pages)
+        print(backfill.coverage_report())
+    finally:
+        backfill.close()
+        coordinator.finish_run()
+
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description='MCP Server Coordinator')
+    parser.add_argument('--backfill', action='store_true',
+                        help='classify all historical issues instead of answering new ones')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='backfill in memory only: report coverage without writing any state')
+    parser.add_argument('--reset', action='store_true', help='restart the backfill from the first page')
+    parser.add_argument('--repo', action='append', help='backfill only this repo (repeatable)')
+    parser.add_argument('--max-pages', type=int, help='stop each repo after this many pages')
+    parser.add_argument('--budget', type=float,
+                        help='seconds after which the run stops taking new work and checkpoints (default: MCP_RUN_DEADLINE)')
+    args = parser.parse_args()
+    
     try:
         coordinator = MCPServerCoordinatorEnhanced()
+        if args.budget is not None:
+            coordinator.run_budget = args.budget
         logger.info("MCP Server Coordinator Enhanced starting...")
         
+        if args.backfill:
+            run_backfill(coordinator, args)
+            return
+        
+        # Another run holds the lock - nothing to do
+        if not coordinator.start_run():
+            coordinator.finish_run()
+            return
+        
         # Process MCP-related issues AND comments
-        coordinator.process_mcp_issues_and_comments()
+        try:
+            coordinator.process_mcp_issues_and_comments()
+        finally:
+            coordinator.finish_run()
         
         logger.info("MCP Server Coordinator Enhanced completed")
         
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+MCP Stdio Session
+Client side of one MCP stdio server process: spawns it, completes initialize and
+multiplexes concurrent JSON-RPC requests over its stdin/stdout, matching
+responses to callers by id
+"""
+
+import logging
+import itertools
+import threading
+import subprocess
+
+from jsonrpc_framing import AUTO, NEWLINE, encode_body, read_messages, write_message
+
+logger = logging.getLogger(__name__)
+
+PROTOCOL_VERSION = '2024-11-05'
+
+
+class McpError(Exception):
+    """JSON-RPC error returned by the server"""
+
+    def __init__(self, error):
+        self.code = error.get('code')
+        self.data = error.get('data')
+        super().__init__(error.get('message', 'unknown error'))
+
+
+class _Pending:
+    __slots__ = ('event', 'response')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+
+
+class StdioSession:
+    def __init__(self, command, cwd=None, env=None, name=None, on_message=None, framing=NEWLINE):
+        """on_message receives server-initiated requests and notifications;
+        framing is how requests are sent (replies are detected either way)"""
+        self.command = command
+        self.cwd = cwd
+        self.env = env
+        self.name = name or ' '.join(command)
+        self.on_message = on_message
+        self.framing = framing
+        self.proc = None
+        self.server_info = None
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader = None
+        self._closed = False
+
+    def start(self):
+        self.proc = subprocess.Popen(
+            self.command, cwd=self.cwd, env=self.env,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        self._reader = threading.Thread(target=self._read_loop, name=f"mcp-reader-{self.name}", daemon=True)
+        self._reader.start()
+        return self
+
+    def initialize(self, client_name='mcp-coordinator', timeout=120):
+        """Run the MCP handshake; returns the server's initialize result"""
+        result = self.request('initialize', {
+            'protocolVersion': PROTOCOL_VERSION,
+            'capabilities': {},
+            'clientInfo': {'name': client_name, 'version': '1.0.0'},
+        }, timeout=timeout)
+        self.server_info = result
+        self.notify('notifications/initialized')
+        return result
+
+    def request(self, method, params=None, timeout=None):
+        """Send a request and wait for its result; safe to call from many threads"""
+        request_id = next(self._ids)
+        pending = _Pending()
+        with self._lock:
+            if self._closed:
+                raise ConnectionError(f"{self.name}: session closed")
+            self._pending[request_id] = pending
+
+        message = {'jsonrpc': '2.0', 'id': request_id, 'method': method}
+        if params is not None:
+            message['params'] = params
+        try:
+            self._send(message)
+        except OSError as e:
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise ConnectionError(f"{self.name}: {e}") from e
+
+        if not pending.event.wait(timeout):
+            with self._lock:
+                self._pending.pop(request_id, None)
+            raise TimeoutError(f"{self.name}: {method} timed out after {timeout}s")
+
+        response = pending.response
+        if response is None:
+            raise ConnectionError(f"{self.name}: server exited")
+        if 'error' in response:
+            raise McpError(response['error'])
+        return response.get('result')
+
+    def notify(self, method, params=None):
+        message = {'jsonrpc': '2.0', 'method': method}
+        if params is not None:
+            message['params'] = params
+        self._send(message)
+
+    def send(self, message):
+        """Send a message as-is, e.g. the client's reply to a server-initiated request"""
+        self._send(message)
+
+    def _send(self, message):
+        body = encode_body(message)
+        with self._write_lock:
+            write_message(self.proc.stdin, None, self.framing, body)
+            self.proc.stdin.flush()
+
+    def _read_loop(self):
+        try:
+            for message in read_messages(self.proc.stdout, AUTO):
+                if not isinstance(message, dict):
+                    continue
+                if 'id' in message and ('result' in message or 'error' in message):
+                    with self._lock:
+                        pending = self._pending.pop(message['id'], None)
+                    if pending is not None:
+                        pending.response = message
+                        pending.event.set()
+                elif self.on_message is not None:
+                    self.on_message(message)
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        for waiter in pending.values():
+            waiter.event.set()
+
+    @property
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None and not self._closed
+
+    def close(self, timeout=10):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            self.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        if self._reader is not None:
+            self._reader.join(timeout)
+        self._fail_pending()
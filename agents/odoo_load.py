@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Odoo MCP Load Generator
+Drives the odoo-mcp server over stdio at increasing concurrency against the fake
+Odoo (or any Odoo URL) and reports throughput, latency, queue wait, timeouts and
+throttling per level, for the pool and rate limit settings under test
+
+Settings are written to a scratch copy of odoo_mcp/config.json, so a run such as
+    python agents/odoo_load.py --pool-size 2 --requests-per-minute 80
+shows how those values behave before they are used against production.
+
+By default the server runs the way agents use it: a one-off
+`docker compose run --rm -i mcp-odoo-mcp` session with the scratch config
+mounted over /app/config.json, reaching the fake Odoo through
+host.docker.internal. --local runs `python -m odoo_mcp.server` directly
+instead, which needs the server package installed first:
+    pip install mcp-odoo-panda
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shlex
+import shutil
+import tempfile
+import argparse
+import threading
+import importlib.util
+import statistics
+import urllib.request
+
+from fake_odoo import start_fake_odoo
+from mcp_stdio import McpError, StdioSession
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ODOO_MCP_DIR = os.path.join(REPO_ROOT, 'odoo_mcp')
+
+THROTTLE_RE = re.compile(r'rate.?limit|too many requests|throttl|429', re.IGNORECASE)
+
+SERVICE = 'mcp-odoo-mcp'
+SERVER_MODULE = 'odoo_mcp.server'
+# Passed through to the container; values come from the environment set in main()
+SERVER_ENV = ('ODOO_URL', 'ODOO_DB', 'ODOO_USER', 'ODOO_PASSWORD', 'PROTOCOL', 'CONNECTION_TYPE', 'LOGGING_LEVEL')
+
+DEFAULT_ARGUMENTS = {'model': 'res.partner', 'domain': [], 'fields': ['name', 'email'], 'limit': 20}
+
+
+def write_config(directory, overrides):
+    """Scratch odoo_mcp/config.json with the settings under test"""
+    with open(os.path.join(ODOO_MCP_DIR, 'config.json')) as f:
+        config = json.load(f)
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    with open(os.path.join(directory, 'config.json'), 'w') as f:
+        json.dump(config, f, indent=2)
+    return config
+
+
+def local_server_installed():
+    try:
+        return importlib.util.find_spec(SERVER_MODULE) is not None
+    except ModuleNotFoundError:
+        return False
+
+
+def docker_command(workdir):
+    """One-off session of the compose service with the scratch config mounted"""
+    command = ['docker', 'compose', '--project-directory', REPO_ROOT, 'run', '--rm', '-i',
+               '-v', f"{os.path.join(workdir, 'config.json')}:/app/config.json:ro"]
+    for name in SERVER_ENV:
+        command += ['-e', name]
+    return command + [SERVICE]
+
+
+def pick_tool(tools, requested=None):
+    names = [tool['name'] for tool in tools]
+    if requested:
+        if requested not in names:
+            raise SystemExit(f"Tool {requested!r} not offered; server has: {', '.join(names)}")
+        return requested
+    for preferred in ('search_read', 'search_records', 'search'):
+        for name in names:
+            if preferred in name:
+                return name
+    raise SystemExit(f"No search tool found; pass --tool (server has: {', '.join(names)})")
+
+
+def classify(call):
+    """('ok' | 'throttled' | 'error' | 'timeout', message) for one tool call"""
+    try:
+        result = call()
+    except TimeoutError as e:
+        return 'timeout', str(e)
+    except (McpError, ConnectionError) as e:
+        return ('throttled' if THROTTLE_RE.search(str(e)) else 'error'), str(e)
+    if result and result.get('isError'):
+        text = ' '.join(c.get('text', '') for c in result.get('content', []) if isinstance(c, dict))
+        return ('throttled' if THROTTLE_RE.search(text) else 'error'), text
+    return 'ok', ''
+
+
+def fake_stats(url, reset=False):
+    if reset:
+        urllib.request.urlopen(urllib.request.Request(f"{url}/stats/reset", data=b'', method='POST')).read()
+        return None
+    with urllib.request.urlopen(f"{url}/stats") as response:
+        return json.load(response)
+
+
+def run_level(session, tool, arguments, concurrency, duration, timeout, fake_url=None, backoff=0.5):
+    """Closed-loop load: each worker issues its next call as soon as the last returns,
+    or after `backoff` seconds if it was throttled or failed, like a retrying agent"""
+    if fake_url:
+        fake_stats(fake_url, reset=True)
+    results = []
+    results_lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            outcome, message = classify(lambda: session.request(
+                'tools/call', {'name': tool, 'arguments': arguments}, timeout=timeout
+            ))
+            with results_lock:
+                results.append((outcome, time.perf_counter() - start, message))
+            if outcome != 'ok':
+                time.sleep(backoff)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    ok = sorted(latency for outcome, latency, _ in results if outcome == 'ok')
+    counts = {outcome: sum(1 for o, _, _ in results if o == outcome) for outcome in ('ok', 'throttled', 'error', 'timeout')}
+    level = {
+        'concurrency': concurrency,
+        'requests': len(results),
+        **counts,
+        'throughput_rps': counts['ok'] / elapsed if elapsed else 0.0,
+        'mean_ms': 1000 * statistics.mean(ok) if ok else None,
+        'p50_ms': 1000 * ok[len(ok) // 2] if ok else None,
+        'p95_ms': 1000 * ok[max(0, int(len(ok) * 0.95) - 1)] if ok else None,
+        'sample_error': next((m for o, _, m in results if o != 'ok'), ''),
+    }
+
+    if fake_url:
+        stats = fake_stats(fake_url)
+        calls = stats['calls'] or 1
+        level['odoo_calls_per_request'] = stats['calls'] / max(1, len(results))
+        level['odoo_queue_ms'] = 1000 * stats['queue_seconds'] / calls
+        level['odoo_service_ms'] = 1000 * stats['service_seconds'] / calls
+        if level['mean_ms'] is not None:
+            # Whatever the Odoo side doesn't explain was spent in the MCP server:
+            # its rate limiter, its connection pool and JSON-RPC handling
+            odoo_ms = level['odoo_calls_per_request'] * (level['odoo_queue_ms'] + level['odoo_service_ms'])
+            level['mcp_wait_ms'] = max(0.0, level['mean_ms'] - odoo_ms)
+    return level
+
+
+def format_levels(levels):
+    header = (f"{'conc':>5}{'reqs':>7}{'ok':>7}{'thrt':>6}{'err':>6}{'tmo':>6}{'rps':>8}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'odoo q ms':>11}{'mcp wait ms':>13}")
+    lines = [header]
+    for level in levels:
+        def ms(key):
+            value = level.get(key)
+            return f"{value:.1f}" if value is not None else '-'
+        lines.append(
+            f"{level['concurrency']:>5}{level['requests']:>7}{level['ok']:>7}{level['throttled']:>6}"
+            f"{level['error']:>6}{level['timeout']:>6}{level['throughput_rps']:>8.1f}"
+            f"{ms('p50_ms'):>9}{ms('p95_ms'):>9}{ms('odoo_queue_ms'):>11}{ms('mcp_wait_ms'):>13}"
+        )
+    errors = [f"  c={l['concurrency']}: {l['sample_error'][:160]}" for l in levels if l['sample_error']]
+    if errors:
+        lines += ["", "First non-ok result per level:"] + errors
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load test the odoo-mcp server against a fake or real Odoo',
+        epilog=f"The server runs in the {SERVICE} compose service by default. --local runs "
+               f"`python -m {SERVER_MODULE}` instead and needs `pip install mcp-odoo-panda` first."
+    )
+    parser.add_argument('--local', action='store_true',
+                        help=f'run {SERVER_MODULE} with this Python instead of the {SERVICE} container')
+    parser.add_argument('--command',
+                        help='MCP server command (run in a scratch dir holding the config under test)')
+    parser.add_argument('--odoo-url', help='existing Odoo to use instead of starting the fake one')
+    parser.add_argument('--database', default='fake')
+    parser.add_argument('--user', default='agent@example.com')
+    parser.add_argument('--password', default='secret')
+    parser.add_argument('--protocol', choices=['xmlrpc', 'jsonrpc'], default='xmlrpc')
+    parser.add_argument('--latency', type=float, default=0.05, help='fake Odoo mean service time (s)')
+    parser.add_argument('--jitter', type=float, default=0.02)
+    parser.add_argument('--odoo-workers', type=int, default=4, help='fake Odoo concurrent workers')
+    parser.add_argument('--concurrency', default='1,2,4,8,16', help='comma-separated client concurrency levels')
+    parser.add_argument('--duration', type=float, default=15, help='seconds per level')
+    parser.add_argument('--timeout', type=float, default=30, help='client-side timeout per call (s)')
+    parser.add_argument('--backoff', type=float, default=0.5, help='client pause after a throttled/failed call (s)')
+    parser.add_argument('--tool', help='tool to call (default: first search_read-like tool)')
+    parser.add_argument('--arguments', type=json.loads, default=DEFAULT_ARGUMENTS, help='tool arguments as JSON')
+    # Settings under test, written into the scratch config.json
+    parser.add_argument('--pool-size', type=int)
+    parser.add_argument('--requests-per-minute', type=int)
+    parser.add_argument('--rate-limit-max-wait-seconds', type=float)
+    parser.add_argument('--odoo-timeout', type=int, help='config.json "timeout"')
+    parser.add_argument('--session-timeout-minutes', type=int)
+    parser.add_argument('--json', dest='json_path', help='write all results as JSON')
+    parser.add_argument('--latency-out', help='write uncontended latency for capacity_planner.py --latency')
+    args = parser.parse_args()
+
+    if args.local and not args.command and not local_server_installed():
+        parser.error(f"{SERVER_MODULE} is not installed for {sys.executable}: "
+                     f"run `pip install mcp-odoo-panda`, or drop --local to use the {SERVICE} container")
+    in_docker = not args.local and not args.command
+
+    fake = None
+    odoo_url = args.odoo_url
+    if not odoo_url:
+        # The container reaches the host through host.docker.internal, not loopback
+        fake = start_fake_odoo(host='0.0.0.0' if in_docker else '127.0.0.1', latency=args.latency,
+                               jitter=args.jitter, workers=args.odoo_workers, database=args.database)
+        odoo_url = fake.url
+        if in_docker:
+            odoo_url = f"http://host.docker.internal:{fake.server_address[1]}"
+
+    workdir = tempfile.mkdtemp(prefix='odoo-mcp-load-')
+    config = write_config(workdir, {
+        'pool_size': args.pool_size,
+        'requests_per_minute': args.requests_per_minute,
+        'rate_limit_max_wait_seconds': args.rate_limit_max_wait_seconds,
+        'timeout': args.odoo_timeout,
+        'session_timeout_minutes': args.session_timeout_minutes,
+    })
+    env = dict(os.environ, ODOO_URL=odoo_url, ODOO_DB=args.database, ODOO_USER=args.user,
+               ODOO_PASSWORD=args.password, PROTOCOL=args.protocol, CONNECTION_TYPE='stdio',
+               LOGGING_LEVEL=os.environ.get('LOGGING_LEVEL', 'WARNING'))
+
+    if args.command:
+        command = shlex.split(args.command)
+    elif args.local:
+        command = [sys.executable, '-m', SERVER_MODULE]
+    else:
+        command = docker_command(workdir)
+    session = StdioSession(command, cwd=workdir, env=env, name='odoo-mcp').start()
+    try:
+        session.initialize(client_name='odoo-load', timeout=120)
+        tool = pick_tool(session.request('tools/list', timeout=60).get('tools', []), args.tool)
+        print(f"Odoo at {odoo_url} ({args.protocol}); calling {tool} with "
+              f"pool_size={config['pool_size']} requests_per_minute={config['requests_per_minute']} "
+              f"rate_limit_max_wait_seconds={config['rate_limit_max_wait_seconds']} timeout={config['timeout']}")
+
+        levels = []
+        for concurrency in [int(c) for c in args.concurrency.split(',') if c.strip()]:
+            levels.append(run_level(session, tool, args.arguments, concurrency, args.duration,
+                                    args.timeout, fake.url if fake else None, args.backoff))
+            print(f"  concurrency {concurrency}: {levels[-1]['ok']}/{levels[-1]['requests']} ok", file=sys.stderr)
+    finally:
+        session.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+        if fake:
+            fake.shutdown()
+
+    print(format_levels(levels))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump({'settings': config, 'tool': tool, 'levels': levels}, f, indent=2)
+    if args.latency_out and levels and levels[0]['mean_ms'] is not None:
+        with open(args.latency_out, 'w') as f:
+            json.dump({'mcp-odoo-mcp': {'mean_ms': levels[0]['mean_ms'], 'p95_ms': levels[0]['p95_ms']}}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+SQL Caching MCP Proxy
+Sits between an agent and a read-only SQL MCP server (postgres / ODOO_17_paint,
+sage_mssql). It normalizes the SQL in tool calls, serves repeats from a TTL + LRU
+cache bounded in bytes, coalesces identical calls already in flight, and streams
+results too large to cache straight through to the client:
+
+    python3 agents/sql_cache_proxy.py -- docker compose run --rm -i mcp-sage-mssql
+
+The cache lives as long as the proxy, i.e. one agent session.
+"""
+
+import os
+import re
+import sys
+import json
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from github_cache import TTLCache
+from jsonrpc_framing import encode_body, read_messages
+from mcp_stdio import McpError, StdioSession
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_SUFFIXES = ('.py', '.sh', '.js')
+
+# Tools of the postgres and sage_mssql servers whose results depend only on their arguments
+CACHEABLE_TOOLS = ('query', 'list_tables', 'describe_table')
+SQL_ARGUMENTS = ('sql', 'query')
+
+TOKEN_RE = re.compile(r"""
+    (?P<comment>--[^\n]*|/\*.*?\*/)
+  | (?P<literal>'(?:[^']|'')*'|"(?:[^"]|"")*"|\[[^\]]*\]|\$\$.*?\$\$)
+  | (?P<space>\s+)
+  | (?P<punct>[,()=<>;+*/%])
+  | (?P<word>[^\s,()=<>;+*/%'"\[-]+|-)
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+READ_ONLY_RE = re.compile(r'^(select|with|show|explain|values)\b')
+WRITE_RE = re.compile(r'\b(insert|update|delete|merge|into|create|alter|drop|truncate|grant|revoke|'
+                      r'exec|execute|call|nextval|setval|lock)\b')
+# Live clocks, random values and server activity views must never be served from cache
+VOLATILE_RE = re.compile(r'\b(now|current_timestamp|current_date|current_time|localtime|localtimestamp|'
+                         r'clock_timestamp|statement_timestamp|timeofday|random|getdate|getutcdate|'
+                         r'sysdatetime|sysutcdatetime|sysdatetimeoffset|newid|newsequentialid|rand|'
+                         r'txid_current|pg_stat_\w+|dm_\w+)\b')
+# Catalog queries change only with migrations, so they get the longer schema TTL
+SCHEMA_RE = re.compile(r'\b(information_schema|pg_catalog|sys\.(tables|columns|objects|schemas|views)|sqlite_master)\b')
+
+ENCODER = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+WRITE_CHUNK = 64 * 1024
+
+
+def normalize_sql(sql):
+    """(key, shape) for a statement: comments dropped, whitespace collapsed and
+    keywords/identifiers lowercased outside quotes; shape also masks literals as ?"""
+    key, shape = [], []
+    previous = None
+    gap = False
+    for match in TOKEN_RE.finditer(sql):
+        kind, text = match.lastgroup, match.group()
+        if kind in ('space', 'comment'):
+            gap = True
+            continue
+        if gap and previous not in (None, 'punct') and kind != 'punct':
+            key.append(' ')
+            shape.append(' ')
+        gap = False
+        if kind == 'literal':
+            key.append(text)
+            shape.append('?')
+        else:
+            key.append(text.lower())
+            shape.append(text.lower())
+        previous = kind
+    return ''.join(key).rstrip(';'), ''.join(shape).rstrip(';')
+
+
+def cache_policy(tool, arguments, ttl, schema_ttl, tools=CACHEABLE_TOOLS):
+    """(cache key, ttl) for a tools/call, or None if it must go to the server"""
+    if tool not in tools:
+        return None
+    normalized = dict(arguments or {})
+    shapes = []
+    for name in SQL_ARGUMENTS:
+        if isinstance(normalized.get(name), str):
+            normalized[name], shape = normalize_sql(normalized[name])
+            if not READ_ONLY_RE.match(shape) or WRITE_RE.search(shape) or VOLATILE_RE.search(shape):
+                return None
+            shapes.append(shape)
+    key = (tool, json.dumps(normalized, sort_keys=True, separators=(',', ':')))
+    if not shapes or any(SCHEMA_RE.search(shape) for shape in shapes):
+        return key, schema_ttl
+    return key, ttl
+
+
+class _Flight:
+    """One backend call that identical concurrent calls wait on"""
+    __slots__ = ('event', 'encoded', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.encoded = None
+        self.result = None
+        self.error = None
+
+
+def error_object(e):
+    if isinstance(e, McpError):
+        error = {'code': e.code, 'message': str(e)}
+        if e.data is not None:
+            error['data'] = e.data
+        return error
+    if isinstance(e, TimeoutError):
+        return {'code': -32001, 'message': str(e)}
+    return {'code': -32603, 'message': str(e)}
+
+
+class SqlCacheProxy:
+    def __init__(self, backend, output=None, tools=CACHEABLE_TOOLS, ttl=None, schema_ttl=None,
+                 max_bytes=None, max_entries=None, stream_threshold=None, timeout=None, workers=16):
+        self.backend = backend
+        self.output = output or sys.stdout.buffer
+        self.tools = tuple(tools)
+        self.ttl = ttl or int(os.environ.get('MCP_SQL_CACHE_TTL', '300'))
+        self.schema_ttl = schema_ttl or int(os.environ.get('MCP_SQL_CACHE_SCHEMA_TTL', '3600'))
+        # Results larger than this are streamed through and never held for the cache
+        self.stream_threshold = stream_threshold or int(os.environ.get('MCP_SQL_CACHE_MAX_ENTRY', str(4 * 1024 ** 2)))
+        self.cache = TTLCache(
+            maxsize=max_entries or int(os.environ.get('MCP_SQL_CACHE_ENTRIES', '1024')),
+            ttl=self.ttl,
+            maxbytes=max_bytes or int(os.environ.get('MCP_SQL_CACHE_BYTES', str(64 * 1024 ** 2))),
+        )
+        self.timeout = timeout or float(os.environ.get('MCP_SQL_PROXY_TIMEOUT', '300'))
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sql-proxy')
+        self.stats = {'calls': 0, 'hits': 0, 'misses': 0, 'coalesced': 0, 'uncacheable': 0, 'streamed': 0}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    # Client side
+
+    def serve(self, stream=None):
+        """Read client messages until stdin closes"""
+        for message in read_messages(stream or sys.stdin.buffer):
+            if isinstance(message, dict):
+                self.dispatch(message)
+        self.pool.shutdown(wait=True)
+
+    def dispatch(self, message):
+        method = message.get('method')
+        if method is None:
+            # The client's reply to a request the server made (roots, sampling)
+            self.backend.send(message)
+        elif 'id' not in message:
+            # initialized was already sent when the proxy started the backend; cancellations
+            # name client ids the backend never saw
+            if method not in ('notifications/initialized', 'notifications/cancelled'):
+                self.backend.notify(method, message.get('params'))
+        elif method == 'initialize':
+            self.write_response(message['id'], self.backend.server_info)
+        elif method == 'tools/call':
+            self.pool.submit(self.guarded, self.call_tool, message['id'], message.get('params') or {})
+        else:
+            self.pool.submit(self.guarded, self.forward, message['id'], method, message.get('params'))
+
+    def guarded(self, handler, request_id, *args):
+        try:
+            handler(request_id, *args)
+        except Exception as e:
+            logger.exception(f"Proxy failed handling request {request_id!r}")
+            self.write_message({'jsonrpc': '2.0', 'id': request_id, 'error': error_object(e)})
+
+    def forward(self, request_id, method, params):
+        try:
+            result = self.backend.request(method, params, timeout=self.timeout)
+        except (McpError, TimeoutError, ConnectionError) as e:
+            self.write_message({'jsonrpc': '2.0', 'id': request_id, 'error': error_object(e)})
+            return
+        self.write_response(request_id, result)
+
+    def call_tool(self, request_id, params):
+        with self._lock:
+            self.stats['calls'] += 1
+        policy = cache_policy(params.get('name'), params.get('arguments'), self.ttl, self.schema_ttl, self.tools)
+        if policy is None:
+            with self._lock:
+                self.stats['uncacheable'] += 1
+            self.forward(request_id, 'tools/call', params)
+            return
+        key, ttl = policy
+
+        encoded = self.cache.get(key)
+        if encoded is not None:
+            with self._lock:
+                self.stats['hits'] += 1
+            self.write_response(request_id, encoded=encoded)
+            return
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if leader:
+            try:
+                try:
+                    flight.result = self.backend.request('tools/call', params, timeout=self.timeout)
+                except (McpError, TimeoutError, ConnectionError) as e:
+                    flight.error = error_object(e)
+                    self.write_message({'jsonrpc': '2.0', 'id': request_id, 'error': flight.error})
+                else:
+                    flight.encoded = self.write_response(request_id, flight.result, keep=self.stream_threshold)
+                    # Tool errors (isError) are answers too, but not ones worth repeating
+                    if flight.encoded is not None and not (flight.result or {}).get('isError'):
+                        self.cache.put(key, flight.encoded, ttl)
+                        flight.result = None
+            finally:
+                # Only now, so a repeat arriving while the answer is written still coalesces
+                with self._lock:
+                    self._inflight.pop(key, None)
+                flight.event.set()
+            return
+
+        flight.event.wait()
+        if flight.error is not None:
+            self.write_message({'jsonrpc': '2.0', 'id': request_id, 'error': flight.error})
+        elif flight.encoded is not None:
+            self.write_response(request_id, encoded=flight.encoded)
+        else:
+            self.write_response(request_id, flight.result)
+
+    # Output
+
+    def write_message(self, message):
+        body = encode_body(message)
+        with self._write_lock:
+            self.output.write(body)
+            self.output.write(b'\n')
+            self.output.flush()
+
+    def write_response(self, request_id, result=None, encoded=None, keep=0):
+        """Write a result response, encoding it in chunks as it goes out.
+
+        Returns the encoded result when it is at most `keep` bytes (for the
+        cache); larger results are streamed without being held in full.
+        """
+        head = b'{"jsonrpc":"2.0","id":' + json.dumps(request_id).encode('utf-8') + b',"result":'
+        with self._write_lock:
+            self.output.write(head)
+            if encoded is not None:
+                self.output.write(encoded)
+            else:
+                kept, size, pending, pending_size = [], 0, [], 0
+                for piece in ENCODER.iterencode(result):
+                    data = piece.encode('utf-8')
+                    pending.append(data)
+                    pending_size += len(data)
+                    if pending_size < WRITE_CHUNK:
+                        continue
+                    block = b''.join(pending)
+                    self.output.write(block)
+                    pending, pending_size = [], 0
+                    if kept is not None:
+                        size += len(block)
+                        if size <= keep:
+                            kept.append(block)
+                        else:
+                            kept = None
+                block = b''.join(pending)
+                self.output.write(block)
+                if kept is not None and size + len(block) <= keep:
+                    encoded = b''.join(kept) + block
+                elif keep:
+                    with self._lock:
+                        self.stats['streamed'] += 1
+            self.output.write(b'}\n')
+            self.output.flush()
+        return encoded
+
+    # Server side
+
+    def on_backend_message(self, message):
+        """Server notifications and requests go to the client unchanged"""
+        self.write_message(message)
+
+    def log_stats(self):
+        stats = self.stats
+        logger.info(
+            f"SQL cache proxy for {self.backend.name}: {stats['calls']} tool calls, {stats['hits']} cache hits, "
+            f"{stats['coalesced']} coalesced, {stats['misses']} misses, {stats['uncacheable']} uncacheable, "
+            f"{stats['streamed']} streamed; cache holds {len(self.cache)} results, {self.cache.nbytes} bytes, "
+            f"{self.cache.evictions} evictions"
+        )
+
+
+def backend_name(command):
+    """Label for the backend in logs: the compose service or script it runs, else the program"""
+    for arg in command:
+        if arg.startswith('-'):
+            continue
+        base = os.path.basename(arg)
+        if base.endswith(SCRIPT_SUFFIXES):
+            return os.path.splitext(base)[0]
+        if base.startswith('mcp-'):
+            return base
+    return os.path.basename(command[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Caching MCP proxy for read-only SQL servers',
+        usage='%(prog)s [options] -- <server command>'
+    )
+    parser.add_argument('--name', help='backend label in logs (default: the compose service or script in the command)')
+    parser.add_argument('--tools', default=','.join(CACHEABLE_TOOLS), help='comma-separated cacheable tools')
+    parser.add_argument('--ttl', type=int, help='seconds to keep query results (MCP_SQL_CACHE_TTL, 300)')
+    parser.add_argument('--schema-ttl', type=int, help='seconds to keep catalog results (MCP_SQL_CACHE_SCHEMA_TTL, 3600)')
+    parser.add_argument('--max-bytes', type=int, help='cache size in bytes (MCP_SQL_CACHE_BYTES, 64 MiB)')
+    parser.add_argument('--max-entries', type=int, help='cache entries (MCP_SQL_CACHE_ENTRIES, 1024)')
+    parser.add_argument('--stream-threshold', type=int, help='stream uncached above this many bytes (MCP_SQL_CACHE_MAX_ENTRY, 4 MiB)')
+    parser.add_argument('--timeout', type=float, help='backend call timeout in seconds (MCP_SQL_PROXY_TIMEOUT, 300)')
+    parser.add_argument('command', nargs=argparse.REMAINDER, help='backend MCP server command')
+    args = parser.parse_args()
+
+    command = args.command[1:] if args.command[:1] == ['--'] else args.command
+    if not command:
+        parser.error('a backend server command is required after --')
+
+    # stdout carries the protocol; logs go to stderr
+    logging.basicConfig(level=os.environ.get('MCP_SQL_PROXY_LOG_LEVEL', 'INFO'), stream=sys.stderr,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+
+    proxy = None
+    backend = StdioSession(command, name=args.name or backend_name(command),
+                           on_message=lambda message: proxy.on_backend_message(message))
+    proxy = SqlCacheProxy(
+        backend, tools=[t for t in args.tools.split(',') if t], ttl=args.ttl, schema_ttl=args.schema_ttl,
+        max_bytes=args.max_bytes, max_entries=args.max_entries, stream_threshold=args.stream_threshold,
+        timeout=args.timeout,
+    )
+    backend.start()
+    try:
+        backend.initialize(client_name='sql-cache-proxy', timeout=proxy.timeout)
+        proxy.serve()
+    finally:
+        proxy.log_stats()
+        backend.close()
+
+
+if __name__ == '__main__':
+    main()
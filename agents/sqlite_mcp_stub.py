@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+SQLite MCP Stub Server
+Minimal stdio MCP server that offers the sage_mssql tools (query, list_tables,
+describe_table) on top of SQLite. It has an INFORMATION_SCHEMA and an optional
+per-query delay, so sql_cache_proxy.py can be exercised without a real database:
+
+    python3 agents/sql_cache_proxy.py -- python3 agents/sqlite_mcp_stub.py --tables 400
+
+The `stats` tool reports how many queries actually reached the database.
+"""
+
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import threading
+
+from jsonrpc_framing import read_messages, write_message
+
+PROTOCOL_VERSION = '2024-11-05'
+
+TOOLS = [
+    {
+        'name': 'query',
+        'description': 'Run a read-only SQL query against the database',
+        'inputSchema': {'type': 'object', 'properties': {'sql': {'type': 'string'}}, 'required': ['sql']},
+    },
+    {
+        'name': 'list_tables',
+        'description': 'List all tables in the database',
+        'inputSchema': {'type': 'object', 'properties': {}},
+    },
+    {
+        'name': 'describe_table',
+        'description': 'Get the schema information for a specific table',
+        'inputSchema': {'type': 'object', 'properties': {'table_name': {'type': 'string'}}, 'required': ['table_name']},
+    },
+    {
+        'name': 'stats',
+        'description': 'Queries executed by this stub',
+        'inputSchema': {'type': 'object', 'properties': {}},
+    },
+]
+
+LIST_TABLES_SQL = """
+    SELECT TABLE_SCHEMA, TABLE_NAME, TABLE_TYPE
+    FROM INFORMATION_SCHEMA.TABLES
+    WHERE TABLE_TYPE = 'BASE TABLE'
+    ORDER BY TABLE_SCHEMA, TABLE_NAME
+"""
+
+DESCRIBE_TABLE_SQL = """
+    SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, ORDINAL_POSITION
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_NAME = ?
+    ORDER BY ORDINAL_POSITION
+"""
+
+
+def open_database(path=':memory:', tables=40, rows=200):
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.row_factory = sqlite3.Row
+    if path == ':memory:':
+        # Sage-like layout: a couple of wide business tables plus many small ones
+        db.execute("CREATE TABLE SLCustomerAccount (SLCustomerAccountID INTEGER PRIMARY KEY, "
+                   "CustomerAccountNumber TEXT, CustomerAccountName TEXT, CreditLimit REAL, AccountIsOnHold INTEGER)")
+        db.executemany("INSERT INTO SLCustomerAccount VALUES (?, ?, ?, ?, ?)",
+                       [(i, f"CUST{i:04d}", f"Customer {i}", 1000.0 * (i % 20), i % 11 == 0) for i in range(1, rows + 1)])
+        db.execute("CREATE TABLE StockItem (ItemID INTEGER PRIMARY KEY, Code TEXT, Name TEXT, "
+                   "FreeStockQuantity REAL, ProductGroupID INTEGER)")
+        db.executemany("INSERT INTO StockItem VALUES (?, ?, ?, ?, ?)",
+                       [(i, f"PAINT{i:05d}", f"Paint {i}", float(i * 7 % 500), i % 12) for i in range(1, rows + 1)])
+        for n in range(max(0, tables - 2)):
+            db.execute(f"CREATE TABLE SysTable{n:03d} (ID INTEGER PRIMARY KEY, Name TEXT, Value TEXT)")
+
+    # A static INFORMATION_SCHEMA snapshot, as SQLite has none of its own
+    db.execute("ATTACH DATABASE ':memory:' AS INFORMATION_SCHEMA")
+    db.execute("CREATE TABLE INFORMATION_SCHEMA.TABLES (TABLE_CATALOG TEXT, TABLE_SCHEMA TEXT, TABLE_NAME TEXT, TABLE_TYPE TEXT)")
+    db.execute("CREATE TABLE INFORMATION_SCHEMA.COLUMNS (TABLE_SCHEMA TEXT, TABLE_NAME TEXT, COLUMN_NAME TEXT, "
+               "DATA_TYPE TEXT, IS_NULLABLE TEXT, ORDINAL_POSITION INTEGER)")
+    names = [row[0] for row in db.execute("SELECT name FROM main.sqlite_master WHERE type = 'table'")]
+    for name in names:
+        db.execute("INSERT INTO INFORMATION_SCHEMA.TABLES VALUES ('main', 'dbo', ?, 'BASE TABLE')", (name,))
+        for column in db.execute(f'PRAGMA main.table_info("{name}")'):
+            db.execute("INSERT INTO INFORMATION_SCHEMA.COLUMNS VALUES ('dbo', ?, ?, ?, ?, ?)",
+                       (name, column['name'], column['type'] or 'TEXT', 'NO' if column['notnull'] else 'YES', column['cid'] + 1))
+    db.commit()
+    return db
+
+
+class StubServer:
+    def __init__(self, db, delay=0.0, output=None):
+        self.db = db
+        self.delay = delay
+        self.output = output or sys.stdout.buffer
+        self.queries = 0
+        self._db_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def run_query(self, sql, params=()):
+        # The delay stands in for network and server time, so it overlaps across calls
+        time.sleep(self.delay)
+        with self._db_lock:
+            self.queries += 1
+            return [dict(row) for row in self.db.execute(sql, params)]
+
+    def call_tool(self, name, arguments):
+        if name == 'query':
+            sql = arguments.get('sql', '')
+            if not sql.strip().upper().startswith(('SELECT', 'WITH')):
+                raise ValueError('Only SELECT queries are allowed')
+            rows = self.run_query(sql)
+        elif name == 'list_tables':
+            rows = self.run_query(LIST_TABLES_SQL)
+        elif name == 'describe_table':
+            rows = self.run_query(DESCRIBE_TABLE_SQL, (arguments.get('table_name'),))
+        elif name == 'stats':
+            rows = {'queries': self.queries}
+        else:
+            raise ValueError(f"Unknown tool: {name}")
+        return {'content': [{'type': 'text', 'text': json.dumps(rows, indent=2)}]}
+
+    def handle(self, message):
+        method, request_id = message.get('method'), message.get('id')
+        try:
+            if method == 'initialize':
+                result = {'protocolVersion': PROTOCOL_VERSION, 'capabilities': {'tools': {}},
+                          'serverInfo': {'name': 'sqlite-mcp-stub', 'version': '1.0.0'}}
+            elif method == 'tools/list':
+                result = {'tools': TOOLS}
+            elif method == 'tools/call':
+                params = message.get('params') or {}
+                try:
+                    result = self.call_tool(params.get('name'), params.get('arguments') or {})
+                except (ValueError, sqlite3.Error) as e:
+                    result = {'content': [{'type': 'text', 'text': f"Error: {e}"}], 'isError': True}
+            elif method == 'ping':
+                result = {}
+            else:
+                self.write({'jsonrpc': '2.0', 'id': request_id,
+                            'error': {'code': -32601, 'message': f"Method not found: {method}"}})
+                return
+        except Exception as e:
+            self.write({'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32603, 'message': str(e)}})
+            return
+        self.write({'jsonrpc': '2.0', 'id': request_id, 'result': result})
+
+    def write(self, message):
+        with self._write_lock:
+            write_message(self.output, message)
+            self.output.flush()
+
+    def serve(self):
+        threads = []
+        for message in read_messages(sys.stdin.buffer):
+            if not isinstance(message, dict) or 'id' not in message or 'method' not in message:
+                continue  # notifications and replies need no answer
+            thread = threading.Thread(target=self.handle, args=(message,), daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite-backed stand-in for the read-only SQL MCP servers')
+    parser.add_argument('--db', default=':memory:', help='SQLite database file (default: seeded in-memory demo)')
+    parser.add_argument('--tables', type=int, default=40, help='tables in the demo database')
+    parser.add_argument('--rows', type=int, default=200, help='rows per demo business table')
+    parser.add_argument('--delay', type=float, default=0.0, help='seconds added to every query')
+    args = parser.parse_args()
+
+    server = StubServer(open_database(args.db, args.tables, args.rows), args.delay)
+    server.serve()
+    print(f"sqlite-mcp-stub: {server.queries} queries executed", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""In-memory stand-ins for the parts of PyGithub the coordinators use"""
+
+from datetime import datetime, timezone
+
+
+class Label:
+    def __init__(self, name):
+        self.name = name
+
+
+class Comment:
+    def __init__(self, id, body, created_at=None, updated_at=None):
+        self.id = id
+        self.body = body
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.updated_at = updated_at or self.created_at
+        self.html_url = f"https://github.example/comment/{id}"
+
+
+class Issue:
+    def __init__(self, number, title, body='', labels=(), state='open', created_at=None, comments=()):
+        self.number = number
+        self.title = title
+        self.body = body
+        self.labels = [Label(name) for name in labels]
+        self.state = state
+        self.pull_request = None
+        self.created_at = created_at or datetime.now(timezone.utc)
+        self.updated_at = self.created_at
+        self.html_url = f"https://github.example/issues/{number}"
+        self.comments = list(comments)
+        self.posted = []
+
+    def get_comments(self):
+        return list(self.comments)
+
+    def create_comment(self, body):
+        self.posted.append(body)
+        self.comments.append(Comment(1000 + len(self.posted), body))
+
+    def add_to_labels(self, name):
+        self.labels.append(Label(name))
+
+
+class Listing(list):
+    """A PaginatedList: iterable, and fetched page by page"""
+
+    def __init__(self, items, per_page):
+        super().__init__(items)
+        self.per_page = per_page
+
+    def get_page(self, page):
+        return self[page * self.per_page:(page + 1) * self.per_page]
+
+
+class Repo:
+    def __init__(self, name, issues, per_page=3):
+        self.full_name = name
+        self.issues = list(issues)
+        self.per_page = per_page
+
+    def get_issues(self, state='open', **kwargs):
+        return Listing([i for i in self.issues if state == 'all' or i.state == state], self.per_page)
+
+
+class Reader:
+    per_page = 3
+
+
+class Tokens:
+    def __init__(self, reader=None):
+        self.primary = reader or Reader()
+
+    def reader(self, repo_name):
+        return self.primary
+
+    def log_report(self):
+        pass
+
+
+class Cache:
+    def __init__(self, repos):
+        self.repos = {repo.full_name: repo for repo in repos}
+
+    def get_repo(self, reader, repo_name):
+        return self.repos[repo_name]
+
+    def get_issue(self, client, repo_name, number):
+        return next(i for i in self.repos[repo_name].issues if i.number == number)
+
+
+def attach(coordinator, repos, reader=None):
+    """Point an offline coordinator at fake repos"""
+    reader = reader or Reader()
+    coordinator.g = reader
+    coordinator.tokens = Tokens(reader)
+    coordinator.cache = Cache(repos)
+    coordinator.repos_to_monitor = [repo.full_name for repo in repos]
+    return coordinator
@@ -0,0 +1,87 @@
+import json
+import math
+import shutil
+
+import pytest
+
+from capacity_planner import (
+    ODOO_MCP_CONFIG,
+    CapacityPlanner,
+    config_diff,
+    erlang_c,
+    mmc_wait,
+    observed_rates,
+    size_pool,
+)
+from coordinator_state import StateStore
+
+AGENT_USAGE = {'odoo-agent': ['odoo_mcp', 'github']}
+AGENT_LOAD = {'odoo-agent': {'mean_rpm': 10, 'peak_rpm': 60, 'weights': {'odoo_mcp': 1, 'github': 1}}}
+LATENCY = {'mcp-odoo-mcp': {'mean_ms': 400}, 'mcp-github': {'mean_ms': 300}}
+
+
+def compose_service(server):
+    return 'mcp-' + server.replace('_', '-')
+
+
+def test_erlang_c_matches_closed_form():
+    # c=2, a=1: P(wait) = (a^2/2! * c/(c-a)) / (1 + a + a^2/2! * c/(c-a)) = 1/3
+    assert erlang_c(2, 1.0) == pytest.approx(1 / 3)
+    assert erlang_c(1, 0.5) == pytest.approx(0.5)
+    assert erlang_c(4, 0) == 0.0
+    assert erlang_c(2, 2.0) == 1.0
+
+
+def test_mm1_wait_is_rho_over_mu_minus_lambda():
+    arrival_rate, service_time = 2.0, 0.25
+    mu = 1 / service_time
+    assert mmc_wait(1, arrival_rate, service_time) == pytest.approx((arrival_rate / mu) / (mu - arrival_rate))
+    assert mmc_wait(1, mu, service_time) == math.inf
+
+
+def test_size_pool_meets_utilisation_and_wait_targets():
+    arrival_rate, service_time = 10.0, 0.4
+    pool = size_pool(arrival_rate, service_time)
+    assert arrival_rate * service_time / pool <= 0.7
+    assert mmc_wait(pool, arrival_rate, service_time) <= 0.25 * service_time
+    smaller = pool - 1
+    assert (arrival_rate * service_time / smaller > 0.7
+            or mmc_wait(smaller, arrival_rate, service_time) > 0.25 * service_time)
+
+
+def test_observed_rates_override_the_fixture_estimate():
+    store = StateStore(':memory:')
+    start = 1_000_000 * 60
+    for minute, calls in enumerate([3, 9, 0, 0]):
+        for _ in range(calls):
+            store.count_service_call('mcp-odoo-mcp', start + minute * 60 + 5)
+
+    observed = observed_rates(store, now=start + 3 * 60 + 30)
+    assert observed == {'mcp-odoo-mcp': (3.0, 9.0)}
+
+    planner = CapacityPlanner(AGENT_USAGE, compose_service, AGENT_LOAD, LATENCY, observed=observed)
+    plans = {row['server']: row for row in planner.plan()}
+    assert plans['odoo_mcp']['rate_source'] == 'observed'
+    assert plans['odoo_mcp']['peak_rpm'] == 9.0
+    # Servers the gateway never saw keep the per-agent estimate
+    assert plans['github']['rate_source'] == 'estimated'
+    assert plans['github']['peak_rpm'] == 30.0
+
+
+def test_config_diff_updates_pool_size_and_rate_limit(tmp_path):
+    path = tmp_path / 'config.json'
+    shutil.copy(ODOO_MCP_CONFIG, path)
+    planner = CapacityPlanner(AGENT_USAGE, compose_service, AGENT_LOAD, LATENCY,
+                              observed={'mcp-odoo-mcp': (20.0, 240.0)})
+    plans = planner.plan()
+    row = next(p for p in plans if p['server'] == 'odoo_mcp')
+
+    diff, proposed = config_diff(plans, path)
+    assert f'+  "pool_size": {row["pool_size"]},' in diff
+    assert f'+  "requests_per_minute": {row["requests_per_minute"]},' in diff
+    config = json.loads(proposed)
+    assert config['pool_size'] == row['pool_size']
+    assert config['database'] == '${ODOO_DB}'
+    assert path.read_text() == open(ODOO_MCP_CONFIG).read()
+
+    assert config_diff([p for p in plans if p['server'] != 'odoo_mcp'], path)[0] == ''
@@ -0,0 +1,34 @@
+import io
+import os
+from collections import Counter
+
+import pytest
+
+from classify_corpus import classify_stream, format_report, read_chunks
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'issues_labelled.jsonl')
+
+
+def test_read_chunks_skips_malformed_lines():
+    stream = io.StringIO('{"title": "a"}\n\nnot json\n[1, 2]\n{"title": "b"}\n{"title": "c"}\n')
+    stats = Counter()
+    chunks = list(read_chunks(stream, 2, stats))
+    assert [[record['title'] for record in chunk] for chunk in chunks] == [['a', 'b'], ['c']]
+    assert stats['malformed'] == 2
+
+
+def test_pool_agrees_with_the_labelled_fixture(tmp_path, monkeypatch):
+    pytest.importorskip('scipy')
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    with open(FIXTURE) as f:
+        expected = sum(1 for line in f if line.strip())
+
+    with open(FIXTURE) as f:
+        results = classify_stream(f, workers=2, chunk_size=3, label_field='route')
+
+    assert results['records'] == expected and results['malformed'] == 0
+    assert sum(results['routes'].values()) == expected
+    assert results['routes']['not_mcp'] == 2
+    # Every record lands on the diagonal, whichever worker classified it
+    assert all(key.split('\t')[0] == key.split('\t')[1] for key in results['confusion'])
+    assert f"Agreement with labels: {expected}/{expected} (100.0%)" in format_report(results)
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from container_prewarm import Prewarmer
+from coordinator_state import StateStore
+
+NOW = 1_800_000_000.0
+WINDOW = 1800
+
+
+class FakeDocker:
+    """Runner answering `docker compose ps` and `docker events` from canned data"""
+
+    def __init__(self, project_containers=(), starts=None):
+        self.project_containers = list(project_containers)
+        self.starts = starts or {}  # service: [start times of one-off containers]
+        self.calls = []
+
+    def __call__(self, args):
+        self.calls.append(args)
+        if args[0] == 'compose':
+            return ''.join(f"{container}\n" for container in self.project_containers)
+        since, until = float(args[args.index('--since') + 1]), float(args[args.index('--until') + 1])
+        service = next(a.rsplit('=', 1)[1] for a in args if a.startswith('label=com.docker.compose.service='))
+        return ''.join(json.dumps({'status': 'start', 'time': t}) + "\n"
+                       for t in self.starts.get(service, []) if since <= t < until)
+
+
+def prewarmer(runner, **kwargs):
+    return Prewarmer(store=StateStore(':memory:'), runner=runner, handshake=kwargs.pop('handshake', lambda s: 0.1),
+                     compose_dir='/srv/mcp', window=WINDOW, cooldown=900, **kwargs)
+
+
+def test_enabled_prewarm_runs_the_handshake_once_per_cooldown():
+    warmed = []
+    p = prewarmer(FakeDocker(), enabled=True, handshake=lambda service: warmed.append(service) or 0.5)
+    p.prewarm('odoo-agent', ['mcp-odoo17', 'mcp-odoo17', 'mcp-odoo16'])
+    p.pool.shutdown(wait=True)
+    assert sorted(warmed) == ['mcp-odoo16', 'mcp-odoo17']
+
+    again = prewarmer(FakeDocker(), enabled=True, handshake=lambda service: warmed.append(service) or 0.5)
+    again.store = p.store
+    again.prewarm('odoo-agent', ['mcp-odoo17'])  # within the cooldown
+    again.pool.shutdown(wait=True)
+    assert len(warmed) == 2
+
+
+def test_disabled_prewarm_only_records_the_decision():
+    p = prewarmer(FakeDocker(), enabled=False, handshake=lambda service: pytest.fail('started a server'))
+    p.prewarm('odoo-agent', ['mcp-odoo17'], now=NOW)
+    assert p.store.last_prewarm('mcp-odoo17') == NOW
+
+
+def test_decisions_are_not_resolved_off_the_mcp_host():
+    # A hosted runner: docker works, but the compose project has no containers there
+    docker = FakeDocker(project_containers=[])
+    p = prewarmer(docker, enabled=False)
+    p.prewarm('odoo-agent', ['mcp-odoo17'], now=NOW)
+    p.evaluate(now=NOW + WINDOW + 1)
+
+    assert not any(args[0] == 'events' for args in docker.calls)
+    assert len(p.store.unresolved_prewarms(NOW + WINDOW + 1)) == 1
+    assert p.store.prewarm_hit_rates(0) == {}
+
+
+def test_hits_and_misses_on_the_mcp_host():
+    docker = FakeDocker(project_containers=['c0ffee'],
+                        starts={'mcp-odoo17': [NOW + 300], 'mcp-odoo16': [NOW + WINDOW + 60]})
+    p = prewarmer(docker, enabled=False)
+    p.prewarm('odoo-agent', ['mcp-odoo17', 'mcp-odoo16'], now=NOW)
+    p.evaluate(now=NOW + WINDOW + 1)
+
+    # odoo16 was started, but only after the hit window
+    assert p.store.prewarm_hit_rates(0) == {'odoo-agent': (1, 2)}
+    assert p.store.unresolved_prewarms(NOW + WINDOW + 1) == []
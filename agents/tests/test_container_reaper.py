@@ -0,0 +1,95 @@
+import pytest
+
+from container_reaper import DEFAULT_ALWAYS_WARM, FakeRuntime, IdleReaper
+from coordinator_state import StateStore
+
+HOUR = 3600
+NOW = 1_800_000_000.0
+
+
+@pytest.fixture
+def store():
+    store = StateStore(':memory:')
+    yield store
+    store.close()
+
+
+def reaper(store, runtime, **kwargs):
+    return IdleReaper(runtime, store, always_warm=kwargs.pop('always_warm', DEFAULT_ALWAYS_WARM),
+                      idle=kwargs.pop('idle', 6 * HOUR), overrides=kwargs.pop('overrides', {'mcp-puppeteer': 1800}))
+
+
+def test_stops_services_idle_beyond_timeout(store):
+    runtime = FakeRuntime(running=DEFAULT_ALWAYS_WARM + ['mcp-odoo17', 'mcp-excel'])
+    store.touch_service('mcp-odoo17', NOW - 7 * HOUR)
+    store.touch_service('mcp-excel', NOW - 5 * HOUR)
+
+    stopped, started = reaper(store, runtime).reap(NOW)
+
+    assert stopped == ['mcp-odoo17']
+    assert started == []
+    assert runtime.running() == set(DEFAULT_ALWAYS_WARM + ['mcp-excel'])
+
+
+def test_puppeteer_override_is_shorter(store):
+    runtime = FakeRuntime(running=DEFAULT_ALWAYS_WARM + ['mcp-puppeteer', 'mcp-odoo17'])
+    store.touch_service('mcp-puppeteer', NOW - 1801)
+    store.touch_service('mcp-odoo17', NOW - 1801)
+
+    stopped, _ = reaper(store, runtime).reap(NOW)
+
+    assert stopped == ['mcp-puppeteer']
+
+    store.touch_service('mcp-puppeteer', NOW - 1000)
+    runtime.start('mcp-puppeteer')
+    assert reaper(store, runtime).reap(NOW)[0] == []
+
+
+def test_always_warm_never_stopped_and_restarted(store):
+    runtime = FakeRuntime(running=['mcp-github'])
+    store.touch_service('mcp-github', NOW - 100 * HOUR)
+
+    stopped, started = reaper(store, runtime).reap(NOW)
+
+    assert stopped == []
+    assert started == ['mcp-filesystem']
+    assert runtime.running() == set(DEFAULT_ALWAYS_WARM)
+    assert ('stop', 'mcp-github') not in runtime.actions
+
+
+def test_docker_events_count_as_use(store):
+    runtime = FakeRuntime(running=DEFAULT_ALWAYS_WARM + ['mcp-odoo17'],
+                          starts=[('mcp-odoo17', NOW - HOUR)])
+    store.touch_service('mcp-odoo17', NOW - 10 * HOUR)
+    store.set_meta('reaper:events_checked_at', NOW - 2 * HOUR)
+
+    stopped, _ = reaper(store, runtime).reap(NOW)
+
+    assert stopped == []
+    assert store.last_used('mcp-odoo17') == NOW - HOUR
+    assert float(store.get_meta('reaper:events_checked_at')) == NOW
+
+
+def test_first_sighting_starts_idle_clock(store):
+    runtime = FakeRuntime(running=DEFAULT_ALWAYS_WARM + ['mcp-odoo17'])
+
+    assert reaper(store, runtime).reap(NOW)[0] == []
+    assert store.last_used('mcp-odoo17') == NOW
+    assert reaper(store, runtime).reap(NOW + 6 * HOUR)[0] == ['mcp-odoo17']
+
+
+def test_dry_run_writes_nothing(store):
+    runtime = FakeRuntime(running=['mcp-github', 'mcp-odoo17', 'mcp-excel', 'mcp-duckduckgo'],
+                          starts=[('mcp-excel', NOW - HOUR)])
+    store.touch_service('mcp-odoo17', NOW - 7 * HOUR)
+    store.touch_service('mcp-excel', NOW - 7 * HOUR)
+
+    stopped, started = reaper(store, runtime).reap(NOW, dry_run=True)
+
+    # The event still counts for the decision, it just isn't stored
+    assert stopped == ['mcp-odoo17']
+    assert started == ['mcp-filesystem']
+    assert runtime.actions == []
+    assert store.last_used('mcp-excel') == NOW - 7 * HOUR
+    assert store.last_used('mcp-duckduckgo') is None
+    assert store.get_meta('reaper:events_checked_at') is None
@@ -0,0 +1,93 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from container_telemetry import ContainerTelemetry, TimeSeries, fixture_runner
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+MIB = 1024 ** 2
+START = 1_800_000_000.0
+
+
+@pytest.fixture
+def inspect_file(tmp_path):
+    path = tmp_path / 'docker_inspect.json'
+    shutil.copy(os.path.join(FIXTURES, 'docker_inspect.json'), path)
+    return path
+
+
+@pytest.fixture
+def telemetry(tmp_path, inspect_file):
+    runner = fixture_runner(os.path.join(FIXTURES, 'docker_stats.jsonl'), str(inspect_file))
+    return ContainerTelemetry(path=str(tmp_path / 'telemetry.json'), runner=runner)
+
+
+def set_restarts(inspect_file, name, count):
+    containers = json.loads(inspect_file.read_text())
+    for container in containers:
+        if container['Name'] == f"/{name}":
+            container['RestartCount'] = count
+    inspect_file.write_text(json.dumps(containers))
+
+
+def test_ranking_from_captured_docker_output(telemetry):
+    telemetry.sample(START)
+
+    by_mem = telemetry.ranking('mem_bytes', now=START)
+    assert [name for name, _ in by_mem[:3]] == ['mcp-puppeteer', 'mcp-odoo-mcp', 'mcp-sage-mssql']
+    assert by_mem[0][1] == pytest.approx(612.4 * MIB)
+    assert len(by_mem) == 17
+    assert telemetry.ranking('cpu_percent', now=START)[0] == ('mcp-puppeteer', pytest.approx(23.41))
+    assert telemetry.status['mcp-odoo-mcp'] == 'running'
+
+
+def test_window_reaches_past_raw_samples_through_the_rollup(telemetry):
+    # 400 samples 10s apart: the 360-sample raw ring keeps the last hour,
+    # every 12 samples also add one averaged point to the rollup ring
+    for i in range(400):
+        telemetry.sample(START + 10 * i)
+    now = START + 3990
+    series = telemetry.series['mcp-github']['mem_bytes']
+
+    assert len(series.raw) == 360 and series.raw.items()[0][0] == START + 400
+    assert len(series.rollup) == 33
+
+    hour = series.window(3600, now)
+    assert len(hour) == 360 and hour[0][0] == START + 400
+    two_hours = series.window(7200, now)
+    assert [t for t, _ in two_hours[:4]] == [START + 110, START + 230, START + 350, START + 400]
+    assert two_hours[0][1] == pytest.approx(49.0 * MIB)
+
+
+def test_rollup_holds_the_mean_of_each_bucket():
+    series = TimeSeries(raw_capacity=2, rollup_capacity=3, rollup_every=2)
+    for t, value in enumerate([1, 3, 5, 7, 9, 11, 13, 15]):
+        series.add(t, value)
+
+    assert series.rollup.items() == [(3, 6.0), (5, 10.0), (7, 14.0)]
+    assert series.window(4, now=7) == [(3, 6.0), (5, 10.0), (6, 13), (7, 15)]
+
+
+def test_restarts_in_window(telemetry, inspect_file):
+    telemetry.sample(START)
+    set_restarts(inspect_file, 'mcp-odoo-mcp', 5)
+    telemetry.sample(START + 3600)
+    set_restarts(inspect_file, 'mcp-odoo-mcp', 6)
+    telemetry.sample(START + 7200)
+
+    assert telemetry.restarts_in_window('mcp-odoo-mcp', window=86400, now=START + 7200) == 3
+    assert telemetry.restarts_in_window('mcp-odoo-mcp', window=3600, now=START + 7200) == 1
+    assert telemetry.restarts_in_window('mcp-puppeteer', window=86400, now=START + 7200) == 0
+    assert telemetry.restarts_in_window('mcp-odoo-mcp', window=60, now=START + 7200) == 0
+
+
+def test_series_survive_save_and_load(telemetry, tmp_path):
+    for i in range(13):
+        telemetry.sample(START + 10 * i)
+    telemetry.save()
+
+    loaded = ContainerTelemetry(path=telemetry.path, runner=telemetry.runner)
+    assert loaded.ranking('mem_bytes', now=START + 120) == telemetry.ranking('mem_bytes', now=START + 120)
+    assert len(loaded.series['mcp-excel']['cpu_percent'].rollup) == 1
@@ -0,0 +1,80 @@
+import pytest
+
+from content_hashes import ContentHashes
+from coordinator_state import StateStore
+from github_fakes import Issue, Repo, attach
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+from work_queue import WorkQueue
+
+REPO = 'org/ops'
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path / 'kb'))
+    coordinator = MCPServerCoordinatorEnhanced(offline=True)
+    coordinator.content = ContentHashes(StateStore(str(tmp_path / 'state.db')))
+    yield coordinator
+    coordinator.content.close()
+
+
+def run(coordinator):
+    queue = WorkQueue([REPO], deadline=0)
+    coordinator.queue_repo_work(queue, REPO)
+    queue.drain()
+    return queue
+
+
+def test_previous_reports_unchanged_text_and_its_route():
+    hashes = ContentHashes(StateStore(':memory:'))
+    assert hashes.previous('issue:org/ops#1', 'text') == (False, None)
+
+    hashes.record('issue:org/ops#1', 'text', 'handle_setup_request', 'answered')
+    assert hashes.recorded('issue:org/ops#1', 'text')
+    assert hashes.stats['unchanged'] == 0
+    assert hashes.previous('issue:org/ops#1', 'text') == (True, 'handle_setup_request')
+    assert hashes.previous('issue:org/ops#1', 'edited text') == (False, 'handle_setup_request')
+    assert hashes.stats == {'answered': 1, 'unchanged': 1}
+
+
+def test_unchanged_text_is_skipped_without_classifying(coordinator):
+    issue = Issue(1, 'Which MCP servers are available?', 'Please list the MCP servers I can use')
+    attach(coordinator, [Repo(REPO, [issue])])
+    run(coordinator)
+    assert len(issue.posted) == 1
+
+    classify = coordinator.classify_text
+    coordinator.classify_text = lambda text: pytest.fail('unchanged text was classified')
+    queue = run(coordinator)
+    coordinator.classify_text = classify
+    assert len(queue) == 0 and len(issue.posted) == 1
+    assert coordinator.content.stats['unchanged'] == 1
+
+
+def test_edit_keeping_the_route_is_recorded_not_answered(coordinator):
+    issue = Issue(1, 'Which MCP servers are available?', 'Please list the MCP servers I can use')
+    attach(coordinator, [Repo(REPO, [issue])])
+    run(coordinator)
+    route = coordinator.content.store.content_record(f'issue:{REPO}#1')[1]
+
+    issue.title = 'Which MCP servers are availble?'
+    run(coordinator)
+    assert len(issue.posted) == 1
+    assert coordinator.content.stats['same_route'] == 1
+    assert coordinator.content.recorded(f'issue:{REPO}#1', f"{issue.title} {issue.body}")
+    assert coordinator.content.store.content_record(f'issue:{REPO}#1')[1] == route
+
+
+def test_edit_that_changes_the_route_is_answered_again(coordinator):
+    issue = Issue(1, 'Which MCP servers are available?', 'Please list the MCP servers I can use')
+    attach(coordinator, [Repo(REPO, [issue])])
+    run(coordinator)
+    before = coordinator.content.store.content_record(f'issue:{REPO}#1')[1]
+
+    issue.title = 'odoo17 MCP server returns permission denied'
+    issue.body = 'search_read fails with access denied for the odoo17 MCP server'
+    run(coordinator)
+    after = coordinator.content.store.content_record(f'issue:{REPO}#1')[1]
+    assert after != before
+    assert len(issue.posted) == 2
+    assert coordinator.content.stats['answered'] == 2
@@ -0,0 +1,107 @@
+import pytest
+
+from content_hashes import ContentHashes
+from coordinator_backfill import NOT_MCP, Backfill
+from coordinator_state import StateStore
+from github_fakes import Issue, Repo, attach
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+from work_queue import WorkQueue
+
+REPO = 'org/ops'
+
+
+def history():
+    return [
+        Issue(1, 'odoo17 MCP server returns permission denied', labels=['mcp-responded'], state='closed'),
+        Issue(2, 'Update README typo'),
+        Issue(3, 'MCP server setup for github', labels=['mcp-responded']),
+        Issue(4, 'Fix CSS on the landing page', state='closed'),
+        Issue(5, 'odoo17 MCP server returns permission denied again'),
+        Issue(6, 'MCP server setup for github please', labels=['mcp-responded']),
+        Issue(7, 'Update the changelog'),
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path / 'kb'))
+    return MCPServerCoordinatorEnhanced(offline=True)
+
+
+def classified(coordinator):
+    """Count classify_text calls per text"""
+    calls = []
+    original = coordinator.classify_text
+    coordinator.classify_text = lambda text: calls.append(text) or original(text)
+    return calls
+
+
+def test_interrupted_page_is_redone_on_resume(coordinator, store):
+    attach(coordinator, [Repo(REPO, history())])
+    calls = classified(coordinator)
+    original = coordinator.is_mcp_related
+
+    def fail_on_issue_5(text):
+        if 'again' in text:
+            raise ConnectionError('connection reset')
+        return original(text)
+
+    coordinator.is_mcp_related = fail_on_issue_5
+    Backfill(coordinator, store=store).run()
+    # Page 1 (issues 1-3) was saved; page 2 stopped at issue 5 and saved nothing
+    assert store.backfill_checkpoint('backfill', REPO) == 3
+    assert store.content_record(f'issue:{REPO}#4') is None
+
+    coordinator.is_mcp_related = original
+    del calls[:]
+    Backfill(coordinator, store=store).run()
+    assert store.backfill_checkpoint('backfill', REPO) == 7
+    assert sum(store.backfill_coverage('backfill')[REPO].values()) == 7
+    assert len(calls) == 2  # issues 5 and 6, the MCP-related ones after the checkpoint
+
+
+def test_resume_skips_to_the_middle_of_a_page(coordinator, store):
+    repo = Repo(REPO, history()[:4])
+    attach(coordinator, [repo])
+    Backfill(coordinator, store=store).run()
+    assert store.backfill_checkpoint('backfill', REPO) == 4
+
+    repo.issues = history()
+    calls = classified(coordinator)
+    Backfill(coordinator, store=store).run()
+    assert store.backfill_checkpoint('backfill', REPO) == 7
+    assert len(calls) == 2
+
+
+def test_dry_run_writes_nothing(coordinator, store):
+    attach(coordinator, [Repo(REPO, history())])
+    backfill = Backfill(coordinator, store=store, dry_run=True)
+    backfill.run()
+
+    assert '| `org/ops` | 7 | 4 |' in backfill.coverage_report()
+    tables = [row[0] for row in store.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    assert {table: store.conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in tables} == \
+        {table: 0 for table in tables}
+
+
+def test_later_runs_skip_seeded_issues(coordinator, store):
+    attach(coordinator, [Repo(REPO, history())])
+    Backfill(coordinator, store=store).run()
+    assert store.content_record(f'issue:{REPO}#2')[1] == NOT_MCP
+    assert store.content_record(f'issue:{REPO}#5') is None  # still needs an answer
+
+    coordinator.content = ContentHashes(store)
+    calls = classified(coordinator)
+    queue = WorkQueue([REPO], deadline=0)
+    coordinator.queue_repo_work(queue, REPO)
+
+    # Open issues 2, 3, 6 and 7 were seeded; only issue 5 is classified and queued
+    assert coordinator.content.stats['unchanged'] == 4
+    assert len(calls) == 1 and len(queue) == 1
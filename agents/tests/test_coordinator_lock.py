@@ -0,0 +1,44 @@
+import pytest
+
+from content_hashes import ContentHashes
+from coordinator_lock import RunLock
+from coordinator_state import StateStore
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+
+ITEM = 'comment:org/repo#1:42'
+
+
+@pytest.fixture
+def store():
+    store = StateStore(':memory:')
+    yield store
+    store.close()
+
+
+def coordinator(store, run_id, tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    coordinator = MCPServerCoordinatorEnhanced(offline=True)
+    coordinator.run_lock = RunLock(run_id, store, mode='claims')
+    coordinator.content = ContentHashes(store)
+    return coordinator
+
+
+def test_claims_last_as_long_as_the_run_lock(store):
+    assert RunLock('a', store, mode='claims', lock_ttl=900).claim_ttl == 900
+
+
+def test_released_claim_does_not_allow_a_second_answer(store, tmp_path, monkeypatch):
+    first = coordinator(store, 'run-1', tmp_path, monkeypatch)
+    second = coordinator(store, 'run-2', tmp_path, monkeypatch)
+    text = 'The odoo17 server times out'
+
+    assert first.claim_item(ITEM, text)
+    assert not second.claim_item(ITEM, text)
+
+    first.record_content(ITEM, text, 'handle_permission_issue', 'answered')
+    first.release_item(ITEM)
+
+    # Queued before the answer was recorded: the hash check stops it
+    assert not second.claim_item(ITEM, text)
+    # An edit is new text and can be claimed straight away
+    assert second.claim_item(ITEM, text + ' after the upgrade')
@@ -0,0 +1,75 @@
+import io
+
+import pytest
+
+from coordinator_mcp_server import TOOLS, CoordinatorMcpServer
+from jsonrpc_framing import read_messages, write_message
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    return CoordinatorMcpServer()
+
+
+def exchange(server, *messages):
+    """Replies to messages sent over stdio, keyed by request id"""
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, dict(message, jsonrpc='2.0'))
+    stream.seek(0)
+    output = io.BytesIO()
+    server.serve(stream, output)
+    output.seek(0)
+    return {reply['id']: reply for reply in read_messages(output)}
+
+
+def call(request_id, name, **arguments):
+    return {'id': request_id, 'method': 'tools/call', 'params': {'name': name, 'arguments': arguments}}
+
+
+def text(reply):
+    return reply['result']['content'][0]['text']
+
+
+def test_tools_are_dispatched_by_name(server):
+    replies = exchange(
+        server,
+        {'id': 1, 'method': 'initialize', 'params': {'protocolVersion': '2025-03-26'}},
+        {'method': 'notifications/initialized'},
+        {'id': 2, 'method': 'tools/list'},
+        call(3, 'list_servers'),
+        call(4, 'server_guidance', server='sage_mssql'),
+        call(5, 'troubleshoot', question='Sage MSSQL connection timeout', server='sage_mssql'),
+    )
+    assert sorted(replies) == [1, 2, 3, 4, 5]
+    assert replies[1]['result']['protocolVersion'] == '2025-03-26'
+    assert [tool['name'] for tool in replies[2]['result']['tools']] == [tool['name'] for tool in TOOLS]
+    assert text(replies[3]) == server.rendered['list_available_servers']
+    assert text(replies[4]) == server.guidance['sage_mssql']
+    assert not replies[5]['result'].get('isError') and text(replies[5])
+
+
+def test_unknown_server_is_a_tool_error(server):
+    reply = exchange(server, call(1, 'server_guidance', server='no-such-server'))[1]
+    assert reply['result']['isError']
+    assert 'Unknown server' in text(reply)
+
+
+def test_protocol_errors_carry_json_rpc_codes(server, monkeypatch):
+    def broken(arguments):
+        raise RuntimeError('render failed')
+
+    monkeypatch.setattr(server, 'list_servers', broken)
+    replies = exchange(
+        server,
+        {'id': 1, 'method': 'resources/read'},
+        call(2, 'no_such_tool'),
+        call(3, 'list_servers'),
+        {'id': 4, 'method': 'ping'},
+    )
+    assert replies[1]['error']['code'] == -32601
+    assert replies[2]['error']['code'] == -32602
+    assert replies[3]['error'] == {'code': -32603, 'message': 'render failed'}
+    # The session survives a failed request
+    assert replies[4]['result'] == {}
@@ -0,0 +1,130 @@
+import pytest
+
+from coordinator_shards import HashRing, ShardCoordinator
+from coordinator_state import StateStore
+from work_queue import ISSUE, WorkQueue
+
+REPOS = [f"org/repo-{i}" for i in range(8)]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return str(tmp_path / 'state.db')
+
+
+def worker(db, name):
+    return ShardCoordinator(name, StateStore(db))
+
+
+def expire(shards, ttl):
+    shards.store.conn.execute('UPDATE workers SET heartbeat_at = heartbeat_at - ? WHERE worker_id = ?',
+                              (ttl + 1, shards.worker_id))
+
+
+def test_ring_ownership_is_stable_and_covers_every_worker():
+    keys = [f"org/repo-{i}" for i in range(400)]
+    ring = HashRing(['worker-a', 'worker-b', 'worker-c'])
+    owners = [ring.owner(key) for key in keys]
+    assert owners == [HashRing(['worker-c', 'worker-a', 'worker-b']).owner(key) for key in keys]
+    assert set(owners) == {'worker-a', 'worker-b', 'worker-c'}
+    assert HashRing([]).owner('org/repo') is None
+
+
+def test_joining_and_leaving_only_moves_that_workers_keys():
+    keys = [f"org/repo-{i}" for i in range(400)]
+    ring = HashRing(['worker-a', 'worker-b', 'worker-c'])
+    before = {key: ring.owner(key) for key in keys}
+
+    ring.add('worker-d')
+    after = {key: ring.owner(key) for key in keys}
+    moved = [key for key in keys if before[key] != after[key]]
+    assert all(after[key] == 'worker-d' for key in moved)
+    # Roughly a quarter of the keys, not a reshuffle
+    assert 0.1 * len(keys) < len(moved) < 0.4 * len(keys)
+
+    ring.remove('worker-d')
+    assert {key: ring.owner(key) for key in keys} == before
+
+
+def test_expired_workers_leave_the_ring(db):
+    a = worker(db, 'worker-a')
+    b = worker(db, 'worker-b')
+    list(a.claim_repos(REPOS))
+    assert a.skipped and len(a.held) < len(REPOS)
+    a.release_repos()
+
+    # b stopped heartbeating: a's next run takes every repo
+    expire(b, a.heartbeat_ttl)
+    assert list(a.claim_repos(REPOS)) == REPOS
+    assert a.skipped == []
+
+
+def test_back_to_back_workers_each_see_a_ring_of_one(db):
+    a = worker(db, 'worker-a')
+    assert list(a.claim_repos(REPOS)) == REPOS
+    a.shutdown()
+
+    b = worker(db, 'worker-b')
+    assert list(b.claim_repos(REPOS)) == REPOS
+
+
+def test_a_repo_leased_by_another_worker_is_skipped(db):
+    a = worker(db, 'worker-a')
+    # A worker that has since expired still holds a lease on a repo a now owns
+    assert a.store.acquire_lease(f"repo:{REPOS[3]}", 'worker-gone', 600)
+
+    claimed = list(a.claim_repos(REPOS))
+    assert REPOS[3] not in claimed and a.skipped == [REPOS[3]]
+    assert a.held == claimed
+
+
+def run_worker(shards, on_answer=lambda item: None):
+    """Scan and drain the way the coordinators do; returns the items answered"""
+    answered = []
+    queue = WorkQueue(REPOS, deadline=0)
+
+    def scan_repo(queue, repo_name):
+        queue.push(f"issue:{repo_name}#1", ISSUE, repo_name, 0,
+                   lambda item=f"issue:{repo_name}#1": answered.append(item) or on_answer(item) or True)
+
+    queue.scan(shards.claim_repos(REPOS), scan_repo)
+    queue.exclude(shards.skipped)
+    queue.drain()
+    return answered
+
+
+def test_repo_leases_cover_the_drain(db):
+    a = worker(db, 'worker-a')
+    b = None
+    during_a = []
+
+    def b_runs_while_a_answers(item):
+        nonlocal b
+        if b is None:
+            # b joins mid-run: the ring now gives it some repos a has scanned
+            b = worker(db, 'worker-b')
+            during_a.extend(run_worker(b))
+
+    answered_by_a = run_worker(a, b_runs_while_a_answers)
+    assert len(answered_by_a) == len(REPOS)
+    # Everything b's ring view gave it was still leased by a
+    owned_by_b = [repo for repo in REPOS if HashRing(['worker-a', 'worker-b']).owner(repo) == 'worker-b']
+    assert owned_by_b and during_a == []
+    assert sorted(b.skipped) == sorted(REPOS)
+
+    a.shutdown()
+    assert sorted(run_worker(b)) == sorted(f"issue:{repo}#1" for repo in REPOS)
+    b.shutdown()
+
+
+def test_repo_the_scan_stopped_at_is_released(db):
+    a = worker(db, 'worker-a')
+    repos = a.claim_repos(REPOS)
+    assert next(repos) == REPOS[0]
+    assert next(repos) == REPOS[1]
+    repos.close()  # the scan ran out of budget before scanning REPOS[1]
+
+    assert a.held == [REPOS[0]]
+    b = ShardCoordinator('worker-b', StateStore(db))
+    assert b.store.acquire_lease(f"repo:{REPOS[1]}", 'worker-b', 60)
+    assert not b.store.acquire_lease(f"repo:{REPOS[0]}", 'worker-b', 60)
@@ -0,0 +1,75 @@
+import random
+
+from coordinator_state import StateStore
+from duplicate_index import DuplicateIndex, duplicate_note, shingles, similarity
+
+VOCABULARY = [f"term{i}x" for i in range(5000)]
+
+
+def documents(count, size=20, seed=7):
+    rng = random.Random(seed)
+    words = rng.sample(VOCABULARY, count * size)
+    return [words[i * size:(i + 1) * size] for i in range(count)]
+
+
+def variant(words, replaced, fresh):
+    """Same document with `replaced` words swapped: Jaccard (n-r)/(n+r)"""
+    return words[replaced:] + fresh[:replaced]
+
+
+def jaccard(a, b):
+    a, b = shingles(' '.join(a)), shingles(' '.join(b))
+    return len(a & b) / len(a | b)
+
+
+def index_of(docs):
+    index = DuplicateIndex(StateStore(':memory:'), threshold=0.5)
+    for n, words in enumerate(docs):
+        index.add(f"issue:org/repo#{n}", f"org/repo#{n}", ' '.join(words), url=f"https://example/{n}")
+    return index
+
+
+def test_similar_questions_share_a_bucket():
+    docs = documents(60)
+    fresh = documents(60, seed=8)
+    index = index_of(docs[:50])
+
+    found = 0
+    for n, words in enumerate(docs[:50]):
+        query = variant(words, 3, [w + 'y' for w in fresh[n]])
+        assert jaccard(words, query) > 0.7
+        signature = index.hasher.signature(' '.join(query))
+        found += f"issue:org/repo#{n}" in index.store.bucket_candidates(index.buckets(signature))
+    # 32 bands of 4 rows: a 0.74-similar pair collides with probability ~0.999
+    assert found >= 49
+
+    # Unrelated questions rarely collide and never pass the threshold
+    for words in docs[50:]:
+        assert index.find(' '.join(words)) == []
+
+
+def test_find_ranks_matches_and_skips_the_same_thread():
+    docs = documents(3)
+    index = index_of(docs)
+    query = ' '.join(variant(docs[1], 2, ['fresh1y', 'fresh2y']))
+
+    matches = index.find(query)
+    assert [item for item, _, _ in matches] == ['issue:org/repo#1']
+    assert matches[0][1] == 'https://example/1' and matches[0][2] >= 0.5
+    assert index.find(query, exclude_thread='org/repo#1') == []
+    assert index.find('') == []
+
+
+def test_signature_similarity_estimates_jaccard():
+    words = documents(1)[0]
+    query = variant(words, 5, [f"other{i}y" for i in range(5)])
+    index = DuplicateIndex(StateStore(':memory:'))
+    estimate = similarity(index.hasher.signature(' '.join(words)), index.hasher.signature(' '.join(query)))
+    assert abs(estimate - jaccard(words, query)) < 0.15
+
+
+def test_duplicate_note_links_earlier_answers():
+    note = duplicate_note([('issue:org/repo#4', 'https://example/4', 0.8), ('comment:org/repo#5', None, 0.6)])
+    assert "[org/repo#4](https://example/4) (80% similar)" in note
+    assert "`org/repo#5` (60% similar)" in note
+    assert duplicate_note([]) == ''
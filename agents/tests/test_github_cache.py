@@ -0,0 +1,71 @@
+import github_cache
+from github_cache import GithubObjectCache, TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(github_cache.time, 'monotonic', clock)
+    cache = TTLCache(ttl=300)
+    cache.put('repo', 'a')
+    cache.put('issue', 'b', ttl=10)
+
+    clock.now += 11
+    assert cache.get('issue') is None
+    assert cache.get('repo') == 'a'
+    clock.now += 300
+    assert cache.get('repo') is None
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 0)
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    cache = TTLCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    cache.get('a')
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.evictions == 1
+
+
+def test_byte_budget_evicts_until_the_total_fits():
+    cache = TTLCache(maxsize=100, maxbytes=10)
+    cache.put('a', 'xxxx')
+    cache.put('b', 'xxxx')
+    cache.put('c', 'xxxx')
+    assert cache.get('a') is None and cache.nbytes == 8
+
+    # Replacing a value re-weighs it rather than counting it twice
+    cache.put('b', 'xx')
+    assert cache.nbytes == 6
+    # Too heavy on its own: not cached, and nothing else is evicted for it
+    cache.put('d', 'x' * 11)
+    assert cache.get('d') is None
+    assert (cache.get('b'), cache.get('c'), cache.nbytes) == ('xx', 'xxxx', 6)
+
+    cache.invalidate('c')
+    assert cache.nbytes == 2
+
+
+def test_objects_are_cached_per_client():
+    class Client:
+        def __init__(self):
+            self.loads = 0
+
+        def get_user(self):
+            self.loads += 1
+            return object()
+
+    cache = GithubObjectCache(maxsize=8, ttl=60)
+    primary, cross_repo = Client(), Client()
+    user = cache.get_user(primary)
+    assert cache.get_user(primary) is user and primary.loads == 1
+    assert cache.get_user(cross_repo) is not user and cross_repo.loads == 1
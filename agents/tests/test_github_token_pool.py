@@ -0,0 +1,72 @@
+import pytest
+
+from github_token_pool import TokenPool, token_scope
+
+
+class Client:
+    def __init__(self, remaining):
+        self.remaining = remaining
+
+    @property
+    def rate_limiting(self):
+        if self.remaining is None:
+            raise ConnectionError('rate limit unavailable')
+        return self.remaining, 5000
+
+
+def pool(**remaining):
+    tokens = TokenPool()
+    for name, left in remaining.items():
+        tokens.add(name, Client(left))
+    return tokens
+
+
+def test_reads_go_to_the_token_with_most_budget_left():
+    tokens = pool(primary=900, cross_repo=4000)
+    assert tokens.reader('org/a') is tokens.clients['cross_repo']
+
+    tokens.clients['cross_repo'].remaining = 100
+    assert tokens.reader('org/a') is tokens.clients['primary']
+    assert tokens.reads_routed == {'primary': 1, 'cross_repo': 1}
+
+
+def test_scoped_tokens_only_read_their_repos():
+    tokens = TokenPool()
+    tokens.add('primary', Client(10))
+    tokens.add('cross_repo', Client(4000), scope={'org/b'})
+    assert tokens.reader('org/a') is tokens.clients['primary']
+    assert tokens.reader('org/b') is tokens.clients['cross_repo']
+
+    scoped = TokenPool()
+    scoped.add('cross_repo', Client(4000), scope={'org/b'})
+    with pytest.raises(ValueError):
+        scoped.reader('org/a')
+
+
+def test_a_token_whose_limit_cannot_be_read_is_not_preferred():
+    tokens = pool(primary=None, cross_repo=50)
+    assert tokens.reader() is tokens.clients['cross_repo']
+
+
+def test_writes_stay_on_the_named_token():
+    tokens = pool(primary=10, cross_repo=4000)
+    assert tokens.writer('primary') is tokens.clients['primary']
+    assert tokens.reads_routed == {'primary': 0, 'cross_repo': 0}
+
+
+def test_report_clamps_budget_refilled_by_a_window_reset():
+    tokens = pool(primary=900, cross_repo=4000)
+    tokens.reader()
+    tokens.clients['primary'].remaining = 5000
+    tokens.clients['cross_repo'].remaining = 3990
+    assert tokens.report() == [
+        "primary: 0 reads routed, 0 core requests used, 5000 remaining",
+        "cross_repo: 1 reads routed, 10 core requests used, 3990 remaining",
+    ]
+
+
+def test_token_scope_from_env(monkeypatch):
+    monkeypatch.setenv('CROSS_REPO_SCOPE', 'org/a, org/b,')
+    assert token_scope('CROSS_REPO_SCOPE') == {'org/a', 'org/b'}
+    monkeypatch.delenv('CROSS_REPO_SCOPE')
+    assert token_scope('CROSS_REPO_SCOPE') is None
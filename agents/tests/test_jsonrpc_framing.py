@@ -0,0 +1,102 @@
+import io
+import random
+
+import pytest
+
+from jsonrpc_framing import (
+    CONTENT_LENGTH,
+    NEWLINE,
+    FrameDecoder,
+    FramingError,
+    read_messages,
+    write_message,
+)
+
+
+def sample_messages(rng):
+    messages = [
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {}},
+        {'jsonrpc': '2.0', 'method': 'notifications/initialized'},
+        # Multi-byte characters get split mid-sequence by some chunkings
+        {'jsonrpc': '2.0', 'id': 2, 'result': {'text': 'Zürich → 東京 ✓'}},
+        # Larger than one read, so the buffer has to grow
+        {'jsonrpc': '2.0', 'id': 3, 'result': {'blob': 'x' * (150 * 1024)}},
+        [{'jsonrpc': '2.0', 'id': 4, 'method': 'ping'}],
+    ]
+    messages += [{'jsonrpc': '2.0', 'id': 5 + n, 'result': {'n': rng.random()}} for n in range(rng.randrange(1, 20))]
+    return messages
+
+
+def encode(messages, framing):
+    stream = io.BytesIO()
+    for message in messages:
+        write_message(stream, message, framing)
+    return stream.getvalue()
+
+
+def chunks(data, rng):
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 2, 3, 7, rng.randrange(1, 200), rng.randrange(1, 70000)])
+        yield data[position:position + size]
+        position += size
+
+
+class ChunkedStream(io.RawIOBase):
+    """A pipe that returns whatever arbitrary chunk happens to be available"""
+
+    def __init__(self, data, rng):
+        self.pending = list(chunks(data, rng))
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if not self.pending:
+            return 0
+        chunk = self.pending.pop(0)
+        if len(chunk) > len(buffer):
+            chunk, rest = chunk[:len(buffer)], chunk[len(buffer):]
+            self.pending.insert(0, rest)
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+@pytest.mark.parametrize('framing', [NEWLINE, CONTENT_LENGTH])
+@pytest.mark.parametrize('seed', range(40))
+def test_frames_survive_arbitrary_chunk_boundaries(framing, seed):
+    rng = random.Random(seed)
+    messages = sample_messages(rng)
+    data = encode(messages, framing)
+
+    decoder = FrameDecoder()
+    received = []
+    for chunk in chunks(data, rng):
+        decoder.feed(chunk)
+        received.extend(decoder.messages())
+    assert received == messages
+    assert decoder.buffered == 0
+
+    assert list(read_messages(ChunkedStream(data, random.Random(seed + 1000)))) == messages
+
+
+def test_newline_stream_tolerates_crlf_blank_lines_and_banners():
+    data = b'\r\n\nStarting server...\r\n{"id":1}\r\n\n{"id":2}'
+    assert list(read_messages(io.BytesIO(data))) == [{'id': 1}, {'id': 2}]
+
+
+def test_content_length_headers_in_any_case():
+    data = b'content-length: 8\r\nContent-Type: application/json\r\n\r\n{"id":1}Content-Length: 8\r\n\r\n{"id":2}'
+    assert list(read_messages(io.BytesIO(data))) == [{'id': 1}, {'id': 2}]
+
+
+def test_oversized_messages_are_rejected():
+    decoder = FrameDecoder(max_message=64)
+    decoder.feed(b'{"blob": "' + b'x' * 100)
+    with pytest.raises(FramingError):
+        list(decoder.frames())
+
+    decoder = FrameDecoder(max_message=64)
+    decoder.feed(b'Content-Length: 100\r\n\r\n')
+    with pytest.raises(FramingError):
+        list(decoder.frames())
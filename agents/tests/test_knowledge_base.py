@@ -0,0 +1,54 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip('scipy')
+
+from coordinator_mcp_server import CoordinatorMcpServer
+from knowledge_base import KnowledgeBase
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures', 'issues_labelled.jsonl')
+
+
+@pytest.fixture
+def coordinator(tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    return MCPServerCoordinatorEnhanced(offline=True)
+
+
+@pytest.mark.parametrize('text', ['list available servers', 'what mcp servers can I use'])
+def test_weak_matches_leave_keyword_intent(coordinator, text):
+    assert coordinator.knowledge_base.best_route(text) is None
+    assert coordinator.classify_text(text) == 'list_available_servers'
+
+
+def test_labelled_fixture_routes(coordinator):
+    with open(FIXTURE) as f:
+        records = [json.loads(line) for line in f]
+    for record in records:
+        text = f"{record['title']} {record['body']}"
+        if not coordinator.is_mcp_related(text):
+            continue  # not_mcp rows never get classified
+        assert coordinator.classify_text(text) == record['route'], record['number']
+
+
+def test_confident_match_overrides_keywords(coordinator):
+    text = "WhatsApp MCP template message rejected - the whatsapp server returns an error about the template name"
+    assert coordinator.keyword_route(text) == 'handle_permission_issue'
+    assert coordinator.classify_text(text) == 'knowledge_base'
+
+
+def test_troubleshoot_uses_keyword_intent(tmp_path, monkeypatch):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    server = CoordinatorMcpServer()
+    assert server.troubleshoot({'question': 'list available servers'}) == server.rendered['list_available_servers']
+
+
+def test_index_writes_leave_no_temp_files(tmp_path):
+    routes = {'guide': lambda text: "## Guide\n\n### Docker\nRestart the docker container\n\n---\nfooter"}
+    kb = KnowledgeBase(routes, 'test', entries_path=str(tmp_path / 'none.jsonl'), index_root=str(tmp_path))
+    kb.load()
+    assert sorted(os.listdir(kb.index_dir)) == sorted(
+        ['data.npy', 'indices.npy', 'indptr.npy', 'idf.npy', 'vocab.json', 'sections.json', 'fingerprint'])
@@ -0,0 +1,41 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from log_analyzer import LogAnalyzer, decode_line
+from mcp_server_coordinator_enhanced import MCPServerCoordinatorEnhanced
+
+
+def docker_line(message, time):
+    return json.dumps({'log': message + "\n", 'stream': 'stderr', 'time': time}) + "\n"
+
+
+def test_last_seen_is_the_logged_time(tmp_path):
+    logged = '2026-03-01T12:30:00.123456789Z'
+    path = tmp_path / 'container-json.log'
+    path.write_text(docker_line('Error: connection refused', logged) + "plain error line without time\n")
+    analyzer = LogAnalyzer(state_path=str(tmp_path / 'state.json'))
+    now = datetime(2026, 3, 2, tzinfo=timezone.utc).timestamp()
+    analyzer.scan_file('mcp-odoo17', str(path), now=now)
+
+    last_seen = {e['example']: e['last_seen'] for e in analyzer.services['mcp-odoo17'].signatures.values()}
+    assert last_seen['Error: connection refused'] == pytest.approx(
+        datetime(2026, 3, 1, 12, 30, 0, 123456, tzinfo=timezone.utc).timestamp())
+    assert last_seen['plain error line without time'] == now
+
+
+def test_decode_line_without_time():
+    assert decode_line(b'{"log": "boom\\n"}') == ('boom', None)
+
+
+@pytest.mark.parametrize('text,expected', [
+    ('The excel server returns 401', ['excel']),
+    ('Excellent docs, thanks', []),
+    ('See https://github.com/org/repo/issues/3 for the odoo17 logs', ['odoo17']),
+    ('mcp-github keeps restarting', ['github']),
+    ('Message template rejected', []),
+])
+def test_mentioned_servers_match_whole_words(tmp_path, monkeypatch, text, expected):
+    monkeypatch.setenv('MCP_KB_INDEX', str(tmp_path))
+    assert MCPServerCoordinatorEnhanced(offline=True).mentioned_servers(text) == expected
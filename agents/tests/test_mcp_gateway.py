@@ -0,0 +1,66 @@
+import io
+import time
+
+import mcp_gateway
+from container_reaper import FakeRuntime, IdleReaper
+from coordinator_state import StateStore
+from mcp_gateway import Backend, McpGateway
+
+
+class FakeSession:
+    alive = True
+    closed = False
+
+    def __init__(self, command=None, cwd=None, name=None, on_message=None):
+        self.command = command
+
+    def start(self):
+        pass
+
+    def initialize(self, client_name, timeout):
+        pass
+
+    def request(self, method, params=None, timeout=None):
+        return {'tools': []}
+
+    def close(self):
+        self.closed = True
+
+
+def backend_with_session():
+    backend = Backend('odoo17', ['true'])
+    backend.session = FakeSession()
+    return backend
+
+
+def test_idle_sweep_leaves_sessions_with_calls_in_flight():
+    backend = backend_with_session()
+    session = backend.session
+    backend.begin_call()
+
+    assert not backend.close_if_idle(time.monotonic() + 1)
+    assert backend.session is session and not session.closed
+
+    backend.end_call()
+    assert not backend.close_if_idle(time.monotonic() - 60)  # just used
+    assert backend.close_if_idle(time.monotonic() + 1)
+    assert backend.session is None and session.closed
+
+
+
+def test_starting_a_session_wakes_the_reaped_service(monkeypatch):
+    monkeypatch.setattr(mcp_gateway, 'StdioSession', FakeSession)
+    store = StateStore(':memory:')
+    runtime = FakeRuntime(running=['mcp-github'])
+    gateway = McpGateway([Backend('puppeteer', ['true'], service='mcp-puppeteer')], store=store,
+                         output=io.BytesIO(), reaper=IdleReaper(runtime, store, always_warm=[]))
+    backend = gateway.backends['puppeteer']
+
+    gateway.session(backend)
+    assert runtime.actions == [('start', 'mcp-puppeteer')]
+    assert store.last_used('mcp-puppeteer') is not None
+
+    # A running session doesn't ask the runtime again
+    gateway.session(backend)
+    assert runtime.actions == [('start', 'mcp-puppeteer')]
+    gateway.close()
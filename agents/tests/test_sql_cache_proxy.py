@@ -0,0 +1,13 @@
+import pytest
+
+from sql_cache_proxy import backend_name
+
+
+@pytest.mark.parametrize('command,name', [
+    (['docker', 'compose', 'run', '--rm', '-i', 'mcp-sage-mssql'], 'mcp-sage-mssql'),
+    (['python3', 'agents/sqlite_mcp_stub.py', '--tables', '400', '--delay', '0.2'], 'sqlite_mcp_stub'),
+    (['/home/jason/MCP_SERVERS/scripts/mcp-odoo-17-paint.sh'], 'mcp-odoo-17-paint'),
+    (['npx', '-y', '@modelcontextprotocol/server-postgres', 'postgresql://localhost/db'], 'npx'),
+])
+def test_backend_name_is_the_service_or_script(command, name):
+    assert backend_name(command) == name
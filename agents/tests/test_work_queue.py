@@ -0,0 +1,77 @@
+import json
+import time
+
+import pytest
+
+from coordinator_shards import HashRing, ShardCoordinator
+from coordinator_state import StateStore
+from work_queue import ISSUE, WorkQueue
+
+REPOS = [f"r{i}" for i in range(6)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = StateStore(str(tmp_path / 'state.db'))
+    yield store
+    store.close()
+
+
+def run(worker, store, deadline=0, scan_repo=None):
+    """One coordinator run of a sharded worker, as process_mcp_issues does it"""
+    queue = WorkQueue(REPOS, deadline, store=store, name='enhanced')
+    queue.scan(worker.claim_repos(queue.scan_order()), scan_repo or (lambda queue, repo: None))
+    queue.exclude(worker.skipped)
+    queue.drain()
+    queue.save_checkpoint()
+    return queue
+
+
+def test_sharded_run_clears_checkpoint_and_reports_own_repos(store, monkeypatch):
+    monkeypatch.setenv('MCP_WORKER_ID', 'w0')
+    w0 = ShardCoordinator('w0', store)
+    ShardCoordinator('w1', store)
+    owned = [repo for repo in REPOS if HashRing(['w0', 'w1']).owner(repo) == 'w0']
+    assert 0 < len(owned) < len(REPOS)
+
+    queue = run(w0, store)
+
+    assert queue.scanned == owned
+    assert sorted(queue.out_of_scope) == sorted(set(REPOS) - set(owned))
+    assert queue.pending_repos() == []
+    assert store.get_meta('run:checkpoint:enhanced:w0') == ''
+    assert queue.completion()[2:] == (len(owned), len(owned))
+
+
+def test_repo_leased_by_another_worker_is_out_of_scope(store, monkeypatch):
+    monkeypatch.setenv('MCP_WORKER_ID', 'w0')
+    w0 = ShardCoordinator('w0', store)
+    ShardCoordinator('w1', store)
+    owned = [repo for repo in REPOS if HashRing(['w0', 'w1']).owner(repo) == 'w0']
+    store.acquire_lease(f"repo:{owned[0]}", 'w1', 600)
+
+    queue = run(w0, store)
+
+    assert owned[0] in queue.out_of_scope
+    assert queue.pending_repos() == []
+
+
+def test_workers_keep_separate_checkpoints(store, monkeypatch):
+    workers = {name: ShardCoordinator(name, store) for name in ('w0', 'w1')}
+
+    def slow_answers(queue, repo):
+        queue.push(f"issue:{repo}#1", ISSUE, repo, queue.started, lambda: time.sleep(0.5) or True)
+
+    for name, worker in workers.items():
+        monkeypatch.setenv('MCP_WORKER_ID', name)
+        # The scan fits the budget; the first answer uses it up and the rest is deferred
+        queue = run(worker, store, deadline=0.4, scan_repo=slow_answers)
+        assert sum(queue.answered.values()) == 1
+        assert queue.pending_repos()
+
+    checkpoints = {name: json.loads(store.get_meta(f"run:checkpoint:enhanced:{name}")) for name in workers}
+    ring = HashRing(list(workers))
+    for name, checkpoint in checkpoints.items():
+        assert checkpoint['repos']
+        assert all(ring.owner(repo) == name for repo in checkpoint['repos'])
+    assert store.get_meta('run:checkpoint:enhanced') is None
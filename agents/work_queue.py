@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Coordinator Work Queue
+A run first scans every repo and queues what needs an answer, then answers in
+priority order instead of in listing order:
+
+  1. priority class - PM delegations (`from-pm` issues and their comments),
+     then new or re-routed issues, then comments
+  2. age - items waiting longest first, in hour-wide buckets
+  3. repo priority - MCP_REPO_PRIORITY (comma-separated), else monitor order
+
+Runs can be given a time budget (--budget, or MCP_RUN_DEADLINE seconds from the
+start of the run). Scanning stops taking new repos once half of it is spent, so
+queued answers still get time. Answering stops taking new items once all of it
+is spent, but the item in hand is finished and its state recorded first. Repos
+left unscanned or with items left unanswered are checkpointed in the state
+store (per MCP_WORKER_ID when sharded), and the next run scans them first.
+Repos another worker owns are out of this run's scope and never checkpointed.
+Deferred items stay unrecorded, so they are queued again. Queue depth, time to
+first response, the budget and the fraction of work completed are reported per
+run, and also go to the Actions step summary when there is one.
+"""
+
+import os
+import json
+import time
+import heapq
+import logging
+import itertools
+from collections import Counter, defaultdict
+from datetime import timezone
+
+logger = logging.getLogger(__name__)
+
+PM = 'pm'
+ISSUE = 'issue'
+COMMENT = 'comment'
+PRIORITY_CLASSES = (PM, ISSUE, COMMENT)
+
+AGE_BUCKET = 3600
+# Share of the run budget scanning may use before the queue is drained
+SCAN_SHARE = 0.5
+CHECKPOINT_KEY = 'run:checkpoint:{}'
+
+
+def repo_priorities(repos):
+    """{repo: rank}, lowest rank first; repos not in MCP_REPO_PRIORITY keep monitor order after it"""
+    preferred = [r.strip() for r in os.environ.get('MCP_REPO_PRIORITY', '').split(',') if r.strip()]
+    ordered = preferred + [repo for repo in repos if repo not in preferred]
+    return {repo: rank for rank, repo in enumerate(ordered)}
+
+
+def run_deadline():
+    """Seconds a run may spend before it stops taking new items; 0 means no deadline"""
+    return float(os.environ.get('MCP_RUN_DEADLINE', '0'))
+
+
+class WorkItem:
+    def __init__(self, key, priority_class, repo_name, waiting_since, handler):
+        self.key = key
+        self.priority_class = priority_class
+        self.repo_name = repo_name
+        self.waiting_since = waiting_since  # epoch seconds the item has been waiting since
+        self.handler = handler              # called with no arguments; True if it answered
+
+
+class WorkQueue:
+    def __init__(self, repos, deadline=None, store=None, name='coordinator', now=None):
+        """store and name: where the run checkpoint is kept (None: no checkpointing)"""
+        self.started = now or time.time()
+        self.deadline = deadline if deadline is not None else run_deadline()
+        self.repos = list(repos)
+        self.repo_rank = repo_priorities(self.repos)
+        self.store = store
+        # Sharded workers scan different repos, so each keeps its own checkpoint
+        worker = os.environ.get('MCP_WORKER_ID')
+        self.checkpoint_key = CHECKPOINT_KEY.format(f"{name}:{worker}" if worker else name)
+        self._heap = []
+        self._seq = itertools.count()
+        self.queued = Counter()
+        self.answered = Counter()
+        self.failed = Counter()
+        self.deferred = Counter()
+        self.response_times = defaultdict(list)
+        self.order = list(self.repos)
+        self.scanned = []
+        self.out_of_scope = []
+        self.deferred_repos = []
+        self.finished = None
+
+    def push(self, key, priority_class, repo_name, waiting_since, handler):
+        item = WorkItem(key, priority_class, repo_name, waiting_since, handler)
+        age_bucket = int((self.started - waiting_since) // AGE_BUCKET)
+        order = (PRIORITY_CLASSES.index(priority_class), -age_bucket,
+                 self.repo_rank.get(repo_name, len(self.repo_rank)), waiting_since, next(self._seq))
+        heapq.heappush(self._heap, (order, item))
+        self.queued[priority_class] += 1
+
+    def __len__(self):
+        return len(self._heap)
+
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def expired(self, share=1.0):
+        return bool(self.deadline) and self.elapsed() >= self.deadline * share
+
+    # Scanning
+
+    def load_checkpoint(self):
+        """Repos the previous budgeted run did not get to, in the order to resume them"""
+        raw = self.store.get_meta(self.checkpoint_key) if self.store is not None else None
+        if not raw:
+            return []
+        checkpoint = json.loads(raw)
+        logger.info(f"Resuming from the run stopped at {time.ctime(checkpoint['stopped_at'])}: "
+                    f"{', '.join(checkpoint['repos'])} first")
+        return [repo for repo in checkpoint['repos'] if repo in self.repos]
+
+    def scan_order(self):
+        """Checkpointed repos first, then the rest by repo priority"""
+        resume = self.load_checkpoint()
+        rest = sorted((repo for repo in self.repos if repo not in resume), key=self.repo_rank.get)
+        self.order = resume + rest
+        return self.order
+
+    def scan(self, repos, scan_repo):
+        """Call scan_repo(queue, repo_name) for each repo until the scan share of the budget is spent"""
+        try:
+            for repo_name in repos:
+                if self.expired(SCAN_SHARE):
+                    logger.warning(f"Scan stopped after {self.elapsed():.0f}s of a {self.deadline:g}s budget - "
+                                   f"{repo_name} and later repos left for the next run")
+                    break
+                try:
+                    scan_repo(self, repo_name)
+                except Exception as e:
+                    logger.error(f"Error checking {repo_name}: {e}")
+                self.scanned.append(repo_name)
+        finally:
+            # Releases the shard lease of a repo we stopped at
+            close = getattr(repos, 'close', None)
+            if close is not None:
+                close()
+
+    def exclude(self, repos):
+        """Repos this run is not responsible for (owned or leased by another worker)"""
+        self.out_of_scope.extend(repo for repo in repos if repo not in self.out_of_scope)
+
+    def drain(self):
+        """Run queued items in priority order until the queue is empty or the deadline passes"""
+        while self._heap:
+            if self.expired():
+                for _, item in sorted(self._heap, key=lambda entry: entry[0]):
+                    self.deferred[item.priority_class] += 1
+                    if item.repo_name not in self.deferred_repos:
+                        self.deferred_repos.append(item.repo_name)
+                logger.warning(f"Run deadline of {self.deadline:g}s reached - "
+                               f"{len(self._heap)} items left for the next run")
+                self._heap.clear()
+                self.finished = time.time()
+                return False
+            _, item = heapq.heappop(self._heap)
+            try:
+                answered = item.handler()
+            except Exception as e:
+                # One failed write shouldn't hold up the rest of the queue
+                logger.error(f"Error handling {item.key}: {e}")
+                self.failed[item.priority_class] += 1
+                continue
+            if answered:
+                self.answered[item.priority_class] += 1
+                self.response_times[item.priority_class].append(time.time() - item.waiting_since)
+        self.finished = time.time()
+        return True
+
+    # Checkpoint and reporting
+
+    def pending_repos(self):
+        """Repos never scanned, then repos with deferred items (highest priority first)
+
+        Unscanned repos go first so that deferred work can't starve them run after run.
+        """
+        unscanned = [repo for repo in self.order if repo not in self.scanned and repo not in self.out_of_scope]
+        return unscanned + self.deferred_repos
+
+    def save_checkpoint(self):
+        """Record where this run stopped, or clear the checkpoint if it got through everything"""
+        if self.store is None:
+            return
+        pending = self.pending_repos()
+        checkpoint = json.dumps({'stopped_at': time.time(), 'repos': pending}) if pending else ''
+        self.store.set_meta(self.checkpoint_key, checkpoint)
+
+    def completion(self):
+        """(handled, queued, scanned, repos)"""
+        queued = sum(self.queued.values())
+        in_scope = len([repo for repo in self.repos if repo not in self.out_of_scope])
+        return queued - sum(self.deferred.values()), queued, len(self.scanned), in_scope
+
+    def run_report(self):
+        """[(heading, text)] for the budget, the fraction completed and the checkpoint"""
+        handled, queued, scanned, repos = self.completion()
+        budget = f"{self.deadline:g}s" if self.deadline else "none"
+        lines = [
+            ('Budget', f"{budget}, {self.elapsed():.0f}s used"),
+            ('Completed', f"{handled}/{queued} queued items ({percent(handled, queued)}) "
+                          f"across {scanned}/{repos} repos ({percent(scanned, repos)})"),
+        ]
+        pending = self.pending_repos()
+        if pending:
+            lines.append(('Checkpoint', f"next run starts with {', '.join(pending)}"))
+        return lines
+
+    def summary(self):
+        """Markdown run summary for the Actions step summary"""
+        lines = ["## MCP Server Coordinator run", ""]
+        lines += [f"- **{heading}:** {text}" for heading, text in self.run_report()]
+        lines += ["", "### Work queue"] + [f"- {line}" for line in self.report()]
+        return "\n".join(lines)
+
+    def log_summary(self):
+        for heading, text in self.run_report():
+            logger.info(f"Run summary - {heading}: {text}")
+        self.log_report()
+        path = os.environ.get('GITHUB_STEP_SUMMARY')
+        if path:
+            with open(path, 'a') as f:
+                f.write(self.summary() + "\n")
+
+    def report(self):
+        lines = []
+        for priority_class in PRIORITY_CLASSES:
+            if not self.queued[priority_class]:
+                continue
+            line = (f"{priority_class}: {self.queued[priority_class]} queued, "
+                    f"{self.answered[priority_class]} answered")
+            if self.failed[priority_class]:
+                line += f", {self.failed[priority_class]} failed"
+            if self.deferred[priority_class]:
+                line += f", {self.deferred[priority_class]} deferred"
+            times = sorted(self.response_times[priority_class])
+            if times:
+                line += (f"; time to first response median {format_duration(times[(len(times) - 1) // 2])}, "
+                         f"max {format_duration(times[-1])}")
+            lines.append(line)
+        return lines
+
+    def log_report(self):
+        for line in self.report():
+            logger.info(f"Work queue - {line}")
+
+
+def timestamp(moment):
+    """Epoch seconds of a GitHub datetime (PyGithub returns naive UTC before 2.0)"""
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def percent(part, whole):
+    return f"{100 * part / whole:.0f}%" if whole else "100%"
+
+
+def format_duration(seconds):
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
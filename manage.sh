@@ -31,8 +31,30 @@ case "$1" in
         echo "Claude Code MCP servers:"
         claude mcp list
         ;;
+    telemetry)
+        python3 agents/container_telemetry.py sample
+        ;;
+    analyze-logs)
+        python3 agents/log_analyzer.py $(docker compose ps --format '{{.Name}}')
+        ;;
+    prewarm)
+        shift
+        python3 agents/container_prewarm.py "$@"
+        ;;
+    reap)
+        shift
+        python3 agents/container_reaper.py reap "$@"
+        ;;
+    wake)
+        shift
+        python3 agents/container_reaper.py wake "$@"
+        ;;
+    load-odoo)
+        shift
+        python3 agents/odoo_load.py "$@"
+        ;;
     *)
-        echo "Usage: $0 {build|start|stop|logs|test|list}"
+        echo "Usage: $0 {build|start|stop|logs|test|list|telemetry|analyze-logs|prewarm|reap|wake|load-odoo}"
         echo ""
         echo "Commands:"
         echo "  build  - Build Docker images"
@@ -41,6 +63,12 @@ case "$1" in
         echo "  logs   - View logs (optionally specify service name)"
         echo "  test   - Test all MCP servers"
         echo "  list   - List configured Claude Code MCP servers"
+        echo "  telemetry - Sample container CPU/memory/restarts for the coordinator"
+        echo "  analyze-logs - Scan new container log lines for errors, timeouts and auth failures"
+        echo "  prewarm - Run a warm-up session of the given servers now (fills image and package caches); report prewarm hit rates"
+        echo "  reap   - Stop servers idle past their threshold (--dry-run to preview)"
+        echo "  wake   - Start the given servers again on demand"
+        echo "  load-odoo - Load test odoo-mcp settings against a fake Odoo (runs the mcp-odoo-mcp container; --local needs pip install mcp-odoo-panda)"
         exit 1
         ;;
 esac
\ No newline at end of file
@@ -0,0 +1,3 @@
+#!/bin/bash
+cd /home/jason/MCP_SERVERS
+docker compose run --rm -i mcp-coordinator
@@ -0,0 +1,3 @@
+#!/bin/bash
+cd /home/jason/MCP_SERVERS
+exec python3 agents/mcp_gateway.py
@@ -0,0 +1,3 @@
+#!/bin/bash
+cd /home/jason/MCP_SERVERS
+exec python3 agents/sql_cache_proxy.py -- docker compose run --rm -i mcp-odoo-17-paint
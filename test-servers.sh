@@ -35,4 +35,8 @@ timeout 5s docker compose run --rm mcp-octagon-deep-research npx -y octagon-deep
 echo -e "\n8. Testing WhatsApp MCP Server:"
 echo '{"jsonrpc": "2.0", "method": "initialize", "params": {"protocolVersion": "2024-11-05", "clientInfo": {"name": "test", "version": "1.0.0"}, "capabilities": {}}, "id": 1}' | timeout 5s docker compose run --rm -i mcp-whatsapp 2>&1 | grep -E "(serverInfo|error)" | head -5
 
+# Test Coordinator server
+echo -e "\n9. Testing Coordinator MCP Server:"
+echo '{"jsonrpc": "2.0", "method": "initialize", "params": {"protocolVersion": "2024-11-05", "clientInfo": {"name": "test", "version": "1.0.0"}, "capabilities": {}}, "id": 1}' | timeout 5s docker compose run --rm -i mcp-coordinator 2>&1 | grep -E "(serverInfo|error)" | head -5
+
 echo -e "\nAll tests completed!"
\ No newline at end of file